@@ -0,0 +1,102 @@
+"""Benchmark Apple timestamp formatting on large result sets.
+
+The previous converters built ``datetime(2001, 1, 1)`` and a ``timedelta`` for
+every row. The shared converter in ``src.services.apple_time`` uses integer
+arithmetic for the time of day and a memoized calendar date per day.
+
+Timestamps are spread over the last two years, like the message history of a
+typical chat.db; Notes dates are in seconds with a fractional part. The three
+converters run interleaved and the median of each is reported, so a noisy
+machine skews all of them alike.
+
+Usage:
+    python -m benchmarks.bench_apple_time [--rows N]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from src.services.apple_time import format_apple_timestamp, format_apple_timestamps
+
+# 2024-10-17 in Apple epoch seconds
+_NOW = 750_816_000
+_TWO_YEARS = 2 * 365 * 86_400
+
+
+def _legacy_nanoseconds(timestamp: int) -> str:
+    """The converter previously in src/tools/imessage.py."""
+    if timestamp == 0:
+        return "Unknown"
+    apple_epoch = datetime(2001, 1, 1)
+    actual_seconds = timestamp / 1_000_000_000
+    try:
+        dt = apple_epoch + timedelta(seconds=actual_seconds)
+        return dt.isoformat()
+    except (ValueError, OverflowError):
+        return "Invalid date"
+
+
+def _legacy_seconds(timestamp: float) -> str:
+    """The converter previously in src/tools/notes.py."""
+    if timestamp == 0 or timestamp is None:
+        return "Unknown"
+    try:
+        apple_epoch = datetime(2001, 1, 1)
+        dt = apple_epoch + timedelta(seconds=timestamp)
+        return dt.isoformat()
+    except (ValueError, OverflowError):
+        return "Invalid date"
+
+
+def _median_ms(funcs, iterations: int):
+    """Run funcs round-robin and return the median wall time of each in milliseconds."""
+    samples = [[] for _ in funcs]
+    for _ in range(iterations):
+        for func, times in zip(funcs, samples):
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    return [statistics.median(times) for times in samples]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=15)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    message_dates = sorted(
+        (_NOW - rng.randrange(_TWO_YEARS)) * 1_000_000_000 + rng.randrange(1_000_000_000)
+        for _ in range(args.rows)
+    )
+    note_dates = [_NOW - rng.random() * _TWO_YEARS for _ in range(args.rows)]
+
+    cases = [
+        ("chat.db (ns)", message_dates, _legacy_nanoseconds),
+        ("Notes (s)", note_dates, _legacy_seconds),
+    ]
+    print(f"{args.rows:,} rows, median of {args.iterations}\n")
+    print(f"{'column':<14}{'legacy':>12}{'per row':>12}{'batch':>12}{'speedup':>10}{'diffs':>8}")
+    for name, dates, legacy in cases:
+        legacy_ms, row_ms, batch_ms = _median_ms(
+            [
+                lambda: [legacy(d) for d in dates],
+                lambda: [format_apple_timestamp(d) for d in dates],
+                lambda: format_apple_timestamps(dates),
+            ],
+            args.iterations,
+        )
+        # Legacy float division can round the last microsecond differently
+        diffs = sum(a != b for a, b in zip(map(legacy, dates), format_apple_timestamps(dates)))
+        print(
+            f"{name:<14}{legacy_ms:>10.1f}ms{row_ms:>10.1f}ms{batch_ms:>10.1f}ms"
+            f"{legacy_ms / batch_ms:>9.1f}x{diffs:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
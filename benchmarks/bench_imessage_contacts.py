@@ -0,0 +1,72 @@
+"""Benchmark imessage_get_contact_list: GROUP BY scan vs. the contact summary.
+
+The previous implementation grouped the whole ``message`` table by handle on
+every call and returned every contact. The sidecar summary is built once and
+then only folds in messages above the ROWID high-water mark, so a call with no
+new messages costs one ``MAX(ROWID)`` lookup plus a page read.
+
+Usage:
+    python -m benchmarks.bench_imessage_contacts [--messages N] [--db PATH]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_chat_db import build_chat_db
+from src.services.imessage_contacts import ContactSummary
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+
+PREVIOUS_QUERY = """
+SELECT DISTINCT
+    h.id as contact,
+    COUNT(m.ROWID) as message_count,
+    MAX(m.date) as last_contact
+FROM handle h
+JOIN message m ON m.handle_id = h.ROWID
+GROUP BY h.id
+HAVING message_count > 0
+ORDER BY last_contact DESC
+"""
+
+
+def _time_ms(func, iterations: int) -> float:
+    """Return the mean wall time of func() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--db", type=Path, help="Use an existing chat.db instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            print(f"Generating synthetic chat.db with {args.messages:,} messages...")
+            db_path = build_chat_db(Path(tmp) / "chat.db", messages=args.messages)
+
+        pool = ReadOnlyConnectionPool(db_path)
+        summary = ContactSummary(Path(tmp) / "imessage_contacts.sqlite", pool.execute)
+        build_ms = _time_ms(summary.refresh, 1)
+
+        previous_ms = _time_ms(lambda: pool.execute(PREVIOUS_QUERY), args.iterations)
+        page_ms = _time_ms(
+            lambda: (summary.refresh(), summary.page(args.limit)), args.iterations
+        )
+        print(f"initial summary build: {build_ms:,.0f}ms\n")
+        print(f"previous (all contacts): {previous_ms:8.2f}ms")
+        print(f"summary (refresh + page of {args.limit}): {page_ms:8.2f}ms")
+        print(f"speedup: {previous_ms / page_ms:.1f}x")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark the imessage_list_recent_conversations query.
+
+Compares the previous per-handle query (a full GROUP BY over ``message`` plus a
+correlated last-message subquery per handle) with the per-chat query built on
+index seeks into ``chat_message_join``, against a synthetic chat.db.
+
+Usage:
+    python -m benchmarks.bench_imessage_conversations [--messages N] [--db PATH]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_chat_db import build_chat_db
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+from src.tools.imessage import _RECENT_CONVERSATIONS_QUERY
+
+PREVIOUS_QUERY = """
+SELECT
+    h.id as contact,
+    MAX(m.date) as last_date,
+    (SELECT text FROM message
+     WHERE handle_id = h.ROWID
+     ORDER BY date DESC LIMIT 1) as last_message,
+    COUNT(m.ROWID) as message_count
+FROM message m
+JOIN handle h ON m.handle_id = h.ROWID
+WHERE m.text IS NOT NULL
+GROUP BY h.id
+ORDER BY last_date DESC
+LIMIT ?
+"""
+
+
+def _time_ms(pool: ReadOnlyConnectionPool, query: str, limit: int, iterations: int) -> float:
+    """Return the mean wall time of a warm query in milliseconds."""
+    pool.execute(query, (limit,))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pool.execute(query, (limit,))
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--db", type=Path, help="Use an existing chat.db instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            print(f"Generating synthetic chat.db with {args.messages:,} messages...")
+            db_path = build_chat_db(Path(tmp) / "chat.db", messages=args.messages)
+
+        pool = ReadOnlyConnectionPool(db_path)
+        previous_ms = _time_ms(pool, PREVIOUS_QUERY, args.limit, args.iterations)
+        current_ms = _time_ms(pool, _RECENT_CONVERSATIONS_QUERY, args.limit, args.iterations)
+        pool.close()
+
+    print(f"{'query':<28}{'mean':>12}")
+    print(f"{'per-handle (previous)':<28}{previous_ms:>10.2f}ms")
+    print(f"{'per-chat (current)':<28}{current_ms:>10.2f}ms")
+    print(f"speedup: {previous_ms / current_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
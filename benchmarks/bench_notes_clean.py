@@ -0,0 +1,161 @@
+"""Benchmark the Notes text cleaner on 1 KB, 100 KB and 5 MB inputs.
+
+``_clean_text`` strips control characters, collapses whitespace, and drops lines
+that look like binary metadata. It runs on every note that is not a
+NoteStoreProto. The previous version ran four regex substitutions with
+uncompiled patterns and rewrote every single space. Per line it counted ASCII
+characters with a Python generator and ran the symbol-run regex before the
+cheap substring checks. It also collapsed blank lines in a separate pass.
+
+The inputs mix prose, non-ASCII text, URLs, short "(a)" lines, blank-line runs,
+control characters, and a binary tail like the one after the text of a Notes
+protobuf. Before timing, the output is compared with the previous
+implementation (kept below) on every benchmark input and on edge cases. The
+script exits with an error on any difference.
+
+Usage:
+    python -m benchmarks.bench_notes_clean [--iterations N]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import List
+
+from src.tools.notes import _clean_text
+
+
+def _legacy_is_garbage_line(line: str) -> bool:
+    """The line check previously in src/tools/notes.py."""
+    stripped = line.strip()
+    if not stripped:
+        return False
+    if len(stripped) <= 4 and ("(" in stripped or ")" in stripped):
+        return True
+    ascii_chars = sum(1 for c in stripped if ord(c) < 128)
+    if len(stripped) > 0 and ascii_chars / len(stripped) < 0.5:
+        return True
+    if re.search(r"[^\w\s]{3,}", stripped):
+        if not any(pattern in stripped for pattern in ["http", "mailto", "://", "@", "."]):
+            return True
+    return False
+
+
+def _legacy_clean_text(text: str) -> str:
+    """The cleaner previously in src/tools/notes.py."""
+    text = re.sub(r"[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F]", "", text)
+    text = re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    lines = text.split("\n")
+    cleaned_lines = []
+    garbage_count = 0
+    for line in lines:
+        if _legacy_is_garbage_line(line):
+            garbage_count += 1
+            if garbage_count >= 10:
+                break
+            continue
+        else:
+            garbage_count = 0
+            cleaned_lines.append(line)
+    text = "\n".join(cleaned_lines)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+EDGE_CASES = [
+    "",
+    "\n\n\n",
+    "   \t  ",
+    "(a)\n(b)\nkeep me",
+    "a\n\n\n\nb\n \n\n\nc",
+    "\n\n\nleading and trailing\n\n\n",
+    "garbage ### between\n\n!!!\n\nblank lines",
+    "\x00\x01abc\x7f\x85def\u200b\ufeff",
+    "tabs\t\tand   spaces\n\t\n",
+    "ünïcödé ßtraße\n会議メモ\n😀😀😀 smile",
+    "half ascii ab中文字",
+    "exactly half ab中文",
+    "url https://example.com/a?b=c&&d\nmail me@x.y !!!",
+    "\n".join(["@@@"] * 9 + ["kept after 9"]),
+    "\n".join(["@@@"] * 10 + ["dropped after 10"]),
+    " line separator \xa0nbsp\xa0",
+    "\r\nwindows\r\n\r\n\r\nlines\r\n",
+]
+
+_WORDS = (
+    "meeting notes agenda budget review follow up trip hotel flight recipe garlic "
+    "(a) (b) -- ... !!! café naïve crème 会議 予定 確認 Привет дела 😀 🛶"
+).split()
+
+
+def _generate(rnd: random.Random, size: int) -> str:
+    """Build roughly size characters of note-like text with a binary tail."""
+    parts: List[str] = []
+    length = 0
+    body = size * 9 // 10
+    while length < body:
+        kind = rnd.random()
+        if kind < 0.1:
+            line = ""
+        elif kind < 0.15:
+            line = rnd.choice(["(a)", "#(", "! (", "...", "--", " "])
+        elif kind < 0.2:
+            line = f"see https://example.com/{rnd.randrange(1000)} --> {rnd.choice(_WORDS)}"
+        else:
+            line = " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(3, 14)))
+            if rnd.random() < 0.1:
+                line = line.replace(" ", "\t ", 2).replace(" ", "  ", 1) + "\u200b\x07"
+        parts.append(line)
+        length += len(line) + 1
+    while length < size:
+        line = "".join(chr(rnd.randrange(0x00, 0x2FF)) for _ in range(rnd.randint(4, 60)))
+        parts.append(line)
+        length += len(line) + 1
+    return "\n".join(parts)[:size]
+
+
+def _time_ms(func, iterations: int) -> float:
+    """Return the best wall time of func() in milliseconds."""
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    sizes = [("1 KB", 1_000), ("100 KB", 100_000), ("5 MB", 5_000_000)]
+    inputs = {name: _generate(rnd, size) for name, size in sizes}
+    # Many small notes exercise the per-call overhead and the line rules
+    samples = EDGE_CASES + [_generate(rnd, rnd.randint(0, 3_000)) for _ in range(500)]
+    samples += list(inputs.values())
+
+    mismatches = [text for text in samples if _clean_text(text) != _legacy_clean_text(text)]
+    print(f"golden check: {len(samples) - len(mismatches)}/{len(samples)} outputs identical\n")
+
+    print(f"{'input':<10}{'legacy':>12}{'new':>12}{'speedup':>10}")
+    for name, text in inputs.items():
+        iterations = args.iterations if len(text) < 1_000_000 else max(1, args.iterations // 2)
+        repeat = max(1, 100_000 // len(text))
+        legacy_ms = _time_ms(lambda: [_legacy_clean_text(text) for _ in range(repeat)], iterations)
+        new_ms = _time_ms(lambda: [_clean_text(text) for _ in range(repeat)], iterations)
+        legacy_ms, new_ms = legacy_ms / repeat, new_ms / repeat
+        print(f"{name:<10}{legacy_ms:>10.3f}ms{new_ms:>10.3f}ms{legacy_ms / new_ms:>9.1f}x")
+
+    if mismatches:
+        for text in mismatches[:3]:
+            print(f"\nmismatch for input {text[:80]!r}")
+        sys.exit("Cleaner output differs from the previous implementation")
+
+
+if __name__ == "__main__":
+    main()
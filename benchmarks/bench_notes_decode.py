@@ -0,0 +1,186 @@
+"""Benchmark Notes body extraction: marker heuristics vs. the NoteStoreProto decoder.
+
+The heuristic path decodes the gzipped protobuf as UTF-8, cuts it at known
+byte markers, and drops lines that look like binary. The decoder reads the
+protobuf fields directly.
+
+The golden fixtures in ``benchmarks/fixtures/notes`` pin the decoder's output:
+``<name>.gz`` is the ZDATA blob and ``<name>.txt`` its expected rendering.
+Accuracy is the similarity of each path's text to the text the note actually
+holds (1.0 is exact).
+
+Usage:
+    python -m benchmarks.bench_notes_decode [--notes N] [--update-fixtures]
+"""
+
+import argparse
+import difflib
+import gzip
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.synthetic_notestore import (
+    STYLE_CHECKLIST,
+    STYLE_HEADING,
+    STYLE_TITLE,
+    Run,
+    encode_note,
+    random_note,
+)
+from src.services.notestore import (
+    ATTACHMENT_CHARACTER,
+    STYLE_DOTTED_LIST,
+    STYLE_NUMBERED_LIST,
+    decode_note,
+    render_note,
+)
+from src.tools.notes import _extract_text_from_html
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "notes"
+
+# Notes whose layout the heuristics are known to struggle with
+FIXTURES: Dict[str, List[Run]] = {
+    "checklist_and_headings": [
+        ("Weekend plans\n", STYLE_TITLE, None, None, None),
+        ("Groceries\n", STYLE_HEADING, None, None, None),
+        ("Milk\n", STYLE_CHECKLIST, True, None, None),
+        ("Eggs (a dozen)\n", STYLE_CHECKLIST, False, None, None),
+        ("Chores\n", STYLE_HEADING, None, None, None),
+        ("Mow the lawn\n", STYLE_CHECKLIST, False, None, None),
+    ],
+    "links_and_emoji": [
+        ("Trip ideas 🏔️\n", STYLE_TITLE, None, None, None),
+        ("Book the cabin at ", None, None, None, None),
+        ("this place", None, None, "https://example.com/cabin", None),
+        (" 🛶🔥 before March!\n", None, None, None, None),
+        ("https://example.com/trail\n", None, None, "https://example.com/trail", None),
+    ],
+    "non_ascii": [
+        ("会議メモ\n", STYLE_TITLE, None, None, None),
+        ("来週の予定を確認する。\n", None, None, None, None),
+        ("Café crème, façade, naïve\n", None, None, None, None),
+        ("Привет, как дела?\n", None, None, None, None),
+    ],
+    "short_lines": [
+        ("Options\n", STYLE_TITLE, None, None, None),
+        ("(a)\n", None, None, None, None),
+        ("(b)\n", None, None, None, None),
+        ("Pick (a) if it rains -- otherwise (b)!!!\n", None, None, None, None),
+    ],
+    "inline_attachment": [
+        ("Receipts\n", STYLE_TITLE, None, None, None),
+        ("Scanned at the store:\n", None, None, None, None),
+        (
+            ATTACHMENT_CHARACTER,
+            None,
+            None,
+            None,
+            ("0D9A64B5-1B4E-4AF2-9C38-3A1D4F7E2B10", "public.jpeg"),
+        ),
+        ("\nTagged ", None, None, None, None),
+        (
+            ATTACHMENT_CHARACTER,
+            None,
+            None,
+            None,
+            (
+                "6E0C5E0A-5B8D-4F45-8E47-6A2B2C8D9F01",
+                "com.apple.notes.inlinetextattachment.hashtag",
+            ),
+        ),
+        ("\nText after the tag must survive.\n", None, None, None, None),
+    ],
+    "lists": [
+        ("Steps\n", STYLE_TITLE, None, None, None),
+        ("Preheat the oven\n", STYLE_NUMBERED_LIST, None, None, None),
+        ("Mix the batter\n", STYLE_NUMBERED_LIST, None, None, None),
+        ("Bake for 20 minutes\n", STYLE_NUMBERED_LIST, None, None, None),
+        ("Toppings\n", None, None, None, None),
+        ("Berries\n", STYLE_DOTTED_LIST, None, None, None),
+        ("Cream\n", STYLE_DOTTED_LIST, None, None, None),
+    ],
+}
+
+
+def _heuristic(data: bytes) -> str:
+    """The extraction path used before the decoder."""
+    return _extract_text_from_html(gzip.decompress(data).decode("utf-8", errors="ignore"))
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.replace(ATTACHMENT_CHARACTER, " ").split())
+
+
+def _similarity(found: str, truth: str) -> float:
+    return difflib.SequenceMatcher(None, _normalize(found), _normalize(truth)).ratio()
+
+
+def check_fixtures(update: bool) -> bool:
+    """Compare the decoder with the golden fixtures (or rewrite them).
+
+    Returns:
+        True if every fixture matched
+    """
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    ok = True
+    print(f"{'fixture':<26}{'golden':>8}{'heuristic':>11}{'decoder':>9}")
+    for name, runs in FIXTURES.items():
+        data_path, golden_path = FIXTURES_DIR / f"{name}.gz", FIXTURES_DIR / f"{name}.txt"
+        if update:
+            data_path.write_bytes(encode_note(runs))
+        data = data_path.read_bytes()
+        rendered = render_note(decode_note(data))
+        if update:
+            golden_path.write_text(rendered + "\n", encoding="utf-8")
+        matches = golden_path.read_text(encoding="utf-8") == rendered + "\n"
+        ok = ok and matches
+
+        truth = "".join(run[0] for run in runs)
+        heuristic_score = _similarity(_heuristic(data), truth)
+        decoder_score = _similarity(decode_note(data).plain_text, truth)
+        status = "ok" if matches else "FAIL"
+        print(f"{name:<26}{status:>8}{heuristic_score:>11.3f}{decoder_score:>9.3f}")
+    return ok
+
+
+def _median_ms(funcs, items, iterations: int) -> List[float]:
+    """Run each func over all items, round-robin, and return the median times in ms."""
+    samples: List[List[float]] = [[] for _ in funcs]
+    for _ in range(iterations):
+        for func, times in zip(funcs, samples):
+            start = time.perf_counter()
+            for item in items:
+                func(item)
+            times.append((time.perf_counter() - start) * 1000)
+    return [statistics.median(times) for times in samples]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=15)
+    parser.add_argument("--update-fixtures", action="store_true")
+    args = parser.parse_args()
+
+    ok = check_fixtures(args.update_fixtures)
+
+    rnd = random.Random(7)
+    corpus = [encode_note(random_note(rnd, rnd.randint(2, 40))[1]) for _ in range(args.notes)]
+    size = sum(len(gzip.decompress(data)) for data in corpus)
+    heuristic_ms, decoder_ms = _median_ms(
+        [_heuristic, lambda data: render_note(decode_note(data))], corpus, args.iterations
+    )
+    print(f"\n{args.notes:,} synthetic notes ({size / 1e6:.1f} MB decompressed)")
+    print(f"heuristic: {heuristic_ms:8.1f}ms")
+    print(f"decoder:   {decoder_ms:8.1f}ms ({heuristic_ms / decoder_ms:.1f}x)")
+
+    if not ok:
+        sys.exit("Decoder output differs from the golden fixtures")
+
+
+if __name__ == "__main__":
+    main()
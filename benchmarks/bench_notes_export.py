@@ -0,0 +1,58 @@
+"""Benchmark the bulk Notes export: one process vs. a pool of decoder processes.
+
+Every note is decompressed, decoded, and serialized to NDJSON. The single-process
+run is the baseline; the pool runs show how decoding scales with cores. On a
+machine with one core the pool only adds process overhead.
+
+Usage:
+    python -m benchmarks.bench_notes_export [--notes N] [--workers 1 2 4 ...]
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic_notestore import build_notestore_db
+from src.services.notes_export import export_notes
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+from src.tools.notes import _extract_note_content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--db", type=Path, help="Use an existing NoteStore.sqlite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            print(f"Generating synthetic NoteStore.sqlite with {args.notes:,} notes...")
+            db_path = build_notestore_db(Path(tmp) / "NoteStore.sqlite", notes=args.notes)
+        print(f"{os.cpu_count()} CPUs\n")
+
+        pool = ReadOnlyConnectionPool(db_path)
+        baseline = None
+        print(f"{'workers':>8}{'seconds':>10}{'notes/s':>10}{'speedup':>9}")
+        for workers in args.workers:
+            summary = export_notes(
+                pool.connection(),
+                Path(tmp) / f"notes-{workers}.ndjson",
+                _extract_note_content,
+                workers=workers,
+                chunk_size=args.chunk_size,
+            )
+            seconds = summary["seconds"]
+            baseline = baseline or seconds
+            rate = summary["notes"] / seconds
+            print(f"{workers:>8}{seconds:>10.2f}{rate:>10,.0f}{baseline / seconds:>8.1f}x")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
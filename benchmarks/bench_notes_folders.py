@@ -0,0 +1,93 @@
+"""Benchmark notes_list_folders: per-folder COUNT subqueries vs. one GROUP BY vs. the cache.
+
+The previous query ran a correlated ``SELECT COUNT(*)`` for every folder. The
+new query counts the notes of all folders in a single join with ``GROUP BY``.
+With an index on ``ZFOLDER`` both plans visit every note row once (for its
+``Z_ENT``), so they cost about the same. The saving comes from the cache: the
+nested tree is reused until NoteStore.sqlite or its WAL changes.
+
+Usage:
+    python -m benchmarks.bench_notes_folders [--notes N] [--folders N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.synthetic_notestore import build_notestore_db
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+from src.tools import notes
+
+SUBQUERY = """
+SELECT
+    Z_PK as id,
+    ZTITLE2 as name,
+    (SELECT COUNT(*)
+     FROM ZICCLOUDSYNCINGOBJECT note
+     WHERE note.ZFOLDER = folder.Z_PK AND note.Z_ENT = 12) as note_count
+FROM ZICCLOUDSYNCINGOBJECT folder
+WHERE Z_ENT = 15
+ORDER BY ZTITLE2
+"""
+
+
+def _time_ms(func, iterations: int) -> float:
+    """Return the mean wall time of func() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def _flatten(folders):
+    for folder in folders:
+        yield folder
+        yield from _flatten(folder["children"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=20_000)
+    parser.add_argument("--folders", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating synthetic NoteStore.sqlite with {args.notes:,} notes...")
+        db_path = build_notestore_db(
+            Path(tmp) / "NoteStore.sqlite",
+            notes=args.notes,
+            folders=args.folders,
+            paragraphs=(1, 3),
+            media=False,
+        )
+        pool = ReadOnlyConnectionPool(db_path)
+        with (
+            mock.patch.object(notes, "_get_notes_db_path", lambda: db_path),
+            mock.patch.object(notes, "_get_db_pool", lambda: pool),
+        ):
+            expected = {row[0]: row[2] for row in pool.execute(SUBQUERY)}
+            tree = notes._load_folder_tree()
+            counts = {folder["id"]: folder["note_count"] for folder in _flatten(tree)}
+            if counts != expected:
+                raise SystemExit("Folder counts differ from the per-folder subqueries")
+
+            def uncached():
+                notes._folder_tree = None
+                notes._load_folder_tree()
+
+            subquery_ms = _time_ms(lambda: pool.execute(SUBQUERY), args.iterations)
+            grouped_ms = _time_ms(uncached, args.iterations)
+            cached_ms = _time_ms(notes._load_folder_tree, args.iterations)
+        pool.close()
+
+    print(f"{len(counts)} folders, counts identical\n")
+    print(f"per-folder subqueries: {subquery_ms:8.2f}ms")
+    print(f"GROUP BY + tree:       {grouped_ms:8.2f}ms ({subquery_ms / grouped_ms:.1f}x)")
+    print(f"cached tree:           {cached_ms:8.3f}ms ({subquery_ms / cached_ms:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
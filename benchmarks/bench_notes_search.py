@@ -0,0 +1,128 @@
+"""Benchmark notes_search_notes: title/snippet LIKE scan vs. the FTS5 sidecar index.
+
+The previous implementation ran ``ZTITLE1 LIKE ? OR ZSNIPPET LIKE ?``, a full
+scan that can only find text in the title or the first ~100 characters Notes
+keeps as a snippet. The sidecar index holds the full decoded body of every
+note; after the first build a refresh only decodes notes whose modification
+date changed.
+
+The synthetic notes draw on a vocabulary of ~70 words, so every query term
+matches most notes and FTS5 pays for ranking all of them; rarer real-world
+terms are cheaper to rank.
+
+"found" counts the notes each path can return at all (no LIMIT) out of those
+whose text really contains the term.
+
+Usage:
+    python -m benchmarks.bench_notes_search [--notes N] [--db PATH]
+"""
+
+import argparse
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_notestore import build_notestore_db
+from src.services.notes_index import NotesIndex
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+from src.tools.notes import _extract_note_content
+
+LIKE_QUERY = """
+SELECT note.Z_PK
+FROM ZICCLOUDSYNCINGOBJECT note
+LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
+WHERE note.Z_ENT = 12
+  AND (note.ZTITLE1 LIKE ? OR note.ZSNIPPET LIKE ?)
+ORDER BY note.ZMODIFICATIONDATE1 DESC
+LIMIT ?
+"""
+
+QUERIES = ["dentist", "the docs", "garlic basil", "invoice"]
+
+EDITED_NOTES = 10
+
+
+def _time_ms(func, iterations: int) -> float:
+    """Return the mean wall time of func() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def _edit_notes(db_path: Path, count: int) -> None:
+    """Bump the modification date of the newest notes, as editing them in Notes would."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "UPDATE ZICCLOUDSYNCINGOBJECT SET ZMODIFICATIONDATE1 = ZMODIFICATIONDATE1 + 1 "
+        "WHERE Z_PK IN (SELECT Z_PK FROM ZICCLOUDSYNCINGOBJECT WHERE Z_ENT = 12 "
+        "ORDER BY ZMODIFICATIONDATE1 DESC LIMIT ?)",
+        (count,),
+    )
+    conn.commit()
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--db", type=Path, help="Use a copy of an existing NoteStore.sqlite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "NoteStore.sqlite"
+        if args.db is None:
+            print(f"Generating synthetic NoteStore.sqlite with {args.notes:,} notes...")
+            build_notestore_db(db_path, notes=args.notes)
+        else:
+            shutil.copy(args.db, db_path)
+
+        pool = ReadOnlyConnectionPool(db_path)
+        index = NotesIndex(
+            Path(tmp) / "notes_index.sqlite", pool.execute, _extract_note_content, db_path
+        )
+        build_ms = _time_ms(index.refresh, 1)
+        refresh_ms = _time_ms(index.refresh, args.iterations)
+        _edit_notes(db_path, EDITED_NOTES)
+        edited_ms = _time_ms(index.refresh, 1)
+        print(f"initial index build: {build_ms:,.0f}ms, no-op refresh: {refresh_ms:.3f}ms")
+        print(f"refresh after editing {EDITED_NOTES} notes: {edited_ms:.2f}ms\n")
+
+        texts = {
+            note_id: (title or "") + "\n" + _extract_note_content(data).lower()
+            for note_id, title, data in pool.execute(
+                "SELECT note.Z_PK, note.ZTITLE1, data.ZDATA FROM ZICCLOUDSYNCINGOBJECT note "
+                "JOIN ZICNOTEDATA data ON data.Z_PK = note.ZNOTEDATA WHERE note.Z_ENT = 12"
+            )
+        }
+
+        everything = len(texts)
+        print(f"{'query':<16}{'LIKE':>10}{'found':>12}{'FTS5':>12}{'found':>12}")
+        for query in QUERIES:
+            relevant = {note_id for note_id, text in texts.items() if query in text.lower()}
+            pattern = f"%{query}%"
+            like_ms = _time_ms(
+                lambda: pool.execute(LIKE_QUERY, (pattern, pattern, args.limit)), args.iterations
+            )
+            fts_ms = _time_ms(
+                lambda: (index.refresh(), index.search(f'"{query}"', args.limit)),
+                args.iterations,
+            )
+            like_found = len(
+                relevant
+                & {row[0] for row in pool.execute(LIKE_QUERY, (pattern, pattern, everything))}
+            )
+            fts_found = len(
+                relevant & {hit["note_id"] for hit in index.search(f'"{query}"', everything)}
+            )
+            found = f"{like_found}/{len(relevant)}", f"{fts_found}/{len(relevant)}"
+            print(f"{query:<16}{like_ms:>8.2f}ms{found[0]:>12}{fts_ms:>10.2f}ms{found[1]:>12}")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Generate a synthetic Contacts ``AddressBook-v22.abcddb`` for benchmarks.
+
+Only the tables and columns the contact resolver reads are created, using the
+Core Data names of the macOS Contacts database. The phone numbers are those of
+the handles in ``benchmarks.synthetic_chat_db``, written in the mixed formats
+people type into Contacts, so the database doubles as a fixture for handle
+normalization on machines without Contacts.app.
+
+Usage:
+    python -m benchmarks.synthetic_addressbook OUTPUT_DIR [--handles N]
+"""
+
+import argparse
+import random
+import sqlite3
+from pathlib import Path
+
+from src.services.addressbook import ADDRESSBOOK_FILENAME
+
+SCHEMA = """
+CREATE TABLE ZABCDRECORD (
+    Z_PK INTEGER PRIMARY KEY,
+    Z_ENT INTEGER,
+    ZFIRSTNAME VARCHAR,
+    ZLASTNAME VARCHAR,
+    ZNICKNAME VARCHAR,
+    ZORGANIZATION VARCHAR
+);
+CREATE TABLE ZABCDPHONENUMBER (
+    Z_PK INTEGER PRIMARY KEY,
+    ZOWNER INTEGER,
+    ZLABEL VARCHAR,
+    ZFULLNUMBER VARCHAR
+);
+CREATE TABLE ZABCDEMAILADDRESS (
+    Z_PK INTEGER PRIMARY KEY,
+    ZOWNER INTEGER,
+    ZLABEL VARCHAR,
+    ZADDRESS VARCHAR
+);
+CREATE INDEX ZABCDPHONENUMBER_ZOWNER_INDEX ON ZABCDPHONENUMBER (ZOWNER);
+CREATE INDEX ZABCDEMAILADDRESS_ZOWNER_INDEX ON ZABCDEMAILADDRESS (ZOWNER);
+"""
+
+FIRST_NAMES = ["Ana", "Ben", "Chloe", "Dev", "Elif", "Femi", "Greta", "Hiro", "Ines", "Jon"]
+LAST_NAMES = ["Alvarez", "Brooks", "Chen", "Dubois", "Eze", "Fischer", "Gupta", "Haddad"]
+
+# How Contacts users write the number behind handle "+1555NNNNNNN"
+PHONE_FORMATS = [
+    "+1 (555) {a}-{b}",
+    "(555) {a}-{b}",
+    "555.{a}.{b}",
+    "+1 555-{a}-{b}",
+    "1555{a}{b}",
+]
+
+
+def build_addressbook_db(
+    directory: Path,
+    handles: int = 400,
+    named_share: float = 0.75,
+    seed: int = 7,
+) -> Path:
+    """Create a synthetic AddressBook-v22.abcddb in directory (overwriting it).
+
+    Args:
+        directory: Output directory (used as the Contacts directory)
+        handles: Number of handles in the matching synthetic chat.db
+        named_share: Fraction of handles that have a Contacts entry
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        The database path
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / ADDRESSBOOK_FILENAME
+    path.unlink(missing_ok=True)
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+
+    records, phones, emails = [], [], []
+    for h in range(1, handles + 1):
+        if rnd.random() >= named_share:
+            continue
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        # Numbered so every display name is unique
+        records.append((h, 22, first, f"{last} {h}", None, None))
+        digits = f"{h:07d}"
+        number = rnd.choice(PHONE_FORMATS).format(a=digits[:3], b=digits[3:])
+        phones.append((h, "_$!<Mobile>!$_", number))
+        if rnd.random() < 0.5:
+            emails.append((h, "_$!<Home>!$_", f"{first}.{last}{h}@Example.com"))
+    # A company card without a person's name
+    records.append((handles + 1, 22, None, None, None, "Pizza Place"))
+    phones.append((handles + 1, "_$!<Work>!$_", "+1 (555) 999-0000"))
+
+    conn.executemany("INSERT INTO ZABCDRECORD VALUES (?, ?, ?, ?, ?, ?)", records)
+    conn.executemany(
+        "INSERT INTO ZABCDPHONENUMBER (ZOWNER, ZLABEL, ZFULLNUMBER) VALUES (?, ?, ?)", phones
+    )
+    conn.executemany(
+        "INSERT INTO ZABCDEMAILADDRESS (ZOWNER, ZLABEL, ZADDRESS) VALUES (?, ?, ?)", emails
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--handles", type=int, default=400)
+    args = parser.parse_args()
+    path = build_addressbook_db(args.output, handles=args.handles)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
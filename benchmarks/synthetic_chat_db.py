@@ -0,0 +1,210 @@
+"""Generate a synthetic Messages ``chat.db`` for benchmarks.
+
+Only the tables and indexes the iMessage tools read are created, using the
+same column names and index definitions as the macOS Messages database.
+Dates are Apple nanosecond timestamps, like modern chat.db files, and a share
+of messages store their text only in an ``attributedBody`` typedstream.
+
+Usage:
+    python -m benchmarks.synthetic_chat_db OUTPUT.db [--messages N] [--handles N]
+"""
+
+import argparse
+import random
+import sqlite3
+from pathlib import Path
+
+from src.services.typedstream import STREAM_HEADER
+
+SCHEMA = """
+CREATE TABLE handle (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE,
+    id TEXT NOT NULL,
+    country TEXT,
+    service TEXT NOT NULL,
+    uncanonicalized_id TEXT,
+    person_centric_id TEXT
+);
+CREATE TABLE chat (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    guid TEXT UNIQUE NOT NULL,
+    style INTEGER,
+    chat_identifier TEXT,
+    service_name TEXT,
+    display_name TEXT
+);
+CREATE TABLE message (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    guid TEXT UNIQUE NOT NULL,
+    text TEXT,
+    attributedBody BLOB,
+    handle_id INTEGER DEFAULT 0,
+    service TEXT,
+    date INTEGER,
+    date_read INTEGER,
+    is_from_me INTEGER DEFAULT 0,
+    cache_has_attachments INTEGER DEFAULT 0,
+    associated_message_type INTEGER DEFAULT 0
+);
+CREATE TABLE chat_handle_join (
+    chat_id INTEGER REFERENCES chat (ROWID) ON DELETE CASCADE,
+    handle_id INTEGER REFERENCES handle (ROWID) ON DELETE CASCADE,
+    UNIQUE (chat_id, handle_id)
+);
+CREATE TABLE chat_message_join (
+    chat_id INTEGER REFERENCES chat (ROWID) ON DELETE CASCADE,
+    message_id INTEGER REFERENCES message (ROWID) ON DELETE CASCADE,
+    message_date INTEGER DEFAULT 0,
+    PRIMARY KEY (chat_id, message_id)
+);
+CREATE INDEX message_idx_handle ON message (handle_id, date);
+CREATE INDEX message_idx_date ON message (date);
+CREATE INDEX chat_message_join_idx_message_id_only ON chat_message_join (message_id);
+CREATE INDEX chat_message_join_idx_message_date_id_chat_id
+    ON chat_message_join (chat_id, message_date, message_id);
+"""
+
+# Apple nanosecond timestamp for 2020-01-01
+START_DATE = 599_616_000 * 1_000_000_000
+
+WORDS = (
+    "hey are we still on for lunch tomorrow running late see you soon "
+    "can you send the address thanks love it call me when you land "
+    "meeting moved to three dinner at seven pick up milk on the way"
+).split()
+
+# Long tail of rarer words (names, places, topics) with a Zipf-like frequency,
+# so searches for uncommon terms behave like they do on real histories
+RARE_WORDS = [
+    f"{a}{b}{c}"
+    for a in "bdfgklmnprst"
+    for b in "aeiou"
+    for c in ("lo", "ven", "tra", "mi", "rek", "san", "dor", "qui")
+]
+
+
+def _typedstream_int(value: int) -> bytes:
+    if value < 0x80:
+        return bytes([value])
+    if value < 0x10000:
+        return b"\x81" + value.to_bytes(2, "little")
+    return b"\x82" + value.to_bytes(4, "little")
+
+
+def encode_attributed_body(text: str) -> bytes:
+    """Serialize text the way Messages stores it in message.attributedBody."""
+    data = text.encode("utf-8")
+    return (
+        STREAM_HEADER
+        + b"\x81\xe8\x03\x84\x01@\x84\x84\x84\x12NSAttributedString\x00"
+        + b"\x84\x84\x08NSObject\x00\x85\x92\x84\x84\x84\x08NSString\x01\x94\x84\x01+"
+        + _typedstream_int(len(data))
+        + data
+        + b"\x86\x84\x02iI\x01"
+        + _typedstream_int(len(text.encode("utf-16-le")) // 2)
+        + b"\x92\x84\x84\x84\x0cNSDictionary\x00\x94\x84\x01i\x01\x92\x84\x96\x96"
+        + b"\x1d__kIMMessagePartAttributeName\x86\x92\x84\x84\x84\x08NSNumber\x00"
+        + b"\x84\x84\x07NSValue\x00\x94\x84\x01*\x84\x99\x99\x00\x86\x86\x86"
+    )
+
+
+def build_chat_db(
+    path: Path,
+    messages: int = 500_000,
+    handles: int = 400,
+    groups: int = 40,
+    attributed_share: float = 0.3,
+    seed: int = 7,
+) -> Path:
+    """Create a synthetic chat.db at path (overwriting it).
+
+    Args:
+        path: Output database path
+        messages: Number of messages
+        handles: Number of contacts, each with a 1:1 chat
+        groups: Number of group chats with 3-6 participants each
+        attributed_share: Fraction of messages with text only in attributedBody
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        The database path
+    """
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+
+    conn.executemany(
+        "INSERT INTO handle (ROWID, id, service) VALUES (?, ?, 'iMessage')",
+        [(h, f"+1555{h:07d}") for h in range(1, handles + 1)],
+    )
+    chats = []
+    for h in range(1, handles + 1):
+        chats.append((h, f"iMessage;-;+1555{h:07d}", 45, f"+1555{h:07d}", "", [h]))
+    for g in range(1, groups + 1):
+        members = rnd.sample(range(1, handles + 1), rnd.randint(3, 6))
+        chats.append((handles + g, f"iMessage;+;chat{g}", 43, f"chat{g}", f"Group {g}", members))
+    conn.executemany(
+        "INSERT INTO chat (ROWID, guid, style, chat_identifier, service_name, display_name) "
+        "VALUES (?, ?, ?, ?, 'iMessage', ?)",
+        [chat[:5] for chat in chats],
+    )
+    conn.executemany(
+        "INSERT INTO chat_handle_join (chat_id, handle_id) VALUES (?, ?)",
+        [(chat[0], member) for chat in chats for member in chat[5]],
+    )
+
+    # Skew traffic so a few chats are busy and most are quiet, as in real data
+    weights = [1 / (rank + 1) for rank in range(len(chats))]
+    rnd.shuffle(weights)
+    rare_weights = [1 / (rank + 1) for rank in range(len(RARE_WORDS))]
+    rare_cum_weights = [sum(rare_weights[: i + 1]) for i in range(len(rare_weights))]
+    date = START_DATE
+    message_rows, join_rows = [], []
+    for rowid in range(1, messages + 1):
+        chat = rnd.choices(chats, weights)[0]
+        is_from_me = rnd.random() < 0.4
+        # Like Messages, sent messages in a 1:1 chat carry the recipient's handle
+        if is_from_me:
+            handle_id = chat[5][0] if len(chat[5]) == 1 else 0
+        else:
+            handle_id = rnd.choice(chat[5])
+        date += rnd.randint(1, 600) * 1_000_000_000
+        words = rnd.choices(WORDS, k=rnd.randint(2, 20))
+        words += rnd.choices(RARE_WORDS, cum_weights=rare_cum_weights, k=rnd.randint(0, 2))
+        rnd.shuffle(words)
+        text = " ".join(words)
+        body = None
+        if rnd.random() < attributed_share:
+            text, body = None, encode_attributed_body(text)
+        message_rows.append((rowid, f"guid-{rowid}", text, body, handle_id, date, int(is_from_me)))
+        join_rows.append((chat[0], rowid, date))
+    conn.executemany(
+        "INSERT INTO message "
+        "(ROWID, guid, text, attributedBody, handle_id, service, date, is_from_me) "
+        "VALUES (?, ?, ?, ?, ?, 'iMessage', ?, ?)",
+        message_rows,
+    )
+    conn.executemany(
+        "INSERT INTO chat_message_join (chat_id, message_id, message_date) VALUES (?, ?, ?)",
+        join_rows,
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--handles", type=int, default=400)
+    args = parser.parse_args()
+    build_chat_db(args.output, messages=args.messages, handles=args.handles)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
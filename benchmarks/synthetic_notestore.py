@@ -0,0 +1,539 @@
+"""Generate a synthetic Notes ``NoteStore.sqlite`` for benchmarks.
+
+Only the tables and columns the Notes tools read are created, using the Core
+Data names of the macOS Notes database. Note bodies are gzip-compressed
+``NoteStoreProto`` protobufs like the ones Notes writes: the text of the note
+plus attribute runs for headings, checklists, links, and inline attachments.
+
+Attachments get their own rows: images and PDFs with an ICMedia row and a file
+under ``Accounts/<account>/Media/<media id>/`` next to the database, scanned
+documents (galleries of page images), links, hashtags, and embedded tables
+whose cells are stored as a ``MergableDataProto`` CRDT document.
+
+Usage:
+    python -m benchmarks.synthetic_notestore OUTPUT.sqlite [--notes N]
+"""
+
+import argparse
+import gzip
+import random
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE Z_PRIMARYKEY (
+    Z_ENT INTEGER PRIMARY KEY,
+    Z_NAME VARCHAR,
+    Z_SUPER INTEGER,
+    Z_MAX INTEGER
+);
+CREATE TABLE ZICCLOUDSYNCINGOBJECT (
+    Z_PK INTEGER PRIMARY KEY,
+    Z_ENT INTEGER,
+    ZIDENTIFIER VARCHAR,
+    ZMARKEDFORDELETION INTEGER,
+    ZFOLDER INTEGER,
+    ZNOTEDATA INTEGER,
+    ZPARENT INTEGER,
+    ZFOLDERTYPE INTEGER,
+    ZCREATIONDATE1 TIMESTAMP,
+    ZMODIFICATIONDATE1 TIMESTAMP,
+    ZTITLE1 VARCHAR,
+    ZTITLE2 VARCHAR,
+    ZSNIPPET VARCHAR,
+    ZNOTE INTEGER,
+    ZNOTE1 INTEGER,
+    ZMEDIA INTEGER,
+    ZPARENTATTACHMENT INTEGER,
+    ZTYPEUTI VARCHAR,
+    ZTYPEUTI1 VARCHAR,
+    ZTITLE VARCHAR,
+    ZUSERTITLE VARCHAR,
+    ZALTTEXT VARCHAR,
+    ZURLSTRING VARCHAR,
+    ZFILENAME VARCHAR,
+    ZGENERATION1 VARCHAR,
+    ZFILESIZE INTEGER,
+    ZMERGEABLEDATA1 BLOB
+);
+CREATE TABLE ZICNOTEDATA (
+    Z_PK INTEGER PRIMARY KEY,
+    Z_ENT INTEGER,
+    ZNOTE INTEGER,
+    ZDATA BLOB
+);
+CREATE INDEX ZICCLOUDSYNCINGOBJECT_ZFOLDER_INDEX ON ZICCLOUDSYNCINGOBJECT (ZFOLDER);
+CREATE INDEX ZICCLOUDSYNCINGOBJECT_ZNOTEDATA_INDEX ON ZICCLOUDSYNCINGOBJECT (ZNOTEDATA);
+CREATE INDEX ZICCLOUDSYNCINGOBJECT_ZPARENT_INDEX ON ZICCLOUDSYNCINGOBJECT (ZPARENT);
+CREATE INDEX ZICCLOUDSYNCINGOBJECT_ZNOTE_INDEX ON ZICCLOUDSYNCINGOBJECT (ZNOTE);
+CREATE INDEX ZICCLOUDSYNCINGOBJECT_ZMEDIA_INDEX ON ZICCLOUDSYNCINGOBJECT (ZMEDIA);
+CREATE INDEX ZICCLOUDSYNCINGOBJECT_ZPARENTATTACHMENT_INDEX
+    ON ZICCLOUDSYNCINGOBJECT (ZPARENTATTACHMENT);
+CREATE INDEX ZICNOTEDATA_ZNOTE_INDEX ON ZICNOTEDATA (ZNOTE);
+"""
+
+WORDS = (
+    "the of and to meeting notes project idea list buy milk eggs bread call mom "
+    "review budget plan trip flight hotel address recipe garlic onion butter salt "
+    "draft chapter outline todo reminder book dentist invoice tax receipt garden "
+    "tomato basil summary action items follow up agenda design api server deploy"
+).split()
+
+# ParagraphStyle.style_type values written by Notes
+STYLE_TITLE = 0
+STYLE_HEADING = 1
+STYLE_CHECKLIST = 103
+
+# Notes writes U+FFFC where an attachment sits in the text
+ATTACHMENT_CHARACTER = "￼"
+
+# Attachment type UTIs
+UTI_JPEG = "public.jpeg"
+UTI_PDF = "com.adobe.pdf"
+UTI_TABLE = "com.apple.notes.table"
+UTI_GALLERY = "com.apple.notes.gallery"
+UTI_URL = "public.url"
+UTI_HASHTAG = "com.apple.notes.inlinetextattachment.hashtag"
+
+# Z_ENT values of the attachment-related entities
+ATTACHMENT_ENTITY = 5
+MEDIA_ENTITY = 11
+INLINE_ATTACHMENT_ENTITY = 9
+
+# File signatures, so media files look like what their UTI says
+_MAGIC = {UTI_JPEG: b"\xff\xd8\xff\xe0\x00\x10JFIF\x00", UTI_PDF: b"%PDF-1.7\n"}
+
+# Apple epoch seconds for 2024-10-17, the newest modification date generated
+_NEWEST = 750_816_000.0
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field_varint(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _field_bytes(number: int, value: bytes) -> bytes:
+    return _varint((number << 3) | 2) + _varint(len(value)) + value
+
+
+def _utf16_length(text: str) -> int:
+    # Attribute run lengths count UTF-16 code units, like NSString
+    return len(text.encode("utf-16-le")) // 2
+
+
+# One styled piece of note text: (text, style_type, checked, link, attachment (id, uti))
+Run = Tuple[str, Optional[int], Optional[bool], Optional[str], Optional[Tuple[str, str]]]
+
+
+def encode_note(runs: List[Run]) -> bytes:
+    """Encode styled runs as a gzip-compressed NoteStoreProto.
+
+    Args:
+        runs: Pieces of text with their paragraph style, checklist state,
+            link target, and attachment (identifier, type UTI)
+
+    Returns:
+        Bytes as stored in ZICNOTEDATA.ZDATA
+    """
+    text = "".join(run[0] for run in runs)
+    attribute_runs = b""
+    for run_text, style, checked, link, attachment in runs:
+        body = _field_varint(1, _utf16_length(run_text))
+        if style is not None:
+            paragraph = _field_varint(1, style)
+            if checked is not None:
+                checklist = _field_bytes(
+                    1, uuid.uuid5(uuid.NAMESPACE_OID, run_text).bytes
+                ) + _field_varint(2, int(checked))
+                paragraph += _field_bytes(5, checklist)
+            body += _field_bytes(2, paragraph)
+        if link:
+            body += _field_bytes(9, link.encode())
+        if attachment:
+            identifier, type_uti = attachment
+            info = _field_bytes(1, identifier.encode()) + _field_bytes(2, type_uti.encode())
+            body += _field_bytes(12, info)
+        attribute_runs += _field_bytes(5, body)
+    note = _field_bytes(2, text.encode("utf-8")) + attribute_runs
+    document = _field_varint(1, 0) + _field_varint(2, 0) + _field_bytes(3, note)
+    proto = _field_varint(1, 0) + _field_bytes(2, document)
+    return gzip.compress(proto, mtime=0)
+
+
+def _object_id(value: Optional[int] = None, index: Optional[int] = None) -> bytes:
+    body = b""
+    if value is not None:
+        body += _field_varint(2, value)
+    if index is not None:
+        body += _field_varint(6, index)
+    return body
+
+
+def encode_table(rows: List[List[str]]) -> bytes:
+    """Encode table cells as a gzip-compressed MergableDataProto, like ZMERGEABLEDATA1.
+
+    Args:
+        rows: Cell texts, one list per row (all rows the same length)
+
+    Returns:
+        Bytes as stored in ZICCLOUDSYNCINGOBJECT.ZMERGEABLEDATA1 of a table
+    """
+    keys = ["crRows", "crColumns", "cellColumns", "UUIDIndex"]
+    types = ["com.apple.notes.ICTable", "com.apple.CRDT.NSUUID"]
+    row_count, column_count = len(rows), len(rows[0]) if rows else 0
+    # Every row and column has an ordering UUID and the UUID cells refer to it by
+    names = [f"row-{i}" for i in range(row_count)] + [f"column-{i}" for i in range(column_count)]
+    uuids = [
+        uuid.uuid5(uuid.NAMESPACE_OID, f"{name}/{kind}").bytes for name in names for kind in "oc"
+    ]
+
+    def uuid_entry(uuid_index: int) -> bytes:
+        map_entry = _field_varint(1, keys.index("UUIDIndex")) + _field_bytes(
+            2, _object_id(uuid_index)
+        )
+        return _field_bytes(13, _field_varint(1, 1) + _field_bytes(3, map_entry))
+
+    def dictionary(pairs: List[Tuple[int, int]]) -> bytes:
+        return b"".join(
+            _field_bytes(
+                1, _field_bytes(1, _object_id(index=k)) + _field_bytes(2, _object_id(index=v))
+            )
+            for k, v in pairs
+        )
+
+    # Entries 0-3: table, rows, columns, cellColumns; then one per UUID
+    uuid_entries = {i: 4 + i for i in range(len(uuids))}
+    entries = [b"", b"", b"", b""] + [uuid_entry(i) for i in range(len(uuids))]
+
+    def ordered_set(first: int, count: int) -> bytes:
+        array = b"".join(
+            _field_bytes(2, _field_varint(1, i) + _field_bytes(2, uuids[2 * (first + i)]))
+            for i in range(count)
+        )
+        contents = dictionary(
+            [
+                (uuid_entries[2 * (first + i)], uuid_entries[2 * (first + i) + 1])
+                for i in range(count)
+            ]
+        )
+        return _field_bytes(16, _field_bytes(1, _field_bytes(1, array) + _field_bytes(2, contents)))
+
+    columns = []
+    for c in range(column_count):
+        cells = []
+        for r in range(row_count):
+            entries.append(_field_bytes(10, _field_bytes(2, rows[r][c].encode())))
+            cells.append((uuid_entries[2 * r + 1], len(entries) - 1))
+        entries.append(_field_bytes(6, dictionary(cells)))
+        columns.append((uuid_entries[2 * (row_count + c) + 1], len(entries) - 1))
+
+    root = b"".join(
+        _field_bytes(3, _field_varint(1, keys.index(key)) + _field_bytes(2, _object_id(index=i)))
+        for i, key in enumerate(["crRows", "crColumns", "cellColumns"], start=1)
+    )
+    entries[0] = _field_bytes(13, _field_varint(1, 0) + root)
+    entries[1] = ordered_set(0, row_count)
+    entries[2] = ordered_set(row_count, column_count)
+    entries[3] = _field_bytes(6, dictionary(columns))
+
+    data = b"".join(_field_bytes(3, entry) for entry in entries)
+    data += b"".join(_field_bytes(4, key.encode()) for key in keys)
+    data += b"".join(_field_bytes(5, name.encode()) for name in types)
+    data += b"".join(_field_bytes(6, value) for value in uuids)
+    proto = _field_bytes(2, _field_varint(2, 1) + _field_bytes(3, data))
+    return gzip.compress(proto, mtime=0)
+
+
+def _identifier(rnd: random.Random) -> str:
+    return str(uuid.UUID(int=rnd.getrandbits(128))).upper()
+
+
+def _sentence(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def random_note(rnd: random.Random, paragraphs: int) -> Tuple[str, List[Run]]:
+    """Generate a note: title line, then headings, paragraphs, checklists, and links.
+
+    Returns:
+        Tuple of (title, runs)
+    """
+    title = _sentence(rnd, rnd.randint(2, 5))
+    runs: List[Run] = [(title + "\n", STYLE_TITLE, None, None, None)]
+    for _ in range(paragraphs):
+        kind = rnd.random()
+        if kind < 0.1:
+            runs.append((_sentence(rnd, 3) + "\n", STYLE_HEADING, None, None, None))
+        elif kind < 0.25:
+            for _ in range(rnd.randint(2, 5)):
+                item = _sentence(rnd, rnd.randint(2, 6)) + "\n"
+                runs.append((item, STYLE_CHECKLIST, rnd.random() < 0.5, None, None))
+        elif kind < 0.3:
+            runs.append(("See ", None, None, None, None))
+            runs.append(("the docs", None, None, "https://example.com/docs", None))
+            runs.append((" for details 📎\n", None, None, None, None))
+        elif kind < 0.31:
+            attachment = (
+                _identifier(rnd),
+                rnd.choice([UTI_JPEG, UTI_PDF, UTI_JPEG, UTI_PDF, UTI_TABLE, UTI_GALLERY, UTI_URL]),
+            )
+            runs.append((ATTACHMENT_CHARACTER, None, None, None, attachment))
+            runs.append(("\n", None, None, None, None))
+        elif kind < 0.33:
+            runs.append((_sentence(rnd, rnd.randint(2, 6)) + " ", None, None, None, None))
+            runs.append((ATTACHMENT_CHARACTER, None, None, None, (_identifier(rnd), UTI_HASHTAG)))
+            runs.append(("\n", None, None, None, None))
+        else:
+            text = " ".join(_sentence(rnd, rnd.randint(5, 15)) + "." for _ in range(3))
+            runs.append((text + "\n", None, None, None, None))
+    return title, runs
+
+
+class _AttachmentWriter:
+    """Collects attachment and media rows and writes media files for build_notestore_db."""
+
+    def __init__(self, rnd: random.Random, first_pk: int, media_dir: Optional[Path]):
+        self.rnd = rnd
+        self.next_pk = first_pk
+        self.media_dir = media_dir
+        self.rows: List[tuple] = []
+
+    def _pk(self) -> int:
+        self.next_pk += 1
+        return self.next_pk - 1
+
+    def _media(self, uti: str, filename: str) -> int:
+        """Add an ICMedia row and write its file; returns the media Z_PK."""
+        pk, identifier = self._pk(), _identifier(self.rnd)
+        size = self.rnd.randint(2_000, 60_000)
+        # Newer macOS versions add a generation directory
+        generation = _identifier(self.rnd) if self.rnd.random() < 0.5 else None
+        self.rows.append(
+            (
+                pk,
+                MEDIA_ENTITY,
+                identifier,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                filename,
+                None,
+                filename,
+                generation,
+                size,
+                None,
+            )
+        )
+        if self.media_dir is not None:
+            directory = self.media_dir / identifier
+            if generation:
+                directory /= generation
+            directory.mkdir(parents=True, exist_ok=True)
+            data = _MAGIC[uti] + self.rnd.randbytes(size - len(_MAGIC[uti]))
+            (directory / filename).write_bytes(data)
+        return pk
+
+    def add(self, note_pk: int, identifier: str, uti: str, parent: Optional[int] = None) -> None:
+        """Add the rows behind one attachment of a note."""
+        rnd = self.rnd
+        pk = self._pk()
+        title = media = url = table = alt_text = None
+        if uti == UTI_HASHTAG:
+            alt_text = "#" + rnd.choice(WORDS)
+            self.rows.append(
+                (
+                    pk,
+                    INLINE_ATTACHMENT_ENTITY,
+                    identifier,
+                    None,
+                    note_pk,
+                    None,
+                    None,
+                    None,
+                    uti,
+                    alt_text,
+                    None,
+                    None,
+                    None,
+                    None,
+                    None,
+                    None,
+                )
+            )
+            return
+        if uti in _MAGIC:
+            extension = "jpeg" if uti == UTI_JPEG else "pdf"
+            title = f"{_sentence(rnd, 2).replace(' ', '_')}.{extension}"
+            media = self._media(uti, title)
+        elif uti == UTI_URL:
+            url = f"https://example.com/{rnd.choice(WORDS)}/{rnd.randrange(1000)}"
+            title = _sentence(rnd, 3)
+        elif uti == UTI_TABLE:
+            columns = rnd.randint(2, 4)
+            rows = [[rnd.choice(WORDS).capitalize() for _ in range(columns)]]
+            rows += [
+                [_sentence(rnd, rnd.randint(1, 3)) for _ in range(columns)]
+                for _ in range(rnd.randint(1, 5))
+            ]
+            table = encode_table(rows)
+        elif uti == UTI_GALLERY:
+            title = "Scanned Document"
+        self.rows.append(
+            (
+                pk,
+                ATTACHMENT_ENTITY,
+                identifier,
+                note_pk,
+                None,
+                media,
+                parent,
+                uti,
+                None,
+                None,
+                title,
+                url,
+                None,
+                None,
+                None,
+                table,
+            )
+        )
+        if uti == UTI_GALLERY:
+            # A scan is a gallery of page images with their own attachment rows
+            for _ in range(rnd.randint(1, 3)):
+                self.add(note_pk, _identifier(rnd), UTI_JPEG, parent=pk)
+
+
+def build_notestore_db(
+    path: Path,
+    notes: int = 2000,
+    folders: int = 12,
+    paragraphs: Tuple[int, int] = (2, 40),
+    note_entity: int = 12,
+    folder_entity: int = 15,
+    seed: int = 7,
+    media: bool = True,
+) -> Path:
+    """Create a synthetic NoteStore.sqlite at path (overwriting it).
+
+    Args:
+        path: Output database path
+        notes: Number of notes
+        folders: Number of folders; every third one is nested in the previous one
+        paragraphs: Range of paragraphs per note
+        note_entity: Z_ENT of ICNote (differs between macOS versions)
+        folder_entity: Z_ENT of ICFolder
+        seed: Random seed, so runs are reproducible
+        media: Write media files under ``Accounts/`` next to the database
+
+    Returns:
+        The database path
+    """
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+
+    conn.executemany(
+        "INSERT INTO Z_PRIMARYKEY (Z_ENT, Z_NAME, Z_SUPER, Z_MAX) VALUES (?, ?, ?, 0)",
+        [
+            (1, "ICCloudSyncingObject", 0),
+            (note_entity, "ICNote", 1),
+            (folder_entity, "ICFolder", 1),
+            (19, "ICNoteData", 0),
+            (ATTACHMENT_ENTITY, "ICAttachment", 1),
+            (MEDIA_ENTITY, "ICMedia", 1),
+            (INLINE_ATTACHMENT_ENTITY, "ICInlineAttachment", 1),
+        ],
+    )
+
+    folder_rows = []
+    for f in range(1, folders + 1):
+        parent = f - 1 if f % 3 == 0 else None
+        folder_rows.append((f, folder_entity, _identifier(rnd), 0, parent, 0, f"Folder {f}"))
+    conn.executemany(
+        "INSERT INTO ZICCLOUDSYNCINGOBJECT "
+        "(Z_PK, Z_ENT, ZIDENTIFIER, ZMARKEDFORDELETION, ZPARENT, ZFOLDERTYPE, ZTITLE2) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        folder_rows,
+    )
+
+    media_dir = path.parent / "Accounts" / _identifier(rnd) / "Media" if media else None
+    attachments = _AttachmentWriter(rnd, folders + notes + 1, media_dir)
+    note_rows, data_rows = [], []
+    for n in range(1, notes + 1):
+        pk = folders + n
+        title, runs = random_note(rnd, rnd.randint(*paragraphs))
+        for run in runs:
+            if run[4] is not None:
+                attachments.add(pk, *run[4])
+        body = "".join(run[0] for run in runs)[len(title) + 1 :]
+        created = _NEWEST - rnd.random() * 3 * 365 * 86_400
+        modified = created + rnd.random() * (_NEWEST - created)
+        note_rows.append(
+            (
+                pk,
+                note_entity,
+                _identifier(rnd),
+                0,
+                rnd.randint(1, folders),
+                n,
+                created,
+                modified,
+                title,
+                body[:100].replace("\n", " "),
+            )
+        )
+        data_rows.append((n, 19, pk, encode_note(runs)))
+    conn.executemany(
+        "INSERT INTO ZICCLOUDSYNCINGOBJECT "
+        "(Z_PK, Z_ENT, ZIDENTIFIER, ZMARKEDFORDELETION, ZFOLDER, ZNOTEDATA, "
+        "ZCREATIONDATE1, ZMODIFICATIONDATE1, ZTITLE1, ZSNIPPET) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        note_rows,
+    )
+    conn.executemany(
+        "INSERT INTO ZICNOTEDATA (Z_PK, Z_ENT, ZNOTE, ZDATA) VALUES (?, ?, ?, ?)", data_rows
+    )
+    conn.executemany(
+        "INSERT INTO ZICCLOUDSYNCINGOBJECT "
+        "(Z_PK, Z_ENT, ZIDENTIFIER, ZNOTE, ZNOTE1, ZMEDIA, ZPARENTATTACHMENT, ZTYPEUTI, "
+        "ZTYPEUTI1, ZALTTEXT, ZTITLE, ZURLSTRING, ZFILENAME, ZGENERATION1, ZFILESIZE, "
+        "ZMERGEABLEDATA1) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        attachments.rows,
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--notes", type=int, default=2000)
+    args = parser.parse_args()
+    build_notestore_db(args.output, notes=args.notes)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
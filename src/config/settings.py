@@ -30,8 +30,15 @@ class Settings(BaseSettings):
     mcp_http_json_response: bool = Field(False, env="MCP_HTTP_JSON_RESPONSE")
     log_level: str = Field("INFO", env="LOG_LEVEL")
 
+    # Worker threads per blocking-call pool (Google, Slack, SQLite)
+    executor_max_workers: int = Field(8, env="EXECUTOR_MAX_WORKERS")
+
     # Directories
     credentials_dir: Path = Field(Path(".credentials"), env="CREDENTIALS_DIR")
+    data_dir: Path = Field(Path(".data"), env="DATA_DIR")  # Local mirrors and indexes
+    # Contacts databases used to show names in iMessage results
+    # (default: ~/Library/Application Support/AddressBook)
+    addressbook_dir: Optional[Path] = Field(None, env="ADDRESSBOOK_DIR")
 
     class Config:
         env_file = ".env"
@@ -41,8 +48,9 @@ class Settings(BaseSettings):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Ensure credentials directory exists
+        # Ensure credentials and data directories exist
         self.credentials_dir.mkdir(parents=True, exist_ok=True)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
 
 
 # Singleton instance
@@ -17,6 +17,8 @@ Inspired by:
 
 import contextlib
 import logging
+from pathlib import Path
+from typing import Any, Dict
 
 import click
 import uvicorn
@@ -26,7 +28,9 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
 
 from .config import get_settings
+from .services.executor import configure_executors, get_executor_stats, shutdown_executors
 from .services.oauth import GoogleOAuthManager
+from .services.sqlite_pool import close_readonly_pools
 from .tools import (
     register_gmail_tools,
     register_calendar_tools,
@@ -36,6 +40,7 @@ from .tools import (
     register_whatsapp_tools,
     register_amazon_tools,
 )
+from .tools.notes import export_all_notes
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -79,6 +84,18 @@ def create_server(json_response: bool = False) -> FastMCP:
     mcp = FastMCP("assist-me", json_response=json_response)
     settings = get_settings()
 
+    # Blocking client calls (Google, Slack, SQLite) run in bounded thread pools
+    configure_executors(settings.executor_max_workers)
+
+    @mcp.tool()
+    async def server_executor_stats() -> Dict[str, Dict[str, Any]]:
+        """Report queue-depth metrics for the server's blocking-call pools.
+
+        Returns:
+            Mapping of pool name to max_workers, queued, running, completed, and failed
+        """
+        return get_executor_stats()
+
     # Register tools based on available configuration
     logger.info("Registering tools...")
 
@@ -87,7 +104,7 @@ def create_server(json_response: bool = False) -> FastMCP:
 
     # Google Workspace tools (Gmail, Calendar)
     if oauth_manager:
-        register_gmail_tools(mcp, oauth_manager)
+        register_gmail_tools(mcp, oauth_manager, settings.data_dir)
         register_calendar_tools(mcp, oauth_manager)
         logger.info("Registered Gmail and Calendar tools")
     else:
@@ -106,8 +123,8 @@ def create_server(json_response: bool = False) -> FastMCP:
     import platform
 
     if platform.system() == "Darwin":
-        register_imessage_tools(mcp)
-        register_notes_tools(mcp)
+        register_imessage_tools(mcp, settings.data_dir, settings.addressbook_dir)
+        register_notes_tools(mcp, settings.data_dir)
         logger.info("Registered iMessage and Notes tools (macOS)")
     else:
         logger.info("Skipping iMessage and Notes tools (not on macOS)")
@@ -126,7 +143,7 @@ def create_server(json_response: bool = False) -> FastMCP:
     return mcp
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("--port", default=None, help="Port to listen on for HTTP (overrides MCP_SERVER_PORT env var)")
 @click.option(
     "--log-level",
@@ -139,12 +156,17 @@ def create_server(json_response: bool = False) -> FastMCP:
     default=None,
     help="Enable JSON responses instead of SSE streams (overrides MCP_HTTP_JSON_RESPONSE env var)",
 )
+@click.pass_context
 def main(
+    ctx: click.Context,
     port: int | None,
     log_level: str | None,
     json_response: bool | None,
 ) -> int:
     """Run the Assist-Me MCP Server using HTTP Streamable transport."""
+    if ctx.invoked_subcommand is not None:
+        return 0
+
     # Load settings from environment
     settings = get_settings()
 
@@ -180,6 +202,8 @@ def main(
                 yield
             finally:
                 logger.info("Application shutting down...")
+                shutdown_executors()
+                close_readonly_pools()
 
     # Create Starlette app with FastMCP's streamable HTTP app
     # Mount at root - FastMCP handles the /mcp endpoint internally
@@ -211,6 +235,27 @@ def main(
     return 0
 
 
+@main.command("export-notes")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--workers", type=int, default=None, help="Decoder processes (default: CPU count)")
+@click.option(
+    "--chunk-size", type=int, default=200, show_default=True, help="Notes per worker task"
+)
+def export_notes_command(output: Path, workers: int | None, chunk_size: int) -> None:
+    """Export all Mac Notes with their content to an NDJSON file (macOS only)."""
+    try:
+        summary = export_all_notes(output, workers, chunk_size)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    finally:
+        close_readonly_pools()
+    click.echo(
+        f"Exported {summary['notes']:,} notes to {summary['path']} "
+        f"({summary['bytes'] / 1e6:.1f} MB, {summary['errors']} errors) "
+        f"in {summary['seconds']:.1f}s with {summary['workers']} workers"
+    )
+
+
 def run():
     """Run the server (synchronous entry point)."""
     main()
@@ -1,5 +1,27 @@
 """Services for OAuth, database, and other shared functionality."""
 
 from .oauth import GoogleOAuthManager
+from .executor import (
+    GOOGLE_POOL,
+    SLACK_POOL,
+    SQLITE_POOL,
+    configure_executors,
+    get_executor_stats,
+    run_blocking,
+    shutdown_executors,
+)
+from .sqlite_pool import ReadOnlyConnectionPool, close_readonly_pools, get_readonly_pool
 
-__all__ = ["GoogleOAuthManager"]
+__all__ = [
+    "GoogleOAuthManager",
+    "GOOGLE_POOL",
+    "SLACK_POOL",
+    "SQLITE_POOL",
+    "configure_executors",
+    "get_executor_stats",
+    "run_blocking",
+    "shutdown_executors",
+    "ReadOnlyConnectionPool",
+    "close_readonly_pools",
+    "get_readonly_pool",
+]
@@ -0,0 +1,258 @@
+"""Contact name resolution from the macOS Contacts (AddressBook) database.
+
+Contacts.app keeps its data in Core Data SQLite stores named
+``AddressBook-v22.abcddb``: one in ``~/Library/Application Support/AddressBook``
+and one per account under its ``Sources/<UUID>/`` subdirectories. The
+tables the resolver needs are::
+
+    ZABCDRECORD          Z_PK, ZFIRSTNAME, ZLASTNAME, ZNICKNAME, ZORGANIZATION
+    ZABCDPHONENUMBER     ZOWNER -> ZABCDRECORD.Z_PK, ZFULLNUMBER
+    ZABCDEMAILADDRESS    ZOWNER -> ZABCDRECORD.Z_PK, ZADDRESS
+
+The stores are read once into in-memory dictionaries keyed by normalized phone
+number or email. The dictionaries are rebuilt when any store's modification
+time changes. Lookups never touch SQLite, so resolving every row of a result
+set costs one dict lookup per handle.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ADDRESSBOOK_FILENAME = "AddressBook-v22.abcddb"
+
+# Phone numbers are also indexed by their last digits, so "+1 (555) 123-4567"
+# in Contacts matches the "+15551234567" handle Messages stores
+PHONE_SUFFIX_DIGITS = 10
+
+_NON_DIGITS_RE = re.compile(r"\D")
+
+_RECORDS_QUERY = """
+SELECT Z_PK, ZFIRSTNAME, ZLASTNAME, ZNICKNAME, ZORGANIZATION
+FROM ZABCDRECORD
+"""
+
+_PHONES_QUERY = "SELECT ZOWNER, ZFULLNUMBER FROM ZABCDPHONENUMBER WHERE ZFULLNUMBER IS NOT NULL"
+
+_EMAILS_QUERY = "SELECT ZOWNER, ZADDRESS FROM ZABCDEMAILADDRESS WHERE ZADDRESS IS NOT NULL"
+
+
+def default_addressbook_dir() -> Path:
+    """Get the directory holding the current user's Contacts databases."""
+    return Path.home() / "Library" / "Application Support" / "AddressBook"
+
+
+def handle_keys(handle: str) -> List[str]:
+    """Normalize a phone number or email into its lookup keys.
+
+    Emails are lowercased. Phone numbers are reduced to their digits, plus the
+    last PHONE_SUFFIX_DIGITS digits so numbers with and without a country code
+    match.
+
+    Args:
+        handle: Phone number, email, or Messages handle ID
+
+    Returns:
+        Lookup keys, most specific first (empty if nothing usable remains)
+    """
+    handle = handle.strip()
+    if "@" in handle:
+        return [handle.lower()]
+    digits = _NON_DIGITS_RE.sub("", handle)
+    if not digits:
+        return []
+    if len(digits) > PHONE_SUFFIX_DIGITS:
+        return [digits, digits[-PHONE_SUFFIX_DIGITS:]]
+    return [digits]
+
+
+def _display_name(
+    first: Optional[str], last: Optional[str], nickname: Optional[str], organization: Optional[str]
+) -> Optional[str]:
+    full = " ".join(part.strip() for part in (first, last) if part and part.strip())
+    return full or (nickname or "").strip() or (organization or "").strip() or None
+
+
+@dataclass
+class _Index:
+    """Lookup tables built from one snapshot of the Contacts databases."""
+
+    names_by_key: Dict[str, str] = field(default_factory=dict)
+    # Lowercased display name -> lookup keys of that person's phones and emails
+    keys_by_name: Dict[str, Set[str]] = field(default_factory=dict)
+    display_names: Dict[str, str] = field(default_factory=dict)
+
+    def add(self, name: str, identifier: str) -> None:
+        keys = handle_keys(identifier)
+        for key in keys:
+            # The first contact holding a number keeps it
+            self.names_by_key.setdefault(key, name)
+        folded = name.casefold()
+        self.display_names.setdefault(folded, name)
+        self.keys_by_name.setdefault(folded, set()).update(keys)
+
+
+class ContactResolver:
+    """Resolves Messages handles to Contacts display names and back."""
+
+    def __init__(self, addressbook_dir: Optional[Path] = None):
+        """Initialize the resolver; the databases are loaded on first use.
+
+        Args:
+            addressbook_dir: Directory holding AddressBook-v22.abcddb files
+                (default: ~/Library/Application Support/AddressBook)
+        """
+        self.addressbook_dir = Path(addressbook_dir or default_addressbook_dir())
+        self._index = _Index()
+        self._signature: Optional[Tuple] = None
+        self._lock = threading.Lock()
+
+    def database_paths(self) -> List[Path]:
+        """List the Contacts databases: the local store and one per account."""
+        paths = [self.addressbook_dir / ADDRESSBOOK_FILENAME]
+        paths.extend(sorted(self.addressbook_dir.glob(f"Sources/*/{ADDRESSBOOK_FILENAME}")))
+        return [path for path in paths if path.exists()]
+
+    def _current_signature(self, paths: List[Path]) -> Tuple:
+        """Modification times of the databases and their WAL files."""
+        signature = []
+        for path in paths:
+            for candidate in (path, path.with_name(path.name + "-wal")):
+                try:
+                    signature.append((str(candidate), candidate.stat().st_mtime_ns))
+                except OSError:
+                    pass
+        return tuple(signature)
+
+    def _load(self, paths: List[Path]) -> _Index:
+        index = _Index()
+        for path in paths:
+            try:
+                conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            except sqlite3.Error as e:
+                logger.warning(f"Cannot open Contacts database {path}: {e}")
+                continue
+            try:
+                names = {}
+                for pk, first, last, nickname, organization in conn.execute(_RECORDS_QUERY):
+                    name = _display_name(first, last, nickname, organization)
+                    if name:
+                        names[pk] = name
+                for query in (_PHONES_QUERY, _EMAILS_QUERY):
+                    for owner, identifier in conn.execute(query):
+                        name = names.get(owner)
+                        if name:
+                            index.add(name, identifier)
+            except sqlite3.Error as e:
+                logger.warning(f"Cannot read Contacts database {path}: {e}")
+            finally:
+                conn.close()
+        return index
+
+    def _current(self) -> _Index:
+        """Return the index, reloading it if a database changed since the last load."""
+        paths = self.database_paths()
+        signature = self._current_signature(paths)
+        with self._lock:
+            if signature != self._signature:
+                self._index = self._load(paths)
+                self._signature = signature
+            return self._index
+
+    @property
+    def available(self) -> bool:
+        """Whether any Contacts database was found."""
+        return bool(self.database_paths())
+
+    def name_for(self, handle: Optional[str]) -> Optional[str]:
+        """Look up the display name for a phone number or email.
+
+        Args:
+            handle: Messages handle ID, phone number, or email
+
+        Returns:
+            The contact's display name, or None if it is not in Contacts
+        """
+        if not handle:
+            return None
+        index = self._current()
+        for key in handle_keys(handle):
+            name = index.names_by_key.get(key)
+            if name:
+                return name
+        return None
+
+    def names_for(self, handles: List[Optional[str]]) -> List[Optional[str]]:
+        """Look up display names for a column of handles (see name_for)."""
+        index = self._current()
+        names = []
+        for handle in handles:
+            name = None
+            for key in handle_keys(handle) if handle else ():
+                name = index.names_by_key.get(key)
+                if name:
+                    break
+            names.append(name)
+        return names
+
+    def keys_for(self, contact: str) -> Set[str]:
+        """Lookup keys for a display name, phone number, or email.
+
+        Args:
+            contact: Display name as shown in Contacts (case-insensitive),
+                or a phone number or email
+
+        Returns:
+            Keys of every phone and email of the named contact, or the
+            normalized keys of the input itself if it is not a known name
+        """
+        keys = self._current().keys_by_name.get(contact.strip().casefold())
+        if keys:
+            return set(keys)
+        return set(handle_keys(contact))
+
+    def search(self, text: str, limit: int = 5) -> List[str]:
+        """Find display names containing text (case-insensitive).
+
+        Args:
+            text: Part of a name
+            limit: Maximum number of names
+
+        Returns:
+            Matching display names
+        """
+        folded = text.strip().casefold()
+        if not folded:
+            return []
+        index = self._current()
+        return [
+            display for key, display in index.display_names.items() if folded in key
+        ][:limit]
+
+
+_resolvers: Dict[Path, ContactResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_contact_resolver(addressbook_dir: Optional[Path] = None) -> ContactResolver:
+    """Get the process-wide resolver for a Contacts directory, creating it on first use.
+
+    Args:
+        addressbook_dir: Directory holding AddressBook-v22.abcddb files
+            (default: ~/Library/Application Support/AddressBook)
+
+    Returns:
+        The ContactResolver
+    """
+    key = Path(addressbook_dir or default_addressbook_dir())
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = _resolvers[key] = ContactResolver(key)
+        return resolver
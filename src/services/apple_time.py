@@ -0,0 +1,119 @@
+"""Conversion of Apple (Core Data / Cocoa) timestamps to ISO strings.
+
+Messages and Notes store dates relative to the Apple epoch, 2001-01-01 UTC.
+Notes (Core Data) uses seconds, often with a fractional part. ``chat.db``
+uses nanoseconds on macOS 10.13 and later, and whole seconds on older
+databases. The two scales are easy to tell apart: a date in seconds stays
+below 1e11 for the next three thousand years, while nanosecond dates after
+2001-01-04 are all above it.
+
+Result sets format thousands of dates at a time, so a date is not built as a
+``datetime`` and rendered with ``isoformat()`` per row. The calendar date is
+memoized per day and the time of day comes from precomputed tables, which
+produces the same strings as ``(APPLE_EPOCH + delta).isoformat()``.
+"""
+
+from datetime import datetime, timedelta
+from math import modf
+from typing import Dict, Iterable, List, Optional, Union
+
+APPLE_EPOCH = datetime(2001, 1, 1)
+
+# Absolute values above this are nanoseconds; below it, seconds
+NANOSECOND_THRESHOLD = 100_000_000_000
+
+UNKNOWN_DATE = "Unknown"
+INVALID_DATE = "Invalid date"
+
+Timestamp = Optional[Union[int, float]]
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+# Time-of-day fragments: "THH:MM:" per minute of the day and "SS" per second
+_MINUTE_STRINGS = [f"T{hour:02d}:{minute:02d}:" for hour in range(24) for minute in range(60)]
+_SECOND_STRINGS = [f"{second:02d}" for second in range(60)]
+
+# Day offset from the Apple epoch -> "YYYY-MM-DD"; bounded by the days in the data
+_day_strings: Dict[int, str] = {}
+
+
+def _day_string(days: int) -> str:
+    day = _day_strings.get(days)
+    if day is None:
+        day = _day_strings[days] = (APPLE_EPOCH + timedelta(days=days)).date().isoformat()
+    return day
+
+
+def format_apple_timestamp(timestamp: Timestamp) -> str:
+    """Convert an Apple timestamp to an ISO 8601 string (naive, UTC).
+
+    Args:
+        timestamp: Seconds or nanoseconds since 2001-01-01
+
+    Returns:
+        ISO format datetime string, "Unknown" for 0/None, or "Invalid date"
+        if it is out of range
+    """
+    if not timestamp:
+        return UNKNOWN_DATE
+    try:
+        if -NANOSECOND_THRESHOLD < timestamp < NANOSECOND_THRESHOLD:
+            delta = timedelta(seconds=timestamp)
+        else:
+            delta = timedelta(microseconds=(int(timestamp) + 500) // 1000)
+        day = _day_string(delta.days)
+    except (ValueError, OverflowError, TypeError):
+        return INVALID_DATE
+    minute, second = divmod(delta.seconds, 60)
+    if delta.microseconds:
+        return "%s%s%s.%06d" % (
+            day, _MINUTE_STRINGS[minute], _SECOND_STRINGS[second], delta.microseconds
+        )
+    return day + _MINUTE_STRINGS[minute] + _SECOND_STRINGS[second]
+
+
+def format_apple_timestamps(timestamps: Iterable[Timestamp]) -> List[str]:
+    """Convert a whole result column of Apple timestamps at once.
+
+    Same output as calling format_apple_timestamp per value, with the per-row
+    work inlined into one loop over the column.
+
+    Args:
+        timestamps: Seconds or nanoseconds since 2001-01-01
+
+    Returns:
+        ISO strings in the same order (see format_apple_timestamp)
+    """
+    minutes, seconds, days = _MINUTE_STRINGS, _SECOND_STRINGS, _day_strings
+    threshold = NANOSECOND_THRESHOLD
+    results: List[str] = []
+    append = results.append
+    for timestamp in timestamps:
+        if not timestamp or not isinstance(timestamp, (int, float)):
+            append(format_apple_timestamp(timestamp))
+            continue
+        try:
+            if -threshold < timestamp < threshold:
+                # Seconds: round the fraction half-to-even to whole microseconds,
+                # which is exactly what timedelta(seconds=timestamp) does
+                fraction, whole = modf(timestamp)
+                total_micros = int(whole) * 1_000_000 + round(fraction * 1_000_000)
+            else:
+                # Nanoseconds: round to microseconds with plain integer arithmetic
+                total_micros = (int(timestamp) + 500) // 1000
+        except (ValueError, OverflowError):
+            # NaN or infinity
+            append(INVALID_DATE)
+            continue
+        day_offset, rem = divmod(total_micros, _MICROSECONDS_PER_DAY)
+        second_of_day, micros = divmod(rem, 1_000_000)
+        day = days.get(day_offset)
+        if day is None:
+            append(format_apple_timestamp(timestamp))
+            continue
+        minute, second = divmod(second_of_day, 60)
+        if micros:
+            append("%s%s%s.%06d" % (day, minutes[minute], seconds[second], micros))
+        else:
+            append(day + minutes[minute] + seconds[second])
+    return results
@@ -0,0 +1,169 @@
+"""Bounded thread pools for running blocking client calls off the event loop.
+
+The Google API client, the Slack SDK and sqlite3 are all synchronous. Calling
+them directly from an ``async def`` tool blocks the event loop and stalls every
+other MCP session served by the same process, so tools hand that work to one of
+the named pools below instead.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+GOOGLE_POOL = "google"
+SLACK_POOL = "slack"
+SQLITE_POOL = "sqlite"
+
+DEFAULT_MAX_WORKERS = 8
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """A fixed-size thread pool that tracks its own queue depth."""
+
+    def __init__(self, name: str, max_workers: int):
+        """Initialize the executor.
+
+        Args:
+            name: Pool name, used for thread names and metrics
+            max_workers: Maximum number of worker threads
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"assist-me-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+
+    def _wrap(self, func: Callable[..., T], args: tuple, kwargs: dict) -> Callable[[], T]:
+        """Wrap func so that queue/running counters follow its lifecycle."""
+
+        def runner() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._running -= 1
+                    self._failed += 1
+                raise
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+            return result
+
+        return runner
+
+    def _on_done(self, future) -> None:
+        """Account for work that was cancelled before a worker picked it up."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable in the pool and await its result.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The callable's return value
+        """
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(self._wrap(func, args, kwargs))
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the pool's queue-depth metrics."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the underlying thread pool."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pools: Dict[str, BoundedExecutor] = {}
+_pools_lock = threading.Lock()
+_max_workers = DEFAULT_MAX_WORKERS
+
+
+def configure_executors(max_workers: int) -> None:
+    """Set the worker count used for pools created after this call.
+
+    Args:
+        max_workers: Maximum number of worker threads per pool
+    """
+    global _max_workers
+    _max_workers = max(1, max_workers)
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Get or create the named pool."""
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = BoundedExecutor(name, _max_workers)
+                _pools[name] = pool
+    return pool
+
+
+async def run_blocking(pool: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable in the named pool.
+
+    Args:
+        pool: Pool name (e.g. GOOGLE_POOL, SLACK_POOL, SQLITE_POOL)
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    return await get_executor(pool).run(func, *args, **kwargs)
+
+
+def get_executor_stats(name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Return queue-depth metrics for one pool or for all pools.
+
+    Args:
+        name: Pool name, or None for every pool created so far
+
+    Returns:
+        Mapping of pool name to its metrics
+    """
+    with _pools_lock:
+        pools = dict(_pools)
+    if name is not None:
+        pools = {name: pools[name]} if name in pools else {}
+    return {pool_name: pool.stats() for pool_name, pool in pools.items()}
+
+
+def shutdown_executors() -> None:
+    """Shut down every pool (called on server shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
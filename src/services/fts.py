@@ -0,0 +1,54 @@
+"""Helpers shared by the SQLite FTS5 indexes (Gmail mirror, iMessage, Notes)."""
+
+import re
+import sqlite3
+from typing import Callable, List, Optional
+
+# Terms of a free-text query, keeping a trailing "*" for prefix matches
+_QUERY_TERM_RE = re.compile(r"[\w@.'-]+\*?", re.UNICODE)
+
+
+def fts_query_fallback(query: str) -> str:
+    """Turn arbitrary user input into a safe FTS5 query of quoted terms."""
+    terms = []
+    for term in _QUERY_TERM_RE.findall(query):
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', "")
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def fts_phrase(value: str) -> str:
+    """Quote a literal value as an FTS5 phrase."""
+    return '"' + value.replace('"', '""') + '"'
+
+
+def run_match_query(
+    conn: sqlite3.Connection,
+    sql: str,
+    query: str,
+    *params,
+    compose: Optional[Callable[[str], str]] = None,
+) -> List[tuple]:
+    """Run a MATCH query, retrying input that is not valid FTS5 syntax as plain terms.
+
+    Args:
+        conn: Connection to the database holding the FTS5 table
+        sql: Query whose first placeholder is the MATCH expression
+        query: User-supplied search query
+        *params: Remaining query parameters
+        compose: Builds the full MATCH expression around the user query
+            (e.g. to add column filters); defaults to the query itself
+
+    Returns:
+        Result rows (empty if the query has no searchable terms)
+    """
+    compose = compose or (lambda q: q)
+    try:
+        return conn.execute(sql, (compose(query), *params)).fetchall()
+    except sqlite3.OperationalError:
+        fallback = fts_query_fallback(query)
+        if not fallback:
+            return []
+        return conn.execute(sql, (compose(fallback), *params)).fetchall()
@@ -0,0 +1,271 @@
+"""MIME body extraction for Gmail API message payloads.
+
+Gmail returns ``format="full"`` messages as a tree of parts. Text can sit at any
+depth (e.g. ``multipart/alternative`` inside ``multipart/mixed``), in any
+charset, and large parts come back with only an ``attachmentId`` that has to be
+fetched separately. The helpers here walk that tree lazily and only fetch an
+attachment body when its part is actually chosen as the message body.
+"""
+
+import base64
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Callback that returns the base64url data of an attachment given its ID
+AttachmentFetcher = Callable[[str], str]
+
+_CHARSET_RE = re.compile(r'charset\s*=\s*"?([^";\s]+)"?', re.IGNORECASE)
+_HORIZONTAL_SPACE_RE = re.compile(r"[ \t\r\f\v\u00a0]+")
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+
+# Lines that introduce the quoted previous message in a reply
+_REPLY_HEADER_RES = [
+    re.compile(r"^On .{1,200}wrote:\s*$", re.DOTALL),
+    re.compile(r"^-{2,}\s*Original Message\s*-{2,}\s*$", re.IGNORECASE),
+    re.compile(r"^From: .+$"),
+]
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Minimal HTML-to-text converter that keeps block structure as newlines."""
+
+    # fmt: off
+    BLOCK_TAGS = {
+        "address", "article", "blockquote", "br", "div", "footer", "h1", "h2", "h3",
+        "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre", "section", "table",
+        "tr", "ul",
+    }
+    # fmt: on
+    SKIP_TAGS = {"head", "script", "style", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._chunks: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self._chunks.append("\n")
+            if tag == "li":
+                self._chunks.append("- ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._chunks.append(data)
+
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+
+def html_to_text(html: str) -> str:
+    """Convert an HTML body to readable plain text.
+
+    Args:
+        html: HTML document or fragment
+
+    Returns:
+        Plain text with one line per block element
+    """
+    parser = _HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (_HORIZONTAL_SPACE_RE.sub(" ", line).strip() for line in parser.text().split("\n"))
+    return _EXCESS_NEWLINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _part_header(part: Dict[str, Any], name: str) -> str:
+    name = name.lower()
+    return next((h["value"] for h in part.get("headers", []) if h["name"].lower() == name), "")
+
+
+def _part_charset(part: Dict[str, Any]) -> str:
+    """Return a usable codec name for a part, defaulting to UTF-8."""
+    match = _CHARSET_RE.search(_part_header(part, "Content-Type"))
+    if match:
+        try:
+            return codecs.lookup(match.group(1)).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def _is_attachment(part: Dict[str, Any]) -> bool:
+    if part.get("filename"):
+        return True
+    return _part_header(part, "Content-Disposition").lower().startswith("attachment")
+
+
+def walk_parts(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield every leaf part of a payload, depth-first, in document order."""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        children = part.get("parts")
+        if children:
+            stack.extend(reversed(children))
+        else:
+            yield part
+
+
+def _decode_part(part: Dict[str, Any], fetch_attachment: Optional[AttachmentFetcher]):
+    """Decode a leaf part's text, fetching its data if Gmail only sent an ID.
+
+    Returns None when the data is not available (no fetcher for a large part).
+    """
+    body = part.get("body", {})
+    data = body.get("data")
+    if data is None and body.get("attachmentId"):
+        if fetch_attachment is None:
+            return None
+        data = fetch_attachment(body["attachmentId"])
+    if not data:
+        return ""
+    raw = base64.urlsafe_b64decode(data)
+    return raw.decode(_part_charset(part), errors="replace")
+
+
+def _select_body_part(
+    part: Dict[str, Any], fetch_attachment: Optional[AttachmentFetcher]
+) -> Optional[Dict[str, str]]:
+    """Find the best text for a (sub)tree, returning its text and source type.
+
+    multipart/alternative prefers text/plain and falls back to text/html;
+    other multiparts concatenate the text of their inline children.
+    """
+    mime_type = part.get("mimeType", "text/plain").lower()
+
+    if mime_type.startswith("multipart/"):
+        children = part.get("parts", [])
+        if mime_type == "multipart/alternative":
+            candidates = [c for c in children if c.get("mimeType", "").lower() == "text/plain"]
+            candidates += [c for c in children if c.get("mimeType", "").lower() != "text/plain"]
+            for child in candidates:
+                selected = _select_body_part(child, fetch_attachment)
+                if selected and selected["text"]:
+                    return selected
+            return None
+
+        texts, source = [], None
+        for child in children:
+            if _is_attachment(child):
+                continue
+            selected = _select_body_part(child, fetch_attachment)
+            if selected and selected["text"]:
+                texts.append(selected["text"])
+                source = source or selected["source"]
+        return {"text": "\n\n".join(texts), "source": source} if texts else None
+
+    if _is_attachment(part) or mime_type not in ("text/plain", "text/html"):
+        return None
+
+    text = _decode_part(part, fetch_attachment)
+    if text is None:
+        return None
+    if mime_type == "text/html":
+        return {"text": html_to_text(text), "source": "text/html"}
+    return {"text": text, "source": "text/plain"}
+
+
+def strip_quoted_reply(text: str) -> str:
+    """Remove the quoted earlier message from a reply.
+
+    Cuts the body at the first reply header ("On <date>, <name> wrote:",
+    "-----Original Message-----", an Outlook-style "From:" block) and drops
+    any remaining ">"-quoted lines. Forwarded-message bodies are kept.
+
+    Args:
+        text: Plain-text message body
+
+    Returns:
+        The newly written part of the message
+    """
+    lines = text.split("\n")
+    kept: List[str] = []
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        # "On ... wrote:" is often wrapped over two lines by the sender's client
+        candidate = stripped
+        if stripped.startswith("On ") and not stripped.endswith(":") and i + 1 < len(lines):
+            candidate = f"{stripped} {lines[i + 1].strip()}"
+        if stripped.startswith("-") and "forwarded message" in stripped.lower():
+            # A forwarded message is content the sender chose to include
+            kept.extend(lines[i:])
+            break
+        is_header = any(pattern.match(candidate) for pattern in _REPLY_HEADER_RES)
+        # Only treat "From:" as a quote header when it is followed by Sent:/Date:
+        if is_header and candidate.startswith("From: "):
+            following = " ".join(line.strip() for line in lines[i + 1 : i + 3])
+            is_header = following.startswith(("Sent:", "Date:"))
+        if is_header and kept:
+            break
+        if stripped.startswith(">"):
+            continue
+        kept.append(line)
+    return "\n".join(kept).rstrip()
+
+
+def truncate_utf8(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8 without splitting a character."""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
+def extract_body(
+    payload: Dict[str, Any],
+    max_body_bytes: Optional[int] = None,
+    fetch_attachment: Optional[AttachmentFetcher] = None,
+    strip_quotes: bool = False,
+) -> Dict[str, Any]:
+    """Extract the readable body of a message payload.
+
+    Args:
+        payload: The ``payload`` of a messages.get(format="full") response
+        max_body_bytes: Truncate the body to this many UTF-8 bytes (None for no limit)
+        fetch_attachment: Called with an attachmentId when a chosen text part
+            was too large for Gmail to inline; without it such parts are skipped
+        strip_quotes: Drop quoted text from earlier messages (see strip_quoted_reply)
+
+    Returns:
+        Dict with body, body_source ("text/plain", "text/html" or None),
+        body_bytes (full size before truncation), and truncated
+    """
+    selected = _select_body_part(payload, fetch_attachment) or {"text": "", "source": None}
+    body = selected["text"]
+    if strip_quotes:
+        body = strip_quoted_reply(body)
+    body_bytes = len(body.encode("utf-8"))
+    truncated = max_body_bytes is not None and body_bytes > max_body_bytes
+    if truncated:
+        body = truncate_utf8(body, max_body_bytes)
+    return {
+        "body": body,
+        "body_source": selected["source"],
+        "body_bytes": body_bytes,
+        "truncated": truncated,
+    }
+
+
+def list_attachments(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """List attachment metadata (no data) for a message payload."""
+    return [
+        {
+            "filename": part.get("filename", ""),
+            "mimeType": part.get("mimeType", ""),
+            "size": part.get("body", {}).get("size", 0),
+            "attachmentId": part.get("body", {}).get("attachmentId"),
+        }
+        for part in walk_parts(payload)
+        if _is_attachment(part)
+    ]
@@ -0,0 +1,617 @@
+"""Local SQLite mirror of a Gmail mailbox.
+
+The first sync pulls recent messages through ``messages.list`` plus batched
+``messages.get`` calls. Every later sync replays ``users.history.list`` from the
+last stored ``historyId``, so a refresh only transfers what changed.
+
+Reads (``list_messages`` / ``get_message`` / ``search``) never touch the
+network. ``search`` runs against an FTS5 index over subject, sender,
+recipients, and the decoded plain-text body.
+"""
+
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from googleapiclient.errors import HttpError
+
+from .fts import run_match_query
+from .gmail_mime import extract_body
+
+# Gmail accepts up to 100 calls per batch, but recommends staying at or below 50
+# to avoid rate limiting on the batch endpoint.
+BATCH_SIZE = 50
+
+# Number of messages pulled by the first (full) sync of a mailbox
+DEFAULT_INITIAL_SYNC_LIMIT = 500
+
+# Messages whose fetch failed with a rate limit, server, or network error are
+# retried this many times, waiting RETRY_BACKOFF_SECONDS * 2**n before retry n
+FETCH_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+
+HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    internal_date INTEGER NOT NULL DEFAULT 0,
+    subject TEXT NOT NULL DEFAULT '',
+    sender TEXT NOT NULL DEFAULT '',
+    recipients TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    snippet TEXT NOT NULL DEFAULT '',
+    label_ids TEXT NOT NULL DEFAULT '[]',
+    raw_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_internal_date ON messages (internal_date DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# FTS rows share the rowid of their row in messages, so replacing or deleting
+# one is a rowid lookup instead of a scan of the whole index
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5 (
+    subject,
+    sender,
+    recipients,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Bump when the full-text index layout changes so existing mirrors rebuild it
+FTS_VERSION = 2
+
+# bm25() column weights: subject, sender, recipients, body
+_BM25_WEIGHTS = "5.0, 3.0, 2.0, 1.0"
+
+
+def batch_execute(service, requests: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute API requests through Gmail's batch HTTP endpoint.
+
+    Each sub-request is handled independently, so a failing request is returned
+    as its exception instead of failing the whole batch.
+
+    Args:
+        service: Gmail API service object
+        requests: Mapping of request ID to an unexecuted API request
+
+    Returns:
+        Mapping of request ID to the API response or the exception it raised
+    """
+    results: Dict[str, Any] = {}
+
+    def _callback(request_id: str, response: Dict[str, Any], exception: Exception):
+        results[request_id] = exception if exception is not None else response
+
+    items = list(requests.items())
+    for start in range(0, len(items), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_callback)
+        for request_id, request in items[start : start + BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+
+    return results
+
+
+def batch_get_messages(service, message_ids: List[str], **get_kwargs: Any) -> Dict[str, Any]:
+    """Fetch messages through the batch endpoint (see batch_execute).
+
+    Args:
+        service: Gmail API service object
+        message_ids: Message IDs to fetch
+        **get_kwargs: Extra arguments for messages.get (e.g., format="metadata")
+
+    Returns:
+        Mapping of message ID to the API response or the exception it raised
+    """
+    messages = service.users().messages()
+    return batch_execute(
+        service,
+        {msg_id: messages.get(userId="me", id=msg_id, **get_kwargs) for msg_id in message_ids},
+    )
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed request may succeed if retried (rate limit, 5xx, network)."""
+    if isinstance(error, HttpError):
+        return error.resp.status == 429 or error.resp.status >= 500
+    return True
+
+
+def _header_map(message: Dict[str, Any]) -> Dict[str, str]:
+    """Map lower-cased header names to the first value seen for each."""
+    headers: Dict[str, str] = {}
+    for header in message.get("payload", {}).get("headers", []):
+        headers.setdefault(header["name"].lower(), header["value"])
+    return headers
+
+
+class GmailMirror:
+    """SQLite-backed copy of one Gmail account's messages."""
+
+    def __init__(self, db_path: Path):
+        """Initialize the mirror and create its schema if needed.
+
+        Args:
+            db_path: Path to the mirror's SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Only one sync per mailbox may run at a time
+        self._sync_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._ensure_fts(conn)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _ensure_fts(self, conn: sqlite3.Connection) -> None:
+        """Create the full-text index, rebuilding it for mirrors with an older layout."""
+        if self._get_state(conn, "fts_version") == str(FTS_VERSION):
+            conn.executescript(_FTS_SCHEMA)
+            return
+        conn.execute("DROP TABLE IF EXISTS messages_fts")
+        conn.executescript(_FTS_SCHEMA)
+        for rowid, raw_json in conn.execute("SELECT rowid, raw_json FROM messages").fetchall():
+            self._index_message(conn, rowid, json.loads(raw_json))
+        conn.execute("DELETE FROM sync_state WHERE key = 'fts_built'")
+        self._set_state(conn, "fts_version", str(FTS_VERSION))
+
+    def _index_message(self, conn: sqlite3.Connection, rowid: int, message: Dict[str, Any]) -> None:
+        headers = _header_map(message)
+        conn.execute(
+            "INSERT OR REPLACE INTO messages_fts (rowid, subject, sender, recipients, body) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                rowid,
+                headers.get("subject", ""),
+                headers.get("from", ""),
+                ", ".join(filter(None, (headers.get("to"), headers.get("cc")))),
+                extract_body(message.get("payload", {}))["body"],
+            ),
+        )
+
+    @property
+    def history_id(self) -> Optional[str]:
+        """The historyId the mirror is synced up to, or None before the first sync."""
+        with self._connect() as conn:
+            return self._get_state(conn, "history_id")
+
+    def _store_messages(self, conn: sqlite3.Connection, messages: List[Dict[str, Any]]):
+        rows = []
+        for message in messages:
+            headers = _header_map(message)
+            rows.append(
+                (
+                    message["id"],
+                    message.get("threadId", ""),
+                    int(message.get("internalDate", 0)),
+                    headers.get("subject", ""),
+                    headers.get("from", ""),
+                    headers.get("to", ""),
+                    headers.get("date", ""),
+                    message.get("snippet", ""),
+                    json.dumps(message.get("labelIds", [])),
+                    json.dumps(message),
+                )
+            )
+        # An upsert keeps the rowid of a message that is stored again, so its
+        # FTS row is replaced in place (INSERT OR REPLACE would assign a new one)
+        conn.executemany(
+            """
+            INSERT INTO messages (
+                id, thread_id, internal_date, subject, sender, recipients,
+                date, snippet, label_ids, raw_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                thread_id = excluded.thread_id,
+                internal_date = excluded.internal_date,
+                subject = excluded.subject,
+                sender = excluded.sender,
+                recipients = excluded.recipients,
+                date = excluded.date,
+                snippet = excluded.snippet,
+                label_ids = excluded.label_ids,
+                raw_json = excluded.raw_json
+            """,
+            rows,
+        )
+        for message in messages:
+            (rowid,) = conn.execute(
+                "SELECT rowid FROM messages WHERE id = ?", (message["id"],)
+            ).fetchone()
+            self._index_message(conn, rowid, message)
+
+    def _fetch_and_store(
+        self, service, conn: sqlite3.Connection, ids: List[str]
+    ) -> Tuple[int, List[str]]:
+        """Fetch full messages and store them, retrying transient failures.
+
+        Returns:
+            The number of messages stored and the IDs that could not be fetched
+        """
+        stored = 0
+        failed: List[str] = []
+        pending = list(ids)
+        for attempt in range(FETCH_RETRIES + 1):
+            if not pending:
+                break
+            if attempt:
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            fetched = batch_get_messages(service, pending, format="full")
+            messages = [r for r in fetched.values() if not isinstance(r, Exception)]
+            self._store_messages(conn, messages)
+            stored += len(messages)
+            pending = []
+            missing = []
+            for msg_id, result in fetched.items():
+                if not isinstance(result, Exception):
+                    continue
+                if isinstance(result, HttpError) and result.resp.status == 404:
+                    missing.append(msg_id)
+                elif _is_transient(result):
+                    pending.append(msg_id)
+                else:
+                    failed.append(msg_id)
+            # Messages deleted between list and get come back as 404s; drop them
+            self._delete_messages(conn, missing)
+        return stored, failed + pending
+
+    def _delete_messages(self, conn: sqlite3.Connection, ids: Iterable[str]) -> None:
+        params = [(i,) for i in ids]
+        conn.executemany(
+            "DELETE FROM messages_fts WHERE rowid = (SELECT rowid FROM messages WHERE id = ?)",
+            params,
+        )
+        conn.executemany("DELETE FROM messages WHERE id = ?", params)
+
+    def _full_sync(self, service, max_messages: int) -> Dict[str, Any]:
+        # Capture the history position before listing so that nothing which
+        # changes during the listing is missed by the next incremental sync.
+        profile = service.users().getProfile(userId="me").execute()
+        history_id = str(profile["historyId"])
+
+        ids: List[str] = []
+        page_token = None
+        while len(ids) < max_messages:
+            response = (
+                service.users()
+                .messages()
+                .list(
+                    userId="me",
+                    maxResults=min(500, max_messages - len(ids)),
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            ids.extend(m["id"] for m in response.get("messages", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM messages")
+            conn.execute("DELETE FROM messages_fts")
+            stored, failed = self._fetch_and_store(service, conn, ids)
+            # Stay unsynced while any message is missing, so the next sync
+            # starts over instead of moving past it
+            if failed:
+                history_id = None
+            else:
+                self._set_state(conn, "history_id", history_id)
+
+        return {
+            "mode": "full",
+            "added": stored,
+            "deleted": 0,
+            "updated": 0,
+            "failed": len(failed),
+            "history_id": history_id,
+        }
+
+    def _incremental_sync(self, service, start_history_id: str) -> Dict[str, Any]:
+        added: Set[str] = set()
+        deleted: Set[str] = set()
+        label_updates: Dict[str, List[str]] = {}
+        history_id = start_history_id
+        page_token = None
+
+        while True:
+            response = (
+                service.users()
+                .history()
+                .list(
+                    userId="me",
+                    startHistoryId=start_history_id,
+                    historyTypes=HISTORY_TYPES,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            for record in response.get("history", []):
+                for item in record.get("messagesAdded", []):
+                    msg_id = item["message"]["id"]
+                    added.add(msg_id)
+                    deleted.discard(msg_id)
+                for item in record.get("messagesDeleted", []):
+                    msg_id = item["message"]["id"]
+                    deleted.add(msg_id)
+                    added.discard(msg_id)
+                    label_updates.pop(msg_id, None)
+                for key in ("labelsAdded", "labelsRemoved"):
+                    for item in record.get(key, []):
+                        message = item["message"]
+                        label_updates[message["id"]] = message.get("labelIds", [])
+            history_id = str(response.get("historyId", history_id))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        with self._connect() as conn:
+            stored, failed = self._fetch_and_store(service, conn, sorted(added))
+            self._delete_messages(conn, deleted)
+            updated = 0
+            for msg_id, labels in label_updates.items():
+                if msg_id in added:
+                    continue
+                row = conn.execute(
+                    "SELECT raw_json FROM messages WHERE id = ?", (msg_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                message = json.loads(row[0])
+                message["labelIds"] = labels
+                conn.execute(
+                    "UPDATE messages SET label_ids = ?, raw_json = ? WHERE id = ?",
+                    (json.dumps(labels), json.dumps(message), msg_id),
+                )
+                updated += 1
+            # Keep the old position while any added message is missing, so the
+            # next sync replays the same history (every step is idempotent)
+            if failed:
+                history_id = start_history_id
+            else:
+                self._set_state(conn, "history_id", history_id)
+
+        return {
+            "mode": "incremental",
+            "added": stored,
+            "deleted": len(deleted),
+            "updated": updated,
+            "failed": len(failed),
+            "history_id": history_id,
+        }
+
+    def sync(self, service, max_messages: int = DEFAULT_INITIAL_SYNC_LIMIT) -> Dict[str, Any]:
+        """Bring the mirror up to date with the mailbox.
+
+        Runs a full sync the first time (or when Gmail no longer has history
+        for the stored historyId) and an incremental History API sync otherwise.
+        If some messages still cannot be fetched after retrying, the stored
+        historyId is left unchanged, so the next sync fetches them again.
+
+        Args:
+            service: Gmail API service object
+            max_messages: Number of recent messages to pull on a full sync
+
+        Returns:
+            Sync statistics (mode, added, deleted, updated, failed, history_id)
+        """
+        with self._sync_lock:
+            start_history_id = self.history_id
+            if start_history_id is None:
+                return self._full_sync(service, max_messages)
+            try:
+                return self._incremental_sync(service, start_history_id)
+            except HttpError as e:
+                # 404 means the historyId is too old and Gmail expired it
+                if e.resp.status != 404:
+                    raise
+                return self._full_sync(service, max_messages)
+
+    def list_messages(
+        self, query: str = "", limit: int = 10, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """List mirrored message summaries, newest first.
+
+        Gmail search operators are not interpreted locally; a non-empty query is
+        matched as plain text against the subject, sender, and snippet.
+
+        Args:
+            query: Optional plain-text filter
+            limit: Maximum number of messages to return
+            offset: Number of messages to skip (for paging)
+
+        Returns:
+            Message summaries with id, threadId, subject, from, date, and snippet
+        """
+        sql = "SELECT id, thread_id, subject, sender, date, snippet FROM messages"
+        params: tuple = ()
+        if query:
+            sql += " WHERE subject LIKE ? OR sender LIKE ? OR snippet LIKE ?"
+            pattern = f"%{query}%"
+            params = (pattern, pattern, pattern)
+        sql += " ORDER BY internal_date DESC, id LIMIT ? OFFSET ?"
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + (limit, offset)).fetchall()
+        return [
+            {
+                "id": msg_id,
+                "threadId": thread_id,
+                "subject": subject,
+                "from": sender,
+                "date": date,
+                "snippet": snippet,
+            }
+            for msg_id, thread_id, subject, sender, date, snippet in rows
+        ]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over the mirror, ranked by BM25.
+
+        The query uses SQLite FTS5 syntax: bare terms are ANDed, "quoted text"
+        is a phrase, a trailing * matches a prefix, OR/NOT combine terms, and
+        column filters such as subject:invoice are supported. Input that is not
+        valid FTS5 syntax is retried as a plain list of terms.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            Matches with id, threadId, subject, from, date, score, and a snippet
+            around the match (hits wrapped in [ ])
+        """
+        sql = f"""
+            SELECT
+                m.id,
+                m.thread_id,
+                m.subject,
+                m.sender,
+                m.date,
+                snippet(messages_fts, -1, '[', ']', '...', 16) AS snippet,
+                bm25(messages_fts, {_BM25_WEIGHTS}) AS score
+            FROM messages_fts
+            JOIN messages m ON m.rowid = messages_fts.rowid
+            WHERE messages_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        """
+        with self._connect() as conn:
+            rows = run_match_query(conn, sql, query, limit)
+
+        return [
+            {
+                "id": msg_id,
+                "threadId": thread_id,
+                "subject": subject,
+                "from": sender,
+                "date": date,
+                # bm25() is lower-is-better; flip it so higher means more relevant
+                "score": round(-score, 4),
+                "snippet": snippet,
+            }
+            for msg_id, thread_id, subject, sender, date, snippet, score in rows
+        ]
+
+    def list_threads(
+        self, query: str = "", limit: int = 10, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """List mirrored threads, most recently active first.
+
+        Args:
+            query: Optional plain-text filter (see list_messages)
+            limit: Maximum number of threads to return
+            offset: Number of threads to skip (for paging)
+
+        Returns:
+            Thread summaries with threadId, id (latest message), subject, from,
+            date, snippet, message_count, and participants
+        """
+        where, params = "", ()
+        if query:
+            where = "WHERE subject LIKE ? OR sender LIKE ? OR snippet LIKE ?"
+            pattern = f"%{query}%"
+            params = (pattern, pattern, pattern)
+        sql = f"""
+            SELECT thread_id, id, first_subject, sender, date, snippet, message_count, senders
+            FROM (
+                SELECT
+                    thread_id, id, sender, date, snippet, internal_date,
+                    ROW_NUMBER() OVER latest AS rn,
+                    FIRST_VALUE(subject) OVER (
+                        PARTITION BY thread_id ORDER BY internal_date
+                    ) AS first_subject,
+                    COUNT(*) OVER thread AS message_count,
+                    GROUP_CONCAT(sender, char(31)) OVER thread AS senders
+                FROM messages
+                {where}
+                WINDOW
+                    latest AS (PARTITION BY thread_id ORDER BY internal_date DESC),
+                    thread AS (PARTITION BY thread_id)
+            )
+            WHERE rn = 1
+            ORDER BY internal_date DESC, thread_id
+            LIMIT ? OFFSET ?
+        """
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + (limit, offset)).fetchall()
+        return [
+            {
+                "threadId": thread_id,
+                "id": msg_id,
+                "subject": subject,
+                "from": sender,
+                "date": date,
+                "snippet": snippet,
+                "message_count": count,
+                "participants": list(dict.fromkeys(senders.split("\x1f"))),
+            }
+            for thread_id, msg_id, subject, sender, date, snippet, count, senders in rows
+        ]
+
+    def get_thread_messages(self, thread_id: str) -> List[Dict[str, Any]]:
+        """Return the stored full messages of a thread, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT raw_json FROM messages WHERE thread_id = ? ORDER BY internal_date",
+                (thread_id,),
+            ).fetchall()
+        return [json.loads(raw_json) for (raw_json,) in rows]
+
+    def get_message(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored messages.get(format="full") response for a message."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT raw_json FROM messages WHERE id = ?", (message_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+_mirrors: Dict[Path, GmailMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_gmail_mirror(data_dir: Path, account_id: str) -> GmailMirror:
+    """Get the process-wide mirror for an account, creating it on first use.
+
+    Args:
+        data_dir: Directory holding local data files
+        account_id: Google account identifier
+
+    Returns:
+        The account's GmailMirror
+    """
+    db_path = Path(data_dir) / f"{account_id}_gmail_mirror.sqlite"
+    with _mirrors_lock:
+        mirror = _mirrors.get(db_path)
+        if mirror is None:
+            mirror = _mirrors[db_path] = GmailMirror(db_path)
+        return mirror
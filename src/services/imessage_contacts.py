@@ -0,0 +1,235 @@
+"""Per-contact message summary for iMessage, kept in a sidecar SQLite file.
+
+Listing contacts straight from ``chat.db`` means grouping the whole ``message``
+table by handle on every call. Instead, one row per handle identifier
+(message count, newest message date, and its text) is maintained in a small
+sidecar database beside the search index. A refresh aggregates only the
+messages with a ``ROWID`` above the stored high-water mark and folds them into
+the existing rows, so when chat.db has no new messages a refresh is a single
+``MAX(ROWID)`` lookup and a page is an index range read.
+
+Deleting messages in Messages does not move the high-water mark, so counts
+include deleted messages until the summary is rebuilt. It is rebuilt from
+scratch when chat.db is replaced (its highest ROWID drops below the mark) or
+SUMMARY_VERSION changes.
+"""
+
+import contextlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .typedstream import decode_attributed_body
+
+# Runs a query against chat.db and returns all rows
+SourceQuery = Callable[[str, tuple], List[tuple]]
+
+# Bump when the summary columns change so existing sidecars are rebuilt
+SUMMARY_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    contact TEXT PRIMARY KEY,
+    message_count INTEGER NOT NULL,
+    last_date INTEGER NOT NULL,
+    last_message_id INTEGER NOT NULL,
+    last_text TEXT,
+    last_from_me INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_recent ON contacts (last_date, contact);
+"""
+
+# Messages added since the high-water mark, aggregated per handle identifier.
+# With a single MAX() aggregate, SQLite takes the bare columns from the row
+# holding the maximum, i.e. the newest message of each contact.
+_SOURCE_QUERY = """
+SELECT
+    h.id,
+    COUNT(*),
+    MAX(m.date),
+    m.ROWID,
+    m.text,
+    m.attributedBody,
+    m.is_from_me
+FROM message m
+JOIN handle h ON h.ROWID = m.handle_id
+WHERE m.ROWID > ? AND m.ROWID <= ?
+GROUP BY h.id
+"""
+
+# Fold new aggregates into existing rows; the newest message wins
+_UPSERT = """
+INSERT INTO contacts (contact, message_count, last_date, last_message_id, last_text, last_from_me)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (contact) DO UPDATE SET
+    message_count = message_count + excluded.message_count,
+    last_text = CASE WHEN excluded.last_date >= last_date
+        THEN excluded.last_text ELSE last_text END,
+    last_from_me = CASE WHEN excluded.last_date >= last_date
+        THEN excluded.last_from_me ELSE last_from_me END,
+    last_message_id = CASE WHEN excluded.last_date >= last_date
+        THEN excluded.last_message_id ELSE last_message_id END,
+    last_date = MAX(last_date, excluded.last_date)
+"""
+
+_SUMMARY_COLUMNS = "contact, message_count, last_date, last_message_id, last_text, last_from_me"
+
+_FIRST_PAGE_QUERY = f"""
+SELECT {_SUMMARY_COLUMNS}
+FROM contacts
+ORDER BY last_date DESC, contact DESC
+LIMIT ?
+"""
+
+_NEXT_PAGE_QUERY = f"""
+SELECT {_SUMMARY_COLUMNS}
+FROM contacts
+WHERE (last_date, contact) < (?, ?)
+ORDER BY last_date DESC, contact DESC
+LIMIT ?
+"""
+
+
+class ContactSummary:
+    """Incrementally maintained per-contact summary of chat.db."""
+
+    def __init__(self, summary_path: Path, source: SourceQuery):
+        """Initialize the summary and create its schema if needed.
+
+        Args:
+            summary_path: Path to the sidecar SQLite database
+            source: Callable running a read-only query against chat.db
+        """
+        self.summary_path = Path(summary_path)
+        self.summary_path.parent.mkdir(parents=True, exist_ok=True)
+        self._source = source
+        # Only one refresh may run at a time
+        self._refresh_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if self._get_state(conn, "version") != str(SUMMARY_VERSION):
+                self._reset(conn)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.summary_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _reset(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM contacts")
+        self._set_state(conn, "high_water", "0")
+        self._set_state(conn, "version", str(SUMMARY_VERSION))
+
+    @property
+    def high_water(self) -> int:
+        """Highest chat.db message ROWID folded into the summary."""
+        with self._connect() as conn:
+            return int(self._get_state(conn, "high_water") or 0)
+
+    def refresh(self) -> Dict[str, int]:
+        """Fold messages added to chat.db since the last refresh into the summary.
+
+        Returns:
+            Dict with the number of contacts updated and the new high-water mark
+        """
+        with self._refresh_lock:
+            high_water = self.high_water
+            source_max = self._source("SELECT MAX(ROWID) FROM message", ())[0][0] or 0
+            if source_max == high_water:
+                return {"updated": 0, "high_water": high_water}
+
+            rebuild = source_max < high_water
+            if rebuild:
+                # chat.db was replaced; its ROWIDs no longer line up with ours
+                high_water = 0
+
+            # Bound the range so messages arriving mid-refresh wait for the next one
+            rows = self._source(_SOURCE_QUERY, (high_water, source_max))
+            entries = [
+                (
+                    contact,
+                    count,
+                    last_date,
+                    message_id,
+                    text if text is not None else decode_attributed_body(body),
+                    int(bool(is_from_me)),
+                )
+                for contact, count, last_date, message_id, text, body, is_from_me in rows
+            ]
+            with self._connect() as conn:
+                if rebuild:
+                    self._reset(conn)
+                conn.executemany(_UPSERT, entries)
+                self._set_state(conn, "high_water", str(source_max))
+
+            return {"updated": len(entries), "high_water": source_max}
+
+    def page(
+        self, limit: int, cursor: Optional[Tuple[int, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return contacts, most recently messaged first.
+
+        Args:
+            limit: Maximum number of contacts
+            cursor: (last_date, contact) of the last contact on the previous page
+
+        Returns:
+            Contacts with contact, message_count, last_date (Apple timestamp),
+            last_message_id, last_text, and last_from_me
+        """
+        with self._connect() as conn:
+            if cursor is None:
+                rows = conn.execute(_FIRST_PAGE_QUERY, (limit,)).fetchall()
+            else:
+                rows = conn.execute(_NEXT_PAGE_QUERY, (*cursor, limit)).fetchall()
+        return [
+            {
+                "contact": contact,
+                "message_count": count,
+                "last_date": last_date,
+                "last_message_id": message_id,
+                "last_text": text,
+                "last_from_me": bool(from_me),
+            }
+            for contact, count, last_date, message_id, text, from_me in rows
+        ]
+
+
+_summaries: Dict[Path, ContactSummary] = {}
+_summaries_lock = threading.Lock()
+
+
+def get_contact_summary(data_dir: Path, source: SourceQuery) -> ContactSummary:
+    """Get the process-wide iMessage contact summary, creating it on first use.
+
+    Args:
+        data_dir: Directory holding local data files
+        source: Callable running a read-only query against chat.db
+
+    Returns:
+        The ContactSummary
+    """
+    summary_path = Path(data_dir) / "imessage_contacts.sqlite"
+    with _summaries_lock:
+        summary = _summaries.get(summary_path)
+        if summary is None:
+            summary = _summaries[summary_path] = ContactSummary(summary_path, source)
+        return summary
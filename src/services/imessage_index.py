@@ -0,0 +1,288 @@
+"""Full-text search index for iMessage, kept beside (never inside) chat.db.
+
+``chat.db`` belongs to Messages and is opened read-only, so the FTS5 index
+lives in a sidecar SQLite file under the data directory. Each refresh copies
+only messages with a ``ROWID`` above the stored high-water mark, which makes a
+refresh with no new messages a single indexed lookup.
+
+Messages deleted in Messages are dropped from the index lazily, when a search
+would have returned them. If chat.db is replaced (its highest ROWID drops below
+the high-water mark) the index is rebuilt from scratch.
+"""
+
+import contextlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from .fts import fts_phrase, run_match_query
+from .typedstream import decode_attributed_body
+
+# Runs a query against chat.db and returns all rows
+SourceQuery = Callable[[str, tuple], List[tuple]]
+
+# Bump when the indexed content changes so existing sidecars are rebuilt
+INDEX_VERSION = 2
+
+# bm25() column weights: only the message text counts towards relevance
+_BM25_WEIGHTS = "1.0, 0.0, 0.0"
+
+# Messages copied from chat.db per transaction
+REFRESH_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5 (
+    text,
+    contact,
+    chat,
+    date UNINDEXED,
+    is_from_me UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# New messages in chat.db, with the sender handle and the chat they belong to.
+# Messages without a text column keep their text in the attributedBody blob.
+_SOURCE_QUERY = """
+SELECT
+    m.ROWID,
+    m.text,
+    m.attributedBody,
+    h.id,
+    (SELECT c.chat_identifier
+     FROM chat_message_join cmj
+     JOIN chat c ON c.ROWID = cmj.chat_id
+     WHERE cmj.message_id = m.ROWID
+     LIMIT 1),
+    m.date,
+    m.is_from_me
+FROM message m
+LEFT JOIN handle h ON h.ROWID = m.handle_id
+WHERE m.ROWID > ?
+AND (m.text IS NOT NULL OR m.attributedBody IS NOT NULL)
+ORDER BY m.ROWID
+LIMIT ?
+"""
+
+
+class IMessageIndex:
+    """FTS5 sidecar index over the text of messages in chat.db."""
+
+    def __init__(self, index_path: Path, source: SourceQuery):
+        """Initialize the index and create its schema if needed.
+
+        Args:
+            index_path: Path to the sidecar SQLite database
+            source: Callable running a read-only query against chat.db
+        """
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._source = source
+        # Only one refresh may run at a time
+        self._refresh_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if self._get_state(conn, "version") != str(INDEX_VERSION):
+                self._reset(conn)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.index_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _reset(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM messages_fts")
+        self._set_state(conn, "high_water", "0")
+        self._set_state(conn, "version", str(INDEX_VERSION))
+
+    @property
+    def high_water(self) -> int:
+        """Highest chat.db message ROWID copied into the index."""
+        with self._connect() as conn:
+            return int(self._get_state(conn, "high_water") or 0)
+
+    def refresh(self) -> Dict[str, int]:
+        """Copy messages added to chat.db since the last refresh into the index.
+
+        Returns:
+            Dict with the number of messages indexed and the new high-water mark
+        """
+        with self._refresh_lock:
+            high_water = self.high_water
+            source_max = self._source("SELECT MAX(ROWID) FROM message", ())[0][0] or 0
+            if source_max < high_water:
+                # chat.db was replaced; its ROWIDs no longer line up with ours
+                with self._connect() as conn:
+                    self._reset(conn)
+                high_water = 0
+
+            indexed = 0
+            while high_water < source_max:
+                rows = self._source(_SOURCE_QUERY, (high_water, REFRESH_BATCH_SIZE))
+                if not rows:
+                    break
+                entries = []
+                for rowid, text, body, contact, chat, date, is_from_me in rows:
+                    if text is None:
+                        text = decode_attributed_body(body)
+                    if text:
+                        entries.append((rowid, text, contact, chat, date, is_from_me))
+                with self._connect() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO messages_fts "
+                        "(rowid, text, contact, chat, date, is_from_me) VALUES (?, ?, ?, ?, ?, ?)",
+                        entries,
+                    )
+                    high_water = rows[-1][0]
+                    self._set_state(conn, "high_water", str(high_water))
+                indexed += len(entries)
+                if len(rows) < REFRESH_BATCH_SIZE:
+                    break
+
+            if high_water < source_max:
+                # The newest messages have no text; don't rescan them next time
+                with self._connect() as conn:
+                    self._set_state(conn, "high_water", str(source_max))
+                high_water = source_max
+
+            return {"indexed": indexed, "high_water": high_water}
+
+    def _drop_deleted(self, rowids: List[int]) -> List[int]:
+        """Remove index entries whose messages no longer exist in chat.db.
+
+        Returns:
+            The ROWIDs that were removed
+        """
+        if not rowids:
+            return []
+        placeholders = ", ".join("?" * len(rowids))
+        existing = {
+            row[0]
+            for row in self._source(
+                f"SELECT ROWID FROM message WHERE ROWID IN ({placeholders})", tuple(rowids)
+            )
+        }
+        deleted = [rowid for rowid in rowids if rowid not in existing]
+        if deleted:
+            with self._connect() as conn:
+                conn.executemany(
+                    "DELETE FROM messages_fts WHERE rowid = ?", [(rowid,) for rowid in deleted]
+                )
+        return deleted
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        contact: Optional[Union[str, Sequence[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Full-text search over indexed messages, ranked by BM25.
+
+        The query uses SQLite FTS5 syntax (bare terms are ANDed, "quoted text"
+        is a phrase, a trailing * matches a prefix, OR/NOT combine terms).
+        Input that is not valid FTS5 syntax is retried as a plain list of terms.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            contact: Only match messages from this handle or chat identifier,
+                or from any of several
+
+        Returns:
+            Matches with message_id (chat.db ROWID), text, contact, chat, date
+            (Apple timestamp), is_from_me, score, and a snippet around the
+            match (hits wrapped in [ ])
+        """
+        contacts = [contact] if isinstance(contact, str) else list(contact or [])
+        contact_filter = ""
+        if contacts:
+            placeholders = ", ".join("?" * len(contacts))
+            contact_filter = f"AND (contact IN ({placeholders}) OR chat IN ({placeholders}))"
+
+        sql = f"""
+            SELECT
+                rowid,
+                text,
+                contact,
+                chat,
+                date,
+                is_from_me,
+                snippet(messages_fts, 0, '[', ']', '...', 16),
+                bm25(messages_fts, {_BM25_WEIGHTS}) AS score
+            FROM messages_fts
+            WHERE messages_fts MATCH ?
+            {contact_filter}
+            ORDER BY score
+            LIMIT ?
+        """
+
+        def compose(match: str) -> str:
+            # Search only the text; the indexed contact/chat columns let the
+            # conversation filter run inside the index instead of per match
+            expression = f"text : ({match})"
+            if contacts:
+                phrases = " OR ".join(fts_phrase(value) for value in contacts)
+                expression += f" AND {{contact chat}} : ({phrases})"
+            return expression
+
+        with self._connect() as conn:
+            rows = run_match_query(
+                conn, sql, query, *contacts, *contacts, limit, compose=compose
+            )
+
+        deleted = set(self._drop_deleted([row[0] for row in rows]))
+        return [
+            {
+                "message_id": rowid,
+                "text": text,
+                "contact": contact_id,
+                "chat": chat,
+                "date": date,
+                "is_from_me": bool(is_from_me),
+                # bm25() is lower-is-better; flip it so higher means more relevant
+                "score": round(-score, 4),
+                "snippet": snippet,
+            }
+            for rowid, text, contact_id, chat, date, is_from_me, snippet, score in rows
+            if rowid not in deleted
+        ]
+
+
+_indexes: Dict[Path, IMessageIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_imessage_index(data_dir: Path, source: SourceQuery) -> IMessageIndex:
+    """Get the process-wide iMessage search index, creating it on first use.
+
+    Args:
+        data_dir: Directory holding local data files
+        source: Callable running a read-only query against chat.db
+
+    Returns:
+        The IMessageIndex
+    """
+    index_path = Path(data_dir) / "imessage_index.sqlite"
+    with _indexes_lock:
+        index = _indexes.get(index_path)
+        if index is None:
+            index = _indexes[index_path] = IMessageIndex(index_path, source)
+        return index
@@ -0,0 +1,82 @@
+"""Thread-safe, size-bounded LRU cache for derived data (e.g. extracted note text)."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Least-recently-used cache bounded by entry count and total weight.
+
+    Values are weighed with ``weigh`` (``len`` by default), so a few very large
+    values cannot pin an unbounded amount of memory. A value heavier than
+    ``max_weight`` is not cached at all.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_weight: Optional[int] = None,
+        weigh: Callable[[Any], int] = len,
+    ):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            max_weight: Maximum total weight of all values (None for no limit)
+            weigh: Returns the weight of a value
+        """
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self._weigh = weigh
+        self._entries: "OrderedDict[Hashable, Tuple[V, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for key (marking it recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Cache value under key, evicting the least recently used entries as needed."""
+        weight = self._weigh(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._weight -= old[1]
+            self._entries[key] = (value, weight)
+            self._weight += weight
+            while len(self._entries) > self.maxsize or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                _, (_, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count, total weight, and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "weight": self._weight,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,348 @@
+"""Attachments of Apple Notes: their rows in NoteStore.sqlite and their media files.
+
+A note's protobuf only holds a U+FFFC placeholder with the attachment's
+identifier and type UTI. The attachment itself is an ICAttachment row in
+``ZICCLOUDSYNCINGOBJECT`` (or an ICInlineAttachment row for hashtags and
+mentions, whose text is in ``ZALTTEXT``):
+
+- images, PDFs, audio, and video point (``ZMEDIA``) to an ICMedia row whose file
+  lives at ``Accounts/<account>/Media/<media id>/[<generation>/]<filename>``
+  in the Notes group container
+- scanned documents are galleries whose pages are child attachments
+  (``ZPARENTATTACHMENT``)
+- links keep their URL in ``ZURLSTRING``
+- tables keep their cells in ``ZMERGEABLEDATA1`` (see ``notestore.decode_table``)
+
+Column names vary between macOS versions, so the attachment query is built from
+the columns the database actually has; missing ones read as NULL. Media files
+are only opened when their bytes are requested, and then read through a
+memory map one bounded chunk at a time.
+"""
+
+import mmap
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .notestore import NoteDecodeError, decode_table, render_table
+
+# Runs a query against NoteStore.sqlite and returns all rows
+SourceQuery = Callable[[str, tuple], List[tuple]]
+
+# Identifiers passed per "IN (...)" query, below SQLite's variable limit
+_LOOKUP_BATCH_SIZE = 500
+
+# Media and generation identifiers become path components, so only plain names pass
+_SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+# Kind of attachment by type UTI; anything else is matched by _KIND_HINTS
+_KINDS = {
+    "com.apple.notes.table": "table",
+    "com.apple.notes.gallery": "scan",
+    "com.apple.paper.doc.scan": "scan",
+    "public.url": "link",
+    "com.apple.drawing": "drawing",
+    "com.apple.drawing.2": "drawing",
+    "com.apple.paper": "drawing",
+    "com.apple.notes.inlinetextattachment.hashtag": "hashtag",
+    "com.apple.notes.inlinetextattachment.mention": "mention",
+    "com.apple.notes.inlinetextattachment.link": "note_link",
+    "com.adobe.pdf": "pdf",
+    "public.vcard": "contact",
+}
+
+_KIND_HINTS = (
+    (("jpeg", "png", "heic", "tiff", "gif", "image"), "image"),
+    (("movie", "video", "mpeg-4", "quicktime"), "video"),
+    (("audio", "m4a", "mp3", "aiff"), "audio"),
+)
+
+# Kinds whose text lives in the attachment row itself
+_INLINE_KINDS = {"hashtag", "mention", "note_link", "inline"}
+
+# (alias.column, name) of every column the attachment query reads
+_COLUMNS = (
+    ("a.Z_PK", "pk"),
+    ("a.ZIDENTIFIER", "identifier"),
+    ("a.ZTYPEUTI", "type"),
+    ("a.ZTYPEUTI1", "inline_type"),
+    ("a.ZUSERTITLE", "user_title"),
+    ("a.ZTITLE", "title"),
+    ("a.ZALTTEXT", "text"),
+    ("a.ZURLSTRING", "url"),
+    ("a.ZNOTE", "note"),
+    ("a.ZNOTE1", "inline_note"),
+    ("parent.ZIDENTIFIER", "parent"),
+    ("media.ZIDENTIFIER", "media_id"),
+    ("media.ZFILENAME", "filename"),
+    ("media.ZGENERATION1", "generation"),
+    ("media.ZFILESIZE", "size"),
+)
+
+
+def attachment_kind(type_uti: Optional[str]) -> str:
+    """Classify an attachment type UTI (e.g. "public.jpeg" -> "image")."""
+    if not type_uti:
+        return "file"
+    kind = _KINDS.get(type_uti)
+    if kind is not None:
+        return kind
+    lowered = type_uti.lower()
+    for hints, kind in _KIND_HINTS:
+        if any(hint in lowered for hint in hints):
+            return kind
+    if lowered.startswith("com.apple.notes.inlinetextattachment"):
+        return "inline"
+    return "file"
+
+
+@dataclass
+class Attachment:
+    """One attachment row, joined with its media row if it has one."""
+
+    pk: int
+    identifier: str
+    type: Optional[str]
+    kind: str
+    title: Optional[str] = None
+    text: Optional[str] = None
+    url: Optional[str] = None
+    note_id: Optional[int] = None
+    parent: Optional[str] = None
+    media_id: Optional[str] = None
+    filename: Optional[str] = None
+    generation: Optional[str] = None
+    size: Optional[int] = None
+    table: Optional[bytes] = None
+    pages: List["Attachment"] = field(default_factory=list)
+
+    def metadata(self) -> Dict[str, Any]:
+        """Describe the attachment without its data (None fields left out)."""
+        result = {
+            "id": self.identifier,
+            "type": self.type,
+            "kind": self.kind,
+            "title": self.title,
+            "text": self.text,
+            "url": self.url,
+            "note_id": self.note_id,
+            "parent_id": self.parent,
+            "filename": self.filename,
+            "size": self.size,
+            "has_file": bool(self.media_id) or None,
+        }
+        if self.pages:
+            result["pages"] = [page.metadata() for page in self.pages]
+        return {key: value for key, value in result.items() if value is not None}
+
+    def table_rows(self) -> Optional[List[List[str]]]:
+        """Cells of a table attachment, or None if it is not a readable table."""
+        if not self.table:
+            return None
+        try:
+            return decode_table(self.table)
+        except NoteDecodeError:
+            return None
+
+    def label(self) -> str:
+        """Text standing in for the attachment when a note is rendered."""
+        if self.kind in _INLINE_KINDS:
+            return self.text or self.title or ""
+        if self.kind == "table":
+            rows = self.table_rows()
+            return render_table(rows) if rows else "[Table]"
+        if self.kind == "link":
+            if self.url and self.title:
+                return f"[{self.title}]({self.url})"
+            return self.url or "[Link]"
+        if self.kind == "scan":
+            pages = len(self.pages)
+            return f"[Scanned document: {pages} page{'s' if pages != 1 else ''}]"
+        name = self.title or self.filename
+        kind = "PDF" if self.kind == "pdf" else self.kind.replace("_", " ").capitalize()
+        return f"[{kind}: {name}]" if name else f"[{kind}]"
+
+
+class NotesAttachments:
+    """Looks up note attachments in NoteStore.sqlite and reads their media files."""
+
+    def __init__(self, source: SourceQuery, container: Path):
+        """Initialize the lookup.
+
+        Args:
+            source: Callable running a read-only query against NoteStore.sqlite
+            container: Notes group container (the directory of NoteStore.sqlite)
+        """
+        self._source = source
+        self.container = Path(container)
+        self._columns: Optional[FrozenSet[str]] = None
+        self._lock = threading.Lock()
+
+    def _available_columns(self) -> FrozenSet[str]:
+        """Columns of ZICCLOUDSYNCINGOBJECT, read once per database."""
+        with self._lock:
+            if self._columns is None:
+                rows = self._source("PRAGMA table_info(ZICCLOUDSYNCINGOBJECT)", ())
+                self._columns = frozenset(row[1] for row in rows)
+            return self._columns
+
+    def _query(self, where: str, params: tuple) -> List[Attachment]:
+        available = self._available_columns()
+        select = ", ".join(
+            column if column.split(".")[1] in available else "NULL" for column, _ in _COLUMNS
+        )
+        # Only tables need their (possibly large) CRDT data
+        if "ZMERGEABLEDATA1" in available and "ZTYPEUTI" in available:
+            select += ", CASE WHEN a.ZTYPEUTI = 'com.apple.notes.table' THEN a.ZMERGEABLEDATA1 END"
+        else:
+            select += ", NULL"
+        media_join = "media.Z_PK = a.ZMEDIA" if "ZMEDIA" in available else "0"
+        parent_join = (
+            "parent.Z_PK = a.ZPARENTATTACHMENT" if "ZPARENTATTACHMENT" in available else "0"
+        )
+        rows = self._source(
+            f"""
+            SELECT {select}
+            FROM ZICCLOUDSYNCINGOBJECT a
+            LEFT JOIN ZICCLOUDSYNCINGOBJECT media ON {media_join}
+            LEFT JOIN ZICCLOUDSYNCINGOBJECT parent ON {parent_join}
+            WHERE {where}
+            """,
+            params,
+        )
+        attachments = []
+        for row in rows:
+            values = dict(zip((name for _, name in _COLUMNS), row))
+            type_uti = values["type"] or values["inline_type"]
+            attachments.append(
+                Attachment(
+                    pk=values["pk"],
+                    identifier=values["identifier"],
+                    type=type_uti,
+                    kind=attachment_kind(type_uti),
+                    title=values["user_title"] or values["title"],
+                    text=values["text"],
+                    url=values["url"],
+                    note_id=values["note"] or values["inline_note"],
+                    parent=values["parent"],
+                    media_id=values["media_id"],
+                    filename=values["filename"],
+                    generation=values["generation"],
+                    size=values["size"],
+                    table=row[len(_COLUMNS)],
+                )
+            )
+        return attachments
+
+    def _add_pages(self, attachments: List[Attachment]) -> None:
+        """Attach the page images of scanned documents to their gallery."""
+        galleries = {a.identifier: a for a in attachments if a.kind == "scan"}
+        if not galleries or "ZPARENTATTACHMENT" not in self._available_columns():
+            return
+        pks = [gallery.pk for gallery in galleries.values()]
+        for start in range(0, len(pks), _LOOKUP_BATCH_SIZE):
+            batch = tuple(pks[start : start + _LOOKUP_BATCH_SIZE])
+            placeholders = ", ".join("?" * len(batch))
+            for page in self._query(f"a.ZPARENTATTACHMENT IN ({placeholders})", batch):
+                galleries[page.parent].pages.append(page)
+
+    def lookup(self, identifiers: Iterable[str]) -> Dict[str, Attachment]:
+        """Find attachments by identifier (as found in a decoded note).
+
+        Args:
+            identifiers: Attachment identifiers
+
+        Returns:
+            Attachments by identifier; identifiers without a row are left out
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        found: Dict[str, Attachment] = {}
+        for start in range(0, len(identifiers), _LOOKUP_BATCH_SIZE):
+            batch = tuple(identifiers[start : start + _LOOKUP_BATCH_SIZE])
+            placeholders = ", ".join("?" * len(batch))
+            for attachment in self._query(f"a.ZIDENTIFIER IN ({placeholders})", batch):
+                found.setdefault(attachment.identifier, attachment)
+        self._add_pages(list(found.values()))
+        return found
+
+    def get(self, identifier: str) -> Optional[Attachment]:
+        """Find one attachment (including gallery pages) by identifier, or None."""
+        return self.lookup([identifier]).get(identifier)
+
+    def media_path(self, attachment: Attachment) -> Optional[Path]:
+        """Locate an attachment's media file in the Notes container.
+
+        Args:
+            attachment: Attachment with a media row
+
+        Returns:
+            Path of the file, or None if it has no file or it is not on disk
+            (e.g. not yet downloaded from iCloud)
+        """
+        if not attachment.media_id or not attachment.filename:
+            return None
+        # These come from the database, so they must not be able to leave the container
+        directories = [attachment.media_id] + [attachment.generation] * bool(attachment.generation)
+        if not all(_SAFE_NAME_RE.match(name) for name in directories):
+            return None
+        filename = attachment.filename
+        if Path(filename).name != filename or filename in (".", "..") or "\\" in filename:
+            return None
+
+        container = self.container.resolve()
+        for media_dir in sorted(self.container.glob("Accounts/*/Media")):
+            directory = media_dir / attachment.media_id
+            candidates = [directory / filename]
+            if attachment.generation:
+                candidates.insert(0, directory / attachment.generation / filename)
+            for candidate in candidates:
+                if candidate.is_file() and candidate.resolve().is_relative_to(container):
+                    return candidate
+        return None
+
+    def read_media(self, path: Path, offset: int, max_bytes: int) -> Tuple[bytes, int]:
+        """Read part of a media file through a memory map.
+
+        Only the pages covering the requested range are read, so fetching a
+        chunk of a large PDF does not load the whole file.
+
+        Args:
+            path: File to read (from media_path)
+            offset: First byte to return
+            max_bytes: Maximum number of bytes to return
+
+        Returns:
+            Tuple of (bytes read, total file size)
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file
+            if size == 0 or offset >= size:
+                return b"", size
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[offset : offset + max_bytes], size
+
+
+_lookups: Dict[Path, NotesAttachments] = {}
+_lookups_lock = threading.Lock()
+
+
+def get_notes_attachments(source: SourceQuery, db_path: Path) -> NotesAttachments:
+    """Get the process-wide attachment lookup for a NoteStore.sqlite, creating it on first use.
+
+    Args:
+        source: Callable running a read-only query against NoteStore.sqlite
+        db_path: Path of NoteStore.sqlite; media files are looked up next to it
+
+    Returns:
+        The NotesAttachments
+    """
+    db_path = Path(db_path)
+    with _lookups_lock:
+        lookup = _lookups.get(db_path)
+        if lookup is None:
+            lookup = _lookups[db_path] = NotesAttachments(source, db_path.parent)
+        return lookup
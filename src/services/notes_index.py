@@ -0,0 +1,330 @@
+"""Full-text search index for Apple Notes, kept beside (never inside) NoteStore.sqlite.
+
+``NoteStore.sqlite`` belongs to Notes and is opened read-only, so the FTS5 index
+lives in a sidecar SQLite file under the data directory. It holds the title and
+the full decoded body of every note, where the Notes database itself only has a
+short plain-text snippet.
+
+Notes are edited in place, so there is no ROWID high-water mark to follow as for
+iMessage. Instead the index remembers the ``ZMODIFICATIONDATE1`` of each note it
+holds. A refresh lists (Z_PK, ZMODIFICATIONDATE1) of all notes, then decodes and
+re-indexes only notes that are new or whose date changed, and drops notes that
+are gone. When nothing changed, a refresh does not read any note bodies, and
+when the NoteStore.sqlite files themselves are unchanged (same size and mtime
+of the database and its WAL) it does not query Notes at all.
+
+Decoding every note on the first build can take a while for a large library,
+so it can run on a background thread (``start_background_build``) while callers
+keep using another search path until ``ready`` is true.
+"""
+
+import contextlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .fts import run_match_query
+from .sqlite_pool import modification_signature
+
+logger = logging.getLogger(__name__)
+
+# Runs a query against NoteStore.sqlite and returns all rows
+SourceQuery = Callable[[str, tuple], List[tuple]]
+
+# Turns a ZICNOTEDATA.ZDATA blob into the note's text
+ExtractText = Callable[[bytes], str]
+
+# Bump when the indexed content changes so existing sidecars are rebuilt
+INDEX_VERSION = 1
+
+# bm25() column weights: a match in the title counts more than one in the body
+_BM25_WEIGHTS = "5.0, 1.0"
+
+# Notes decoded and written per transaction
+REFRESH_BATCH_SIZE = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    note_id INTEGER PRIMARY KEY,
+    modified REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5 (
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Modification date of every note, to find what changed since the last refresh
+_SOURCE_DATES_QUERY = """
+SELECT Z_PK, ZMODIFICATIONDATE1
+FROM ZICCLOUDSYNCINGOBJECT
+WHERE Z_ENT = ?
+"""
+
+
+class NotesIndex:
+    """FTS5 sidecar index over the titles and bodies of notes in NoteStore.sqlite."""
+
+    def __init__(
+        self,
+        index_path: Path,
+        source: SourceQuery,
+        extract: ExtractText,
+        source_path: Optional[Path] = None,
+        note_entity: int = 12,
+    ):
+        """Initialize the index and create its schema if needed.
+
+        Args:
+            index_path: Path to the sidecar SQLite database
+            source: Callable running a read-only query against NoteStore.sqlite
+            extract: Callable turning a ZICNOTEDATA.ZDATA blob into text
+            source_path: Path of NoteStore.sqlite, to skip refreshes while it is
+                unchanged (None to always compare modification dates)
+            note_entity: Z_ENT of ICNote rows
+        """
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._source = source
+        self._extract = extract
+        self.source_path = Path(source_path) if source_path else None
+        self.note_entity = note_entity
+        self._refreshed_signature: Optional[Tuple] = None
+        # Only one refresh may run at a time
+        self._refresh_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self._build_error: Optional[str] = None
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if self._get_state(conn, "version") != str(INDEX_VERSION):
+                self._reset(conn)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.index_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _reset(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM notes")
+        conn.execute("DELETE FROM notes_fts")
+        conn.execute("DELETE FROM sync_state WHERE key = 'built'")
+        self._set_state(conn, "version", str(INDEX_VERSION))
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full build has completed, so searches see every note."""
+        with self._connect() as conn:
+            return self._get_state(conn, "built") is not None
+
+    def status(self) -> Dict[str, Any]:
+        """Return whether the index is ready, building, or failed, and its size."""
+        with self._connect() as conn:
+            built = self._get_state(conn, "built") is not None
+            indexed = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        building = self._build_thread is not None and self._build_thread.is_alive()
+        status: Dict[str, Any] = {"ready": built, "building": building, "indexed": indexed}
+        if self._build_error and not building:
+            status["error"] = self._build_error
+        return status
+
+    def _index_notes(self, note_ids: List[int]) -> int:
+        """Decode and (re)index a batch of notes.
+
+        Returns:
+            The number of notes written
+        """
+        placeholders = ", ".join("?" * len(note_ids))
+        rows = self._source(
+            f"""
+            SELECT note.Z_PK, note.ZMODIFICATIONDATE1, note.ZTITLE1, data.ZDATA
+            FROM ZICCLOUDSYNCINGOBJECT note
+            LEFT JOIN ZICNOTEDATA data ON data.Z_PK = note.ZNOTEDATA
+            WHERE note.Z_PK IN ({placeholders})
+            """,
+            tuple(note_ids),
+        )
+        entries = []
+        for note_id, modified, title, data in rows:
+            body = ""
+            if data:
+                try:
+                    body = self._extract(data)
+                except Exception as e:
+                    # Keep the note findable by title; it is retried once edited
+                    logger.warning("Could not extract note %s for indexing: %s", note_id, e)
+            entries.append((note_id, modified, title or "", body))
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM notes_fts WHERE rowid = ?", [(note_id,) for note_id in note_ids]
+            )
+            conn.executemany(
+                "INSERT INTO notes_fts (rowid, title, body) VALUES (?, ?, ?)",
+                [(note_id, title, body) for note_id, _, title, body in entries],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO notes (note_id, modified) VALUES (?, ?)",
+                [(note_id, modified) for note_id, modified, _, _ in entries],
+            )
+        return len(entries)
+
+    def _delete(self, note_ids: List[int]) -> None:
+        with self._connect() as conn:
+            params = [(note_id,) for note_id in note_ids]
+            conn.executemany("DELETE FROM notes_fts WHERE rowid = ?", params)
+            conn.executemany("DELETE FROM notes WHERE note_id = ?", params)
+
+    def _source_signature(self) -> Optional[Tuple]:
+        """(size, mtime) of NoteStore.sqlite and its WAL, or None if unknown."""
+        if self.source_path is None:
+            return None
+        return modification_signature(self.source_path)
+
+    def refresh(self) -> Dict[str, int]:
+        """Re-index notes added or modified since the last refresh and drop deleted ones.
+
+        Returns:
+            Dict with the number of notes indexed and removed
+        """
+        with self._refresh_lock:
+            # Taken before reading, so a write during the refresh triggers another
+            signature = self._source_signature()
+            if signature is not None and signature == self._refreshed_signature:
+                return {"indexed": 0, "removed": 0}
+            source_dates = dict(self._source(_SOURCE_DATES_QUERY, (self.note_entity,)))
+            with self._connect() as conn:
+                indexed_dates = dict(conn.execute("SELECT note_id, modified FROM notes"))
+
+            changed = [
+                note_id
+                for note_id, modified in source_dates.items()
+                if note_id not in indexed_dates or indexed_dates[note_id] != modified
+            ]
+            removed = [note_id for note_id in indexed_dates if note_id not in source_dates]
+
+            indexed = 0
+            for start in range(0, len(changed), REFRESH_BATCH_SIZE):
+                indexed += self._index_notes(changed[start : start + REFRESH_BATCH_SIZE])
+            if removed:
+                self._delete(removed)
+
+            with self._connect() as conn:
+                if self._get_state(conn, "built") is None:
+                    self._set_state(conn, "built", "1")
+            self._refreshed_signature = signature
+            return {"indexed": indexed, "removed": len(removed)}
+
+    def _build(self) -> None:
+        try:
+            self.refresh()
+            self._build_error = None
+        except Exception as e:
+            self._build_error = str(e)
+            logger.warning("Notes index build failed: %s", e)
+
+    def start_background_build(self) -> bool:
+        """Start the first full build on a background thread unless one is running.
+
+        Returns:
+            True if a build is running (started now or earlier)
+        """
+        with self._build_lock:
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return True
+            self._build_thread = threading.Thread(
+                target=self._build, name="assist-me-notes-index", daemon=True
+            )
+            self._build_thread.start()
+            return True
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over note titles and bodies, ranked by BM25.
+
+        The query uses SQLite FTS5 syntax (bare terms are ANDed, "quoted text"
+        is a phrase, a trailing * matches a prefix, OR/NOT combine terms).
+        Input that is not valid FTS5 syntax is retried as a plain list of terms.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            Matches with note_id (NoteStore Z_PK), title, score, and a snippet
+            of the body around the match (hits wrapped in [ ])
+        """
+        sql = f"""
+            SELECT
+                rowid,
+                title,
+                snippet(notes_fts, 1, '[', ']', '...', 24),
+                bm25(notes_fts, {_BM25_WEIGHTS}) AS score
+            FROM notes_fts
+            WHERE notes_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        """
+        with self._connect() as conn:
+            rows = run_match_query(conn, sql, query, limit)
+        return [
+            {
+                "note_id": note_id,
+                "title": title,
+                # bm25() is lower-is-better; flip it so higher means more relevant
+                "score": round(-score, 4),
+                "snippet": snippet,
+            }
+            for note_id, title, snippet, score in rows
+        ]
+
+
+_indexes: Dict[Path, NotesIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_notes_index(
+    data_dir: Path,
+    source: SourceQuery,
+    extract: ExtractText,
+    source_path: Optional[Path] = None,
+    note_entity: int = 12,
+) -> NotesIndex:
+    """Get the process-wide Notes search index, creating it on first use.
+
+    Args:
+        data_dir: Directory holding local data files
+        source: Callable running a read-only query against NoteStore.sqlite
+        extract: Callable turning a ZICNOTEDATA.ZDATA blob into text
+        source_path: Path of NoteStore.sqlite (see NotesIndex)
+        note_entity: Z_ENT of ICNote rows
+
+    Returns:
+        The NotesIndex
+    """
+    index_path = Path(data_dir) / "notes_index.sqlite"
+    with _indexes_lock:
+        index = _indexes.get(index_path)
+        if index is None:
+            index = _indexes[index_path] = NotesIndex(
+                index_path, source, extract, source_path, note_entity
+            )
+        return index
@@ -0,0 +1,534 @@
+"""Decoder for the Apple Notes ``NoteStoreProto`` note body format.
+
+``ZICNOTEDATA.ZDATA`` holds a gzip-compressed protobuf. Only the fields needed
+to render a note are read (numbers as in Notes' ``notestore.proto``)::
+
+    NoteStoreProto   { Document document = 2; }
+    Document         { Note note = 3; }
+    Note             { string note_text = 2; repeated AttributeRun attribute_run = 5; }
+    AttributeRun     { int32 length = 1; ParagraphStyle paragraph_style = 2;
+                       string link = 9; AttachmentInfo attachment_info = 12; }
+    ParagraphStyle   { int32 style_type = 1; int32 indent_amount = 4;
+                       Checklist checklist = 5; }
+    Checklist        { bytes uuid = 1; int32 done = 2; }
+    AttachmentInfo   { string attachment_identifier = 1; string type_uti = 2; }
+
+``note_text`` is the whole note as plain text, with U+FFFC where an attachment
+sits. The attribute runs style consecutive slices of it; their lengths count
+UTF-16 code units, like ``NSString``. Decoding is a single pass over the
+protobuf with no schema compiler or third-party dependency. Unknown fields are
+skipped, so formatting Notes adds later does not break decoding.
+
+Embedded tables are attachments whose ``ZMERGEABLEDATA1`` holds a second kind
+of protobuf, a CRDT document (``MergableDataProto``)::
+
+    MergableDataProto        { MergableDataObject object = 2; }
+    MergableDataObject       { MergeableDataObjectData data = 3; }
+    MergeableDataObjectData  { repeated Entry entry = 3; repeated string key_item = 4;
+                               repeated string type_item = 5; repeated bytes uuid_item = 6; }
+    Entry                    { Dictionary dictionary = 6; Note note = 10;
+                               CustomMap custom_map = 13; OrderedSet ordered_set = 16; }
+    CustomMap                { int32 type = 1; repeated MapEntry map_entry = 3; }
+    MapEntry                 { int32 key = 1; ObjectID value = 2; }
+    ObjectID                 { uint64 unsigned_integer_value = 2; string string_value = 4;
+                               int32 object_index = 6; }
+    Dictionary               { repeated DictionaryElement element = 1; }
+    DictionaryElement        { ObjectID key = 1; ObjectID value = 2; }
+    OrderedSet               { OrderedSetOrdering ordering = 1; }
+    OrderedSetOrdering       { OrderingArray array = 1; Dictionary contents = 2; }
+    OrderingArray            { repeated OrderingAttachment attachment = 2; }
+    OrderingAttachment       { int32 index = 1; bytes uuid = 2; }
+
+Entries refer to each other by index. The ``com.apple.notes.ICTable`` entry maps
+``crRows`` and ``crColumns`` to ordered sets of row and column UUIDs, and
+``cellColumns`` to a dictionary of column -> (row -> cell note).
+"""
+
+import gzip
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# U+FFFC OBJECT REPLACEMENT CHARACTER marks an inline attachment in note_text
+ATTACHMENT_CHARACTER = "￼"
+
+# Type of the root object of an embedded table's MergableDataProto
+TABLE_TYPE = "com.apple.notes.ICTable"
+
+# ParagraphStyle.style_type values
+STYLE_TITLE = 0
+STYLE_HEADING = 1
+STYLE_SUBHEADING = 2
+STYLE_MONOSPACED = 4
+STYLE_DOTTED_LIST = 100
+STYLE_DASHED_LIST = 101
+STYLE_NUMBERED_LIST = 102
+STYLE_CHECKLIST = 103
+
+_HEADING_PREFIXES = {STYLE_TITLE: "# ", STYLE_HEADING: "## ", STYLE_SUBHEADING: "### "}
+_BULLET_STYLES = (STYLE_DOTTED_LIST, STYLE_DASHED_LIST)
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_BYTES = 2
+_WIRE_FIXED32 = 5
+
+# (start, end) offsets of a length-delimited field's payload in the decoded buffer
+Span = Tuple[int, int]
+
+
+class NoteDecodeError(ValueError):
+    """Raised when note data is not a NoteStoreProto."""
+
+
+@dataclass
+class AttributeRun:
+    """Formatting of one slice of the note text."""
+
+    text: str
+    style_type: Optional[int] = None
+    indent: int = 0
+    checked: Optional[bool] = None
+    link: Optional[str] = None
+    attachment_id: Optional[str] = None
+    attachment_type: Optional[str] = None
+
+
+@dataclass
+class NoteContent:
+    """Decoded note: its plain text and the runs that style it."""
+
+    text: str
+    runs: List[AttributeRun] = field(default_factory=list)
+
+    @property
+    def plain_text(self) -> str:
+        """The note text without attachment placeholders."""
+        return self.text.replace(ATTACHMENT_CHARACTER, "").strip()
+
+    def attachments(self) -> List[Tuple[str, Optional[str]]]:
+        """(identifier, type UTI) of each inline attachment, in note order."""
+        return [(run.attachment_id, run.attachment_type) for run in self.runs if run.attachment_id]
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise NoteDecodeError("Truncated varint")
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise NoteDecodeError("Varint too long")
+
+
+def _fields(
+    buf: bytes, start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[int, int, Any]]:
+    """Yield (field number, wire type, value) for each field of ``buf[start:end]``.
+
+    The message is parsed in place: values are ints for varints and fixed-width
+    fields and a Span into buf for length-delimited fields, so nested messages
+    are never copied.
+    """
+    pos = start
+    if end is None:
+        end = len(buf)
+    while pos < end:
+        # Keys, lengths, and most values fit in one byte
+        key = buf[pos]
+        if key < 0x80:
+            pos += 1
+        else:
+            key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 0x07
+        if wire_type == _WIRE_BYTES:
+            if pos < end and buf[pos] < 0x80:
+                length = buf[pos]
+                pos += 1
+            else:
+                length, pos = _read_varint(buf, pos)
+            value: Any = (pos, pos + length)
+            pos += length
+        elif wire_type == _WIRE_VARINT:
+            if pos < end and buf[pos] < 0x80:
+                value = buf[pos]
+                pos += 1
+            else:
+                value, pos = _read_varint(buf, pos)
+        elif wire_type == _WIRE_FIXED64:
+            value = int.from_bytes(buf[pos : pos + 8], "little")
+            pos += 8
+        elif wire_type == _WIRE_FIXED32:
+            value = int.from_bytes(buf[pos : pos + 4], "little")
+            pos += 4
+        else:
+            raise NoteDecodeError(f"Unsupported wire type {wire_type}")
+        if pos > end:
+            raise NoteDecodeError("Truncated field")
+        yield number, wire_type, value
+
+
+def _submessage(
+    buf: bytes, number: int, start: int = 0, end: Optional[int] = None
+) -> Optional[Span]:
+    """Span of the first length-delimited field ``number`` of ``buf[start:end]``."""
+    for field_number, wire_type, value in _fields(buf, start, end):
+        if field_number == number and wire_type == _WIRE_BYTES:
+            return value
+    return None
+
+
+def _string(buf: bytes, span: Span) -> str:
+    return buf[span[0] : span[1]].decode("utf-8", errors="replace")
+
+
+def _parse_run(buf: bytes, start: int, end: int) -> Tuple[int, AttributeRun]:
+    """Parse an AttributeRun. Returns (length in UTF-16 units, run without text)."""
+    length = 0
+    run = AttributeRun(text="")
+    for number, wire_type, value in _fields(buf, start, end):
+        if number == 1 and wire_type == _WIRE_VARINT:
+            length = value
+        elif number == 2 and wire_type == _WIRE_BYTES:
+            for style_field, style_wire, style_value in _fields(buf, *value):
+                if style_field == 1 and style_wire == _WIRE_VARINT:
+                    run.style_type = style_value
+                elif style_field == 4 and style_wire == _WIRE_VARINT:
+                    run.indent = style_value
+                elif style_field == 5 and style_wire == _WIRE_BYTES:
+                    for check_field, check_wire, check_value in _fields(buf, *style_value):
+                        if check_field == 2 and check_wire == _WIRE_VARINT:
+                            run.checked = bool(check_value)
+                    if run.checked is None:
+                        run.checked = False
+        elif number == 9 and wire_type == _WIRE_BYTES:
+            run.link = _string(buf, value)
+        elif number == 12 and wire_type == _WIRE_BYTES:
+            for info_field, info_wire, info_value in _fields(buf, *value):
+                if info_wire != _WIRE_BYTES:
+                    continue
+                if info_field == 1:
+                    run.attachment_id = _string(buf, info_value)
+                elif info_field == 2:
+                    run.attachment_type = _string(buf, info_value)
+    return length, run
+
+
+def decode_note(data: bytes) -> NoteContent:
+    """Decode a ZICNOTEDATA.ZDATA blob into text and attribute runs.
+
+    Args:
+        data: gzip-compressed (or already decompressed) NoteStoreProto
+
+    Returns:
+        The decoded note
+
+    Raises:
+        NoteDecodeError: If the data is not a NoteStoreProto
+    """
+    if data[:2] == GZIP_MAGIC:
+        try:
+            data = gzip.decompress(data)
+        except (OSError, EOFError) as e:
+            raise NoteDecodeError(f"Invalid gzip data: {e}") from e
+
+    document = _submessage(data, 2)
+    note = _submessage(data, 3, *document) if document is not None else None
+    if note is None:
+        raise NoteDecodeError("No note in NoteStoreProto")
+
+    text_span = None
+    run_specs: List[Tuple[int, AttributeRun]] = []
+    for number, wire_type, value in _fields(data, *note):
+        if wire_type != _WIRE_BYTES:
+            continue
+        if number == 2:
+            text_span = value
+        elif number == 5:
+            run_specs.append(_parse_run(data, *value))
+    if text_span is None:
+        raise NoteDecodeError("Note has no text")
+    try:
+        text = data[text_span[0] : text_span[1]].decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise NoteDecodeError(f"Note text is not UTF-8: {e}") from e
+
+    # Run lengths count UTF-16 code units. Unless the text has astral characters
+    # (most emoji), each unit is one character and the text is sliced directly.
+    utf16 = None if text.isascii() else text.encode("utf-16-le")
+    runs: List[AttributeRun] = []
+    offset = 0
+    if utf16 is None or len(utf16) == 2 * len(text):
+        for length, run in run_specs:
+            run.text = text[offset : offset + length]
+            offset += length
+            runs.append(run)
+        if offset < len(text):
+            runs.append(AttributeRun(text=text[offset:]))
+        return NoteContent(text=text, runs=runs)
+
+    for length, run in run_specs:
+        end = min(offset + length * 2, len(utf16))
+        run.text = utf16[offset:end].decode("utf-16-le", errors="replace")
+        offset = end
+        runs.append(run)
+    if offset < len(utf16):
+        runs.append(AttributeRun(text=utf16[offset:].decode("utf-16-le", errors="replace")))
+    return NoteContent(text=text, runs=runs)
+
+
+def _render_piece(run: AttributeRun, piece: str, labels: Optional[Dict[str, str]]) -> str:
+    if run.attachment_id:
+        label = labels.get(run.attachment_id) if labels else None
+        if label is None:
+            label = f"[Attachment: {run.attachment_type or 'attachment'}]"
+        return piece.replace(ATTACHMENT_CHARACTER, label)
+    if run.link and piece.strip() and piece.strip() != run.link:
+        return f"[{piece}]({run.link})"
+    return piece
+
+
+def render_note(content: NoteContent, labels: Optional[Dict[str, str]] = None) -> str:
+    """Render a decoded note as plain text with lightweight Markdown markers.
+
+    Headings get ``#`` prefixes, list items ``-`` or ``1.``, checklist items
+    ``- [ ]`` or ``- [x]``, links become ``[text](url)``, and attachments
+    their label or ``[Attachment: <type>]``.
+
+    Args:
+        content: Decoded note
+        labels: Text to show for attachments, by attachment identifier
+            (e.g. a hashtag's text or a table rendered as Markdown)
+
+    Returns:
+        The note as text
+    """
+    lines: List[str] = []
+    current: List[str] = []
+    line_run: Optional[AttributeRun] = None
+    number = 0
+
+    def finish_line(run: Optional[AttributeRun]) -> None:
+        nonlocal number
+        body = "".join(current)
+        current.clear()
+        style = run.style_type if run else None
+        number = number + 1 if style == STYLE_NUMBERED_LIST else 0
+        indent = "    " * (run.indent if run else 0)
+        if style in _HEADING_PREFIXES and body.strip():
+            body = _HEADING_PREFIXES[style] + body
+        elif style == STYLE_CHECKLIST:
+            body = f"{indent}- [{'x' if run.checked else ' '}] {body}"
+        elif style in _BULLET_STYLES:
+            body = f"{indent}- {body}"
+        elif style == STYLE_NUMBERED_LIST:
+            body = f"{indent}{number}. {body}"
+        lines.append(body)
+
+    for run in content.runs:
+        pieces = run.text.split("\n")
+        for i, piece in enumerate(pieces):
+            if piece:
+                current.append(_render_piece(run, piece, labels))
+                line_run = line_run or run
+            if i < len(pieces) - 1:
+                # The paragraph style is carried by the run holding the newline
+                finish_line(run)
+                line_run = None
+    if current:
+        finish_line(line_run)
+
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def _object_id(buf: bytes, start: int, end: int) -> Tuple[Optional[int], Optional[int]]:
+    """Parse an ObjectID. Returns (unsigned_integer_value, object_index)."""
+    value = index = None
+    for number, wire_type, field_value in _fields(buf, start, end):
+        if wire_type != _WIRE_VARINT:
+            continue
+        if number == 2:
+            value = field_value
+        elif number == 6:
+            index = field_value
+    return value, index
+
+
+def _dictionary(buf: bytes, span: Optional[Span]) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Parse a Dictionary into (key object_index, value object_index) pairs."""
+    pairs: List[Tuple[Optional[int], Optional[int]]] = []
+    if span is None:
+        return pairs
+    for number, wire_type, element in _fields(buf, *span):
+        if number != 1 or wire_type != _WIRE_BYTES:
+            continue
+        key = value = None
+        for element_field, element_wire, element_value in _fields(buf, *element):
+            if element_wire != _WIRE_BYTES:
+                continue
+            if element_field == 1:
+                key = _object_id(buf, *element_value)[1]
+            elif element_field == 2:
+                value = _object_id(buf, *element_value)[1]
+        pairs.append((key, value))
+    return pairs
+
+
+class _MergeableTable:
+    """Cross-references of a MergableDataProto, resolved into a table grid."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        body = _submessage(data, 2)
+        body = _submessage(data, 3, *body) if body is not None else None
+        if body is None:
+            raise NoteDecodeError("No object data in MergableDataProto")
+        self.entries: List[Span] = []
+        self.keys: List[str] = []
+        self.types: List[str] = []
+        self.uuids: List[bytes] = []
+        for number, wire_type, value in _fields(data, *body):
+            if wire_type != _WIRE_BYTES:
+                continue
+            if number == 3:
+                self.entries.append(value)
+            elif number == 4:
+                self.keys.append(_string(data, value))
+            elif number == 5:
+                self.types.append(_string(data, value))
+            elif number == 6:
+                self.uuids.append(data[value[0] : value[1]])
+
+    def entry(self, index: Optional[int], number: int) -> Optional[Span]:
+        """Return field ``number`` of entry ``index``, or None."""
+        if index is None or not 0 <= index < len(self.entries):
+            return None
+        return _submessage(self.data, number, *self.entries[index])
+
+    def custom_map(self, span: Span) -> Tuple[Optional[str], Dict[str, Tuple]]:
+        """Parse a CustomMap. Returns (type name, key name -> ObjectID)."""
+        type_name = None
+        values: Dict[str, Tuple] = {}
+        for number, wire_type, value in _fields(self.data, *span):
+            if number == 1 and wire_type == _WIRE_VARINT and value < len(self.types):
+                type_name = self.types[value]
+            elif number == 3 and wire_type == _WIRE_BYTES:
+                key = object_id = None
+                for entry_field, entry_wire, entry_value in _fields(self.data, *value):
+                    if entry_field == 1 and entry_wire == _WIRE_VARINT:
+                        key = entry_value
+                    elif entry_field == 2 and entry_wire == _WIRE_BYTES:
+                        object_id = _object_id(self.data, *entry_value)
+                if key is not None and key < len(self.keys) and object_id is not None:
+                    values[self.keys[key]] = object_id
+        return type_name, values
+
+    def uuid_index(self, index: Optional[int]) -> Optional[int]:
+        """The UUID (as an index into uuid_item) that entry ``index`` stands for."""
+        custom_map = self.entry(index, 13)
+        if custom_map is None:
+            return None
+        _, values = self.custom_map(custom_map)
+        for value, _ in values.values():
+            return value
+        return None
+
+    def positions(self, index: Optional[int]) -> Dict[int, int]:
+        """Map the UUID indices of an ordered set (rows or columns) to positions."""
+        data = self.data
+        ordered_set = self.entry(index, 16)
+        ordering = _submessage(data, 1, *ordered_set) if ordered_set is not None else None
+        if ordering is None:
+            return {}
+        uuid_positions = {uuid: i for i, uuid in enumerate(self.uuids)}
+        positions: Dict[int, int] = {}
+        array = _submessage(data, 1, *ordering)
+        for number, wire_type, value in _fields(data, *array) if array else ():
+            if number != 2 or wire_type != _WIRE_BYTES:
+                continue
+            uuid = _submessage(data, 2, *value)
+            if uuid is not None and data[uuid[0] : uuid[1]] in uuid_positions:
+                positions[uuid_positions[data[uuid[0] : uuid[1]]]] = len(positions)
+        # Cells refer to rows and columns by a second UUID mapped to the ordered one
+        for key, value in _dictionary(data, _submessage(data, 2, *ordering)):
+            key_uuid, value_uuid = self.uuid_index(key), self.uuid_index(value)
+            if key_uuid in positions and value_uuid is not None:
+                positions[value_uuid] = positions[key_uuid]
+        return positions
+
+    def cell_text(self, index: Optional[int]) -> str:
+        """Text of the cell note in entry ``index``."""
+        note = self.entry(index, 10)
+        if note is None:
+            return ""
+        text = _submessage(self.data, 2, *note)
+        return _string(self.data, text) if text is not None else ""
+
+    def grid(self) -> List[List[str]]:
+        """Find the table object and lay out its cells by row and column order."""
+        for entry in self.entries:
+            custom_map = _submessage(self.data, 13, *entry)
+            if custom_map is None:
+                continue
+            type_name, root = self.custom_map(custom_map)
+            if type_name == TABLE_TYPE:
+                break
+        else:
+            raise NoteDecodeError("No table in MergableDataProto")
+
+        rows = self.positions(root.get("crRows", (None, None))[1])
+        columns = self.positions(root.get("crColumns", (None, None))[1])
+        width = max(columns.values(), default=-1) + 1
+        grid = [[""] * width for _ in range(max(rows.values(), default=-1) + 1)]
+        cell_columns = self.entry(root.get("cellColumns", (None, None))[1], 6)
+        for column_key, column_value in _dictionary(self.data, cell_columns):
+            column = columns.get(self.uuid_index(column_key))
+            cells = self.entry(column_value, 6)
+            if column is None or cells is None:
+                continue
+            for row_key, cell in _dictionary(self.data, cells):
+                row = rows.get(self.uuid_index(row_key))
+                if row is not None and row < len(grid):
+                    grid[row][column] = self.cell_text(cell)
+        return grid
+
+
+def decode_table(data: bytes) -> List[List[str]]:
+    """Decode an embedded table from an attachment's ZMERGEABLEDATA1 blob.
+
+    Args:
+        data: gzip-compressed (or already decompressed) MergableDataProto
+
+    Returns:
+        Rows of cell texts, in display order
+
+    Raises:
+        NoteDecodeError: If the data is not a table
+    """
+    if data[:2] == GZIP_MAGIC:
+        try:
+            data = gzip.decompress(data)
+        except (OSError, EOFError) as e:
+            raise NoteDecodeError(f"Invalid gzip data: {e}") from e
+    return _MergeableTable(data).grid()
+
+
+def render_table(rows: List[List[str]]) -> str:
+    """Render table rows as a Markdown table (the first row as its header)."""
+    if not rows or not rows[0]:
+        return ""
+
+    def line(cells: List[str]) -> str:
+        cleaned = (cell.replace("\n", " ").replace("|", "\\|").strip() for cell in cells)
+        return "| " + " | ".join(cleaned) + " |"
+
+    lines = [line(rows[0]), "|" + " --- |" * len(rows[0])]
+    lines.extend(line(row) for row in rows[1:])
+    return "\n".join(lines)
@@ -3,22 +3,109 @@
 Inspired by: https://github.com/j3k0/mcp-google-workspace
 """
 
-import json
+import functools
 import os
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
 
 # Google API Scopes
 GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
 CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Pinned discovery documents shipped with the server (see discovery_documents/)
+DISCOVERY_DIR = Path(__file__).parent / "discovery_documents"
+
+# Refresh access tokens this long before they actually expire, so a request
+# never goes out with a token that lapses mid-flight.
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+@functools.lru_cache(maxsize=None)
+def load_discovery_document(api: str, version: str) -> Optional[str]:
+    """Read a bundled discovery document once per process.
+
+    The JSON text is cached rather than the parsed document: googleapiclient
+    patches the document it is given, including lazily when nested resources
+    such as ``service.users().messages()`` are first used, so every service
+    needs its own parsed copy.
+
+    Args:
+        api: API name (e.g., 'gmail')
+        version: API version (e.g., 'v1')
+
+    Returns:
+        Discovery document JSON, or None if no pinned copy is bundled
+    """
+    doc_path = DISCOVERY_DIR / f"{api}.{version}.json"
+    if not doc_path.exists():
+        return None
+    return doc_path.read_text(encoding="utf-8")
+
+
+def build_api_service(api: str, version: str, http):
+    """Build an API service from the bundled discovery document.
+
+    Falls back to googleapiclient's own discovery lookup when no pinned
+    document is available for the requested API.
+
+    Args:
+        api: API name (e.g., 'gmail')
+        version: API version (e.g., 'v1')
+        http: Authorized httplib2-compatible transport
+
+    Returns:
+        API service object
+    """
+    document = load_discovery_document(api, version)
+    if document is None:
+        return build(api, version, http=http)
+    # Parses a private copy of the document for this service
+    return build_from_document(document, http=http)
+
+
+class _ThreadLocalHttp:
+    """httplib2-compatible transport that gives each thread its own connection.
+
+    httplib2.Http is not thread-safe, but cached service objects are shared by
+    every worker in the Google executor pool. Requests built from a service hold
+    a reference to this object and resolve the per-thread AuthorizedHttp only
+    when they are executed, so connections are reused per worker thread.
+    """
+
+    def __init__(self, credentials: Credentials):
+        self.credentials = credentials
+        self._local = threading.local()
+
+    def _http(self) -> AuthorizedHttp:
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    def request(self, *args, **kwargs):
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._http(), name)
+
 
 class GoogleOAuthManager:
-    """Manages OAuth2 authentication for Google services."""
+    """Manages OAuth2 authentication for Google services.
+
+    Live credentials and built API service objects are cached in-process per
+    (account_id, service), so tool calls after the first one neither re-read the
+    token file nor re-run service discovery.
+    """
 
     def __init__(
         self,
@@ -41,15 +128,52 @@ class GoogleOAuthManager:
         self.credentials_dir = Path(credentials_dir)
         self.credentials_dir.mkdir(parents=True, exist_ok=True)
 
+        self._credentials: Dict[Tuple[str, str], Credentials] = {}
+        self._persisted_tokens: Dict[Tuple[str, str], str] = {}
+        self._services: Dict[Tuple[str, str], Tuple[Credentials, Any]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
     def _get_credentials_path(self, account_id: str, service: str) -> Path:
         """Get the path to the credentials file for a specific account and service."""
         return self.credentials_dir / f"{account_id}_{service}_token.json"
 
+    def _get_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        """Get the single-flight lock for an (account_id, service) pair."""
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _needs_refresh(creds: Credentials) -> bool:
+        """Check whether credentials are invalid or about to expire."""
+        if not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth stores expiry as a naive UTC datetime
+        return creds.expiry - REFRESH_MARGIN <= datetime.utcnow()
+
+    def _save_credentials(self, key: Tuple[str, str], creds: Credentials) -> None:
+        """Write credentials to disk, but only if they changed since the last write."""
+        token_json = creds.to_json()
+        if self._persisted_tokens.get(key) == token_json:
+            return
+        with open(self._get_credentials_path(*key), "w") as token:
+            token.write(token_json)
+        self._persisted_tokens[key] = token_json
+
     def get_credentials(
         self, account_id: str, service: str, scopes: List[str]
     ) -> Optional[Credentials]:
         """Get or refresh credentials for a specific account and service.
 
+        Cached credentials are returned without locking while they are fresh.
+        Otherwise a per-account lock ensures only one caller loads, refreshes,
+        or re-authenticates, and the rest reuse its result.
+
         Args:
             account_id: Unique identifier for the account
             service: Service name (e.g., 'gmail', 'calendar')
@@ -58,18 +182,28 @@ class GoogleOAuthManager:
         Returns:
             Valid credentials or None if authentication is needed
         """
-        creds_path = self._get_credentials_path(account_id, service)
-        creds = None
+        key = (account_id, service)
+        creds = self._credentials.get(key)
+        if creds is not None and not self._needs_refresh(creds):
+            return creds
+
+        with self._get_lock(key):
+            # Another caller may have refreshed while we waited for the lock
+            creds = self._credentials.get(key)
+            if creds is not None and not self._needs_refresh(creds):
+                return creds
 
-        # Load existing credentials
-        if creds_path.exists():
-            creds = Credentials.from_authorized_user_file(str(creds_path), scopes)
+            # Load existing credentials
+            if creds is None:
+                creds_path = self._get_credentials_path(account_id, service)
+                if creds_path.exists():
+                    creds = Credentials.from_authorized_user_file(str(creds_path), scopes)
+                    self._persisted_tokens[key] = creds.to_json()
 
-        # Refresh or get new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
+            # Refresh or get new credentials
+            if creds and creds.refresh_token and self._needs_refresh(creds):
                 creds.refresh(Request())
-            else:
+            elif not creds or not creds.valid:
                 # Create client config
                 client_config = {
                     "installed": {
@@ -91,11 +225,37 @@ class GoogleOAuthManager:
                 )
 
             # Save the credentials
-            with open(creds_path, "w") as token:
-                token.write(creds.to_json())
+            self._save_credentials(key, creds)
+            self._credentials[key] = creds
 
         return creds
 
+    def _get_service(
+        self, account_id: str, service: str, scopes: List[str], api: str, version: str
+    ):
+        """Return a cached API service object, building it on first use.
+
+        The service is rebuilt only if the underlying credentials object was
+        replaced (e.g. after re-authentication); in-place refreshes are picked
+        up automatically because the transport holds the same object.
+        """
+        creds = self.get_credentials(account_id, service, scopes)
+        if not creds:
+            return None
+
+        key = (account_id, service)
+        cached = self._services.get(key)
+        if cached is not None and cached[0] is creds:
+            return cached[1]
+
+        with self._get_lock(key):
+            cached = self._services.get(key)
+            if cached is not None and cached[0] is creds:
+                return cached[1]
+            api_service = build_api_service(api, version, _ThreadLocalHttp(creds))
+            self._services[key] = (creds, api_service)
+            return api_service
+
     def build_gmail_service(self, account_id: str = "default"):
         """Build a Gmail API service.
 
@@ -105,10 +265,10 @@ class GoogleOAuthManager:
         Returns:
             Gmail API service object
         """
-        creds = self.get_credentials(account_id, "gmail", GMAIL_SCOPES)
-        if not creds:
+        service = self._get_service(account_id, "gmail", GMAIL_SCOPES, "gmail", "v1")
+        if not service:
             raise ValueError(f"No valid credentials for Gmail account: {account_id}")
-        return build("gmail", "v1", credentials=creds)
+        return service
 
     def build_calendar_service(self, account_id: str = "default"):
         """Build a Google Calendar API service.
@@ -119,10 +279,10 @@ class GoogleOAuthManager:
         Returns:
             Calendar API service object
         """
-        creds = self.get_credentials(account_id, "calendar", CALENDAR_SCOPES)
-        if not creds:
+        service = self._get_service(account_id, "calendar", CALENDAR_SCOPES, "calendar", "v3")
+        if not service:
             raise ValueError(f"No valid credentials for Calendar account: {account_id}")
-        return build("calendar", "v3", credentials=creds)
+        return service
 
     def list_authenticated_accounts(self, service: str) -> List[str]:
         """List all authenticated accounts for a service.
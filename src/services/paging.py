@@ -0,0 +1,68 @@
+"""Cursor-based paging shared by the list and search tools.
+
+Every paged tool accepts an opaque ``page_token`` and returns
+``{"items": [...], "next_page_token": "..." | None}``. A token wraps the
+upstream cursor (a Gmail/Calendar ``pageToken``, a Slack ``next_cursor``, or a
+local offset) together with the tool that issued it, so a token handed to the
+wrong tool is rejected instead of silently restarting from the first page.
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+
+def encode_page_token(scope: str, cursor: Any) -> Optional[str]:
+    """Wrap an upstream cursor in an opaque page token.
+
+    Args:
+        scope: Name of the tool issuing the token
+        cursor: Upstream cursor; falsy values mean there are no more pages
+
+    Returns:
+        Opaque token string, or None when there is no next page
+    """
+    if cursor is None or cursor == "":
+        return None
+    payload = json.dumps([scope, cursor], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_page_token(scope: str, page_token: Optional[str]) -> Any:
+    """Unwrap a page token issued by encode_page_token.
+
+    Args:
+        scope: Name of the tool receiving the token
+        page_token: Token from a previous call, or None for the first page
+
+    Returns:
+        The upstream cursor, or None for the first page
+
+    Raises:
+        ValueError: If the token is malformed or was issued by another tool
+    """
+    if not page_token:
+        return None
+    try:
+        padded = page_token + "=" * (-len(page_token) % 4)
+        token_scope, cursor = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page_token: {e}")
+    if token_scope != scope:
+        raise ValueError(f"page_token was issued by {token_scope}, not {scope}")
+    return cursor
+
+
+def make_page(scope: str, items: List[Any], next_cursor: Any) -> Dict[str, Any]:
+    """Build the standard paged tool result.
+
+    Args:
+        scope: Name of the tool producing the page
+        items: Items on this page
+        next_cursor: Upstream cursor for the next page (falsy if none)
+
+    Returns:
+        Dict with items and next_page_token
+    """
+    return {"items": items, "next_page_token": encode_page_token(scope, next_cursor)}
+
@@ -0,0 +1,259 @@
+"""Field projection and size budgeting for tool outputs.
+
+Tool results go straight into the LLM's context window, so every byte costs
+prefill time. The ``budgeted`` decorator adds three optional arguments to a
+tool:
+
+- ``fields``: keep only these keys (dotted paths such as ``messages.body``
+  reach into nested dicts and lists of dicts)
+- ``max_chars`` / ``max_tokens``: cap the serialized size of the result
+
+When a result is over budget the longest strings are shortened first (short
+fields such as ids and dates stay intact), then trailing list items are dropped
+if that is still not enough. What was cut is reported under ``_budget``.
+"""
+
+import functools
+import inspect
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rough characters-per-token ratio used to turn max_tokens into a char budget
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = "…"
+
+# Strings at or below this length are never shortened; items are dropped instead
+MIN_FIELD_CHARS = 80
+
+# Space reserved for the _budget report itself
+_REPORT_RESERVE = 200
+
+# Keys that survive field projection so failures are never hidden
+_ALWAYS_KEPT = ("error", "next_page_token")
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def _parse_fields(fields: List[str]) -> Dict[str, Any]:
+    """Turn ["a", "b.c", "b.d"] into {"a": None, "b": {"c": None, "d": None}}."""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        head, _, rest = field.partition(".")
+        if not rest:
+            tree[head] = None
+        elif tree.get(head, {}) is not None:
+            tree.setdefault(head, {}).update(_parse_fields([rest]))
+    return tree
+
+
+def _select(value: Any, tree: Dict[str, Any]) -> Any:
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    # Paged results ({"items": [...], "next_page_token": ...}) project their items
+    if "items" in value and "items" not in tree and isinstance(value["items"], list):
+        return {**value, "items": _select(value["items"], tree)}
+    selected = {}
+    for key, item in value.items():
+        if key in tree:
+            subtree = tree[key]
+            selected[key] = item if subtree is None else _select(item, subtree)
+        elif key in _ALWAYS_KEPT:
+            selected[key] = item
+    return selected
+
+
+def select_fields(value: Any, fields: Optional[List[str]]) -> Any:
+    """Keep only the requested fields of a tool result.
+
+    Args:
+        value: Tool result (dict, list of dicts, or paged result)
+        fields: Field names; dotted paths select nested fields
+
+    Returns:
+        The projected result
+    """
+    if not fields:
+        return value
+    return _select(value, _parse_fields(fields))
+
+
+def _string_slots(value: Any, slots: List[Tuple[Any, Any, int]]) -> None:
+    """Collect (container, key, length) for every string leaf."""
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, item in items:
+        if isinstance(item, str):
+            slots.append((value, key, len(item)))
+        elif isinstance(item, (dict, list)):
+            _string_slots(item, slots)
+
+
+def _water_level(lengths: List[int], budget: int) -> int:
+    """Largest cap c such that sum(min(length, c)) <= budget."""
+    remaining = budget
+    ordered = sorted(lengths)
+    for i, length in enumerate(ordered):
+        share = remaining // (len(ordered) - i)
+        if length > share:
+            return max(share, 0)
+        remaining -= length
+    return ordered[-1] if ordered else 0
+
+
+def _shorten(text: str, cap: int) -> str:
+    """Cut text to about cap characters, preferring a word boundary."""
+    if len(text) <= cap:
+        return text
+    cut = text[: max(cap - len(TRUNCATION_MARKER), 0)]
+    space = cut.rfind(" ")
+    if space > len(cut) * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def _largest_list(value: Any) -> Optional[list]:
+    """Find the list holding the most serialized data (the best place to drop items)."""
+    best, best_size = None, 0
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        children = node.values() if isinstance(node, dict) else node
+        if isinstance(node, list) and len(node) > 1:
+            size = _size(node)
+            if size > best_size:
+                best, best_size = node, size
+        stack.extend(c for c in children if isinstance(c, (dict, list)))
+    return best
+
+
+def fit_to_budget(value: Any, max_chars: int) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """Shrink a JSON-like value so that it serializes to at most max_chars.
+
+    Args:
+        value: Tool result
+        max_chars: Character budget for the serialized result
+
+    Returns:
+        Tuple of (possibly shortened copy of value, report or None if nothing was cut)
+    """
+    original = _size(value)
+    if original <= max_chars or not isinstance(value, (dict, list)):
+        return value, None
+
+    value = json.loads(json.dumps(value, ensure_ascii=False, default=str))
+    budget = max(max_chars - _REPORT_RESERVE, 0)
+    truncated = set()
+    dropped_items = 0
+
+    # Shorten the longest strings first, leaving short fields untouched
+    for _ in range(3):
+        slots: List[Tuple[Any, Any, int]] = []
+        _string_slots(value, slots)
+        slots = [slot for slot in slots if slot[2] > MIN_FIELD_CHARS]
+        overflow = _size(value) - budget
+        if overflow <= 0 or not slots:
+            break
+        string_budget = sum(length for _, _, length in slots) - overflow
+        cap = max(_water_level([length for _, _, length in slots], string_budget), MIN_FIELD_CHARS)
+        for container, key, length in slots:
+            if length > cap:
+                container[key] = _shorten(container[key], cap)
+                truncated.add((id(container), key))
+
+    # Still too big (lots of small items): drop trailing list items
+    while _size(value) > budget:
+        target = _largest_list(value)
+        if target is None:
+            break
+        target.pop()
+        dropped_items += 1
+
+    report = {
+        "original_chars": original,
+        "returned_chars": _size(value),
+        "truncated_fields": len(truncated),
+        "dropped_items": dropped_items,
+    }
+    return value, report
+
+
+def project_output(
+    value: Any,
+    fields: Optional[List[str]] = None,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> Any:
+    """Apply field selection and a size budget to a tool result.
+
+    Args:
+        value: Tool result
+        fields: Fields to keep (optional)
+        max_chars: Maximum serialized size in characters (optional)
+        max_tokens: Maximum size in approximate tokens (optional)
+
+    Returns:
+        The projected result. If anything was cut, dict results gain a
+        ``_budget`` key and list results gain a trailing ``{"_budget": ...}`` item.
+    """
+    value = select_fields(value, fields)
+
+    limits = [limit for limit in (max_chars, max_tokens and max_tokens * CHARS_PER_TOKEN) if limit]
+    if not limits:
+        return value
+
+    value, report = fit_to_budget(value, min(limits))
+    if report is None:
+        return value
+    if isinstance(value, dict):
+        value["_budget"] = report
+    else:
+        value.append({"_budget": report})
+    return value
+
+
+_BUDGET_DOC = """
+
+        Output controls (available on every read tool):
+            fields: Only return these fields, e.g. ["id", "subject"] or ["messages.body"]
+            max_chars: Cap the response size in characters; long text is shortened first
+            max_tokens: Cap the response size in approximate tokens"""
+
+
+def budgeted(func):
+    """Add fields / max_chars / max_tokens arguments to an async tool function.
+
+    Apply below ``@mcp.tool()`` so the extra arguments appear in the tool schema.
+    """
+    signature = inspect.signature(func)
+    extra = [
+        inspect.Parameter(
+            "fields", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[List[str]]
+        ),
+        inspect.Parameter(
+            "max_chars", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[int]
+        ),
+        inspect.Parameter(
+            "max_tokens", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[int]
+        ),
+    ]
+
+    @functools.wraps(func)
+    async def wrapper(
+        *args,
+        fields: Optional[List[str]] = None,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ):
+        result = await func(*args, **kwargs)
+        return project_output(result, fields, max_chars, max_tokens)
+
+    wrapper.__signature__ = signature.replace(
+        parameters=list(signature.parameters.values()) + extra
+    )
+    wrapper.__doc__ = (func.__doc__ or "").rstrip() + _BUDGET_DOC
+    return wrapper
@@ -0,0 +1,197 @@
+"""Long-lived read-only SQLite connections for the local macOS databases.
+
+The iMessage and Notes tools read databases owned by other apps (``chat.db``,
+``NoteStore.sqlite``). Opening a connection per query throws away SQLite's page
+cache and prepared statements every time, so each worker thread keeps one
+read-only connection per database instead.
+
+Connections are opened with ``mode=ro`` and ``PRAGMA query_only``, with a large
+mmap window and page cache. The owning app may checkpoint and delete its WAL
+file, or replace the database entirely (e.g. after a restore). A connection is
+reopened when the inode of the database or its ``-wal`` file changes.
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # bytes
+DEFAULT_CACHE_KIB = 64 * 1024  # page cache per connection, in KiB
+DEFAULT_CACHED_STATEMENTS = 256
+
+# Errors that mean the connection went stale rather than the query being wrong
+_STALE_ERRORS = ("disk i/o", "malformed", "unable to open", "not a database")
+
+# (device, inode) of the database file and of its WAL file (None if absent)
+_FileSignature = Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]
+
+
+def _inode(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def modification_signature(db_path: Path) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """(size, mtime) of a database and its ``-wal`` file (None if absent).
+
+    Any write by the owning app changes one of the two, so data derived from the
+    database can be reused for as long as the signature stays the same.
+    """
+    signature = []
+    for path in (str(db_path), str(db_path) + "-wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((st.st_size, st.st_mtime_ns))
+    return tuple(signature)
+
+
+class ReadOnlyConnectionPool:
+    """One persistent read-only connection per thread for a single database."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_kib: int = DEFAULT_CACHE_KIB,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+    ):
+        """Initialize the pool. No connection is opened until first use.
+
+        Args:
+            db_path: Path to the SQLite database
+            mmap_size: Bytes of the database to memory-map
+            cache_kib: Page cache size per connection in KiB
+            cached_statements: Prepared statements kept per connection
+        """
+        self.db_path = Path(db_path)
+        self.mmap_size = mmap_size
+        self.cache_kib = cache_kib
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._opened = 0
+        self._reopened = 0
+
+    def _signature(self) -> _FileSignature:
+        path = str(self.db_path)
+        return _inode(path), _inode(path + "-wal")
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        try:
+            conn.execute("PRAGMA query_only = ON")
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+            conn.execute(f"PRAGMA cache_size = -{int(self.cache_kib)}")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        with self._lock:
+            self._connections.append(conn)
+            self._opened += 1
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it if the files changed.
+
+        Raises:
+            sqlite3.OperationalError: If the database cannot be opened
+        """
+        signature = self._signature()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.signature != signature:
+            self._discard(conn)
+            conn = None
+            with self._lock:
+                self._reopened += 1
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.signature = signature
+        return conn
+
+    def execute(self, query: str, params: tuple = ()) -> List[tuple]:
+        """Run a query on this thread's connection and fetch all rows.
+
+        If the connection has gone stale (I/O error, database replaced underneath
+        it) it is dropped and the query is retried once on a fresh connection.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+
+        Returns:
+            List of result tuples
+        """
+        conn = self.connection()
+        try:
+            return conn.execute(query, params).fetchall()
+        except sqlite3.DatabaseError as e:
+            if not any(marker in str(e).lower() for marker in _STALE_ERRORS):
+                raise
+            self._discard(conn)
+            self._local.conn = None
+            return self.connection().execute(query, params).fetchall()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection counts for this pool."""
+        with self._lock:
+            return {
+                "database": str(self.db_path),
+                "open_connections": len(self._connections),
+                "opened": self._opened,
+                "reopened": self._reopened,
+            }
+
+    def close(self) -> None:
+        """Close every connection (threads reopen lazily on next use)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+_pools: Dict[str, ReadOnlyConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_readonly_pool(db_path: Path) -> ReadOnlyConnectionPool:
+    """Get or create the shared pool for a database path."""
+    key = str(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ReadOnlyConnectionPool(db_path)
+                _pools[key] = pool
+    return pool
+
+
+def close_readonly_pools() -> None:
+    """Close every shared pool (called on server shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
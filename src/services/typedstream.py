@@ -0,0 +1,105 @@
+"""Plain-text extraction from Messages ``attributedBody`` blobs.
+
+On recent macOS versions many rows in ``message`` have ``text IS NULL`` and keep
+their content only in ``attributedBody``: an ``NSAttributedString`` serialized
+with the legacy NeXTSTEP ``typedstream`` format (``NSArchiver``). The string
+payload is always the first ``NSString`` object in the stream::
+
+    ... "NSString" 0x01 0x94 0x84 0x01 "+" <length> <UTF-8 bytes> 0x86 ...
+
+Rather than materializing the whole object graph, the decoder jumps to that
+object and reads the length-prefixed bytes, which is all the tools need.
+"""
+
+from typing import Optional, Tuple
+
+from .lru import LRUCache
+
+STREAM_HEADER = b"\x04\x0bstreamtyped"
+
+_STRING_CLASS = b"NSString"
+_STRING_TYPE = b"+"
+
+# typedstream integer tags: the value follows as a 2- or 4-byte little-endian int
+_INT16_TAG = 0x81
+_INT32_TAG = 0x82
+
+# The "+" type marker sits a few bytes after the class name
+_TYPE_SEARCH_WINDOW = 16
+
+# Number of decoded messages kept in the cache
+DEFAULT_CACHE_SIZE = 10_000
+
+
+def _read_length(blob: bytes, pos: int) -> Tuple[int, int]:
+    """Read a typedstream-encoded unsigned integer at pos.
+
+    Returns:
+        Tuple of (value, position after the integer)
+    """
+    tag = blob[pos]
+    if tag == _INT16_TAG:
+        return int.from_bytes(blob[pos + 1 : pos + 3], "little"), pos + 3
+    if tag == _INT32_TAG:
+        return int.from_bytes(blob[pos + 1 : pos + 5], "little"), pos + 5
+    return tag, pos + 1
+
+
+def decode_attributed_body(blob: Optional[bytes]) -> Optional[str]:
+    """Extract the plain string from an attributedBody typedstream.
+
+    Args:
+        blob: Contents of message.attributedBody
+
+    Returns:
+        The message text, or None if the blob is empty or not a typedstream
+        holding an NSString
+    """
+    if not blob or not blob.startswith(STREAM_HEADER):
+        return None
+    class_pos = blob.find(_STRING_CLASS, len(STREAM_HEADER))
+    if class_pos < 0:
+        return None
+    start = class_pos + len(_STRING_CLASS)
+    type_pos = blob.find(_STRING_TYPE, start, start + _TYPE_SEARCH_WINDOW)
+    if type_pos < 0 or type_pos + 1 >= len(blob):
+        return None
+    length, data_pos = _read_length(blob, type_pos + 1)
+    data = blob[data_pos : data_pos + length]
+    if len(data) != length:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+# Decoded text by message ROWID. Edited messages keep their ROWID but get a new
+# blob, so each entry also holds the blob length and is decoded again if it changes.
+_cache: LRUCache[Tuple[int, Optional[str]]] = LRUCache(DEFAULT_CACHE_SIZE)
+
+
+def _cached_text(rowid: int, blob: Optional[bytes]) -> Optional[str]:
+    """Return the decoded text of a message's blob, decoding only on a cache miss."""
+    size = len(blob) if blob else 0
+    entry = _cache.get(rowid)
+    if entry is not None and entry[0] == size:
+        return entry[1]
+    text = decode_attributed_body(blob)
+    _cache.put(rowid, (size, text))
+    return text
+
+
+def message_text(
+    rowid: int, text: Optional[str], attributed_body: Optional[bytes]
+) -> Optional[str]:
+    """Return a message's text, falling back to its attributedBody.
+
+    Args:
+        rowid: message.ROWID (cache key for decoded blobs)
+        text: message.text
+        attributed_body: message.attributedBody
+
+    Returns:
+        The message text, or None if the message has none (e.g. attachment only)
+    """
+    if text is not None:
+        return text
+    return _cached_text(rowid, attributed_body)
@@ -17,6 +17,7 @@ For production use:
 
 from typing import List, Dict, Any, Optional
 from mcp.server.fastmcp import FastMCP
+from ..services.projection import budgeted
 
 
 def register_amazon_tools(mcp: FastMCP):
@@ -76,6 +77,7 @@ def register_amazon_tools(mcp: FastMCP):
         }
 
     @mcp.tool()
+    @budgeted
     async def amazon_parse_order_emails(
         max_results: int = 20,
         account_id: str = "default",
@@ -151,6 +153,7 @@ def register_amazon_tools(mcp: FastMCP):
         }
 
     @mcp.tool()
+    @budgeted
     async def amazon_search_orders(
         query: Optional[str] = None,
         days_back: int = 90,
@@ -192,6 +195,7 @@ def register_amazon_tools(mcp: FastMCP):
         }
 
     @mcp.tool()
+    @budgeted
     async def amazon_get_deliveries(days_ahead: int = 7) -> Dict[str, Any]:
         """Get upcoming Amazon deliveries using Gmail email parsing.
 
@@ -9,7 +9,10 @@ Inspired by:
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from mcp.server.fastmcp import FastMCP
+from ..services.executor import GOOGLE_POOL, run_blocking
 from ..services.oauth import GoogleOAuthManager
+from ..services.paging import decode_page_token, make_page
+from ..services.projection import budgeted
 
 
 def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
@@ -26,8 +29,10 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             List of calendars with id, name, and description
         """
         try:
-            service = oauth_manager.build_calendar_service(account_id)
-            calendar_list = service.calendarList().list().execute()
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_calendar_service, account_id
+            )
+            calendar_list = await run_blocking(GOOGLE_POOL, service.calendarList().list().execute)
             calendars = calendar_list.get("items", [])
             return [
                 {
@@ -42,13 +47,15 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             raise RuntimeError(f"Failed to list calendars: {str(e)}")
 
     @mcp.tool()
+    @budgeted
     async def calendar_list_events(
         calendar_id: str = "primary",
         account_id: str = "default",
         time_min: Optional[str] = None,
         time_max: Optional[str] = None,
         max_results: int = 10,
-    ) -> List[Dict[str, Any]]:
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """List calendar events within a time range.
 
         Args:
@@ -56,13 +63,18 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             account_id: Google account identifier (default: "default")
             time_min: Start time in ISO format (default: now)
             time_max: End time in ISO format (default: 7 days from now)
-            max_results: Maximum number of events to return (default: 10)
+            max_results: Maximum number of events per page (default: 10)
+            page_token: next_page_token from a previous call to fetch the next page
+                (pass the same time range as the first call)
 
         Returns:
-            List of events with details
+            Dict with items (events with details) and next_page_token
         """
         try:
-            service = oauth_manager.build_calendar_service(account_id)
+            cursor = decode_page_token("calendar_list_events", page_token)
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_calendar_service, account_id
+            )
 
             # Default time range: next 7 days
             if time_min is None:
@@ -70,7 +82,8 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             if time_max is None:
                 time_max = (datetime.utcnow() + timedelta(days=7)).isoformat() + "Z"
 
-            events_result = (
+            events_result = await run_blocking(
+                GOOGLE_POOL,
                 service.events()
                 .list(
                     calendarId=calendar_id,
@@ -79,8 +92,9 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
                     maxResults=max_results,
                     singleEvents=True,
                     orderBy="startTime",
+                    pageToken=cursor,
                 )
-                .execute()
+                .execute,
             )
             events = events_result.get("items", [])
 
@@ -102,7 +116,9 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
                     }
                 )
 
-            return formatted_events
+            return make_page(
+                "calendar_list_events", formatted_events, events_result.get("nextPageToken")
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to list calendar events: {str(e)}")
 
@@ -133,7 +149,9 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             Created event details including event ID and link
         """
         try:
-            service = oauth_manager.build_calendar_service(account_id)
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_calendar_service, account_id
+            )
 
             event = {
                 "summary": summary,
@@ -148,8 +166,8 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             if attendees:
                 event["attendees"] = [{"email": email} for email in attendees]
 
-            created_event = (
-                service.events().insert(calendarId=calendar_id, body=event).execute()
+            created_event = await run_blocking(
+                GOOGLE_POOL, service.events().insert(calendarId=calendar_id, body=event).execute
             )
 
             return {
@@ -180,8 +198,13 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             Status message
         """
         try:
-            service = oauth_manager.build_calendar_service(account_id)
-            service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_calendar_service, account_id
+            )
+            await run_blocking(
+                GOOGLE_POOL,
+                service.events().delete(calendarId=calendar_id, eventId=event_id).execute,
+            )
             return {"status": "deleted", "event_id": event_id}
         except Exception as e:
             raise RuntimeError(f"Failed to delete calendar event: {str(e)}")
@@ -213,10 +236,14 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             Updated event details
         """
         try:
-            service = oauth_manager.build_calendar_service(account_id)
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_calendar_service, account_id
+            )
 
             # Get existing event
-            event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+            event = await run_blocking(
+                GOOGLE_POOL, service.events().get(calendarId=calendar_id, eventId=event_id).execute
+            )
 
             # Update fields
             if summary:
@@ -230,10 +257,11 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             if location:
                 event["location"] = location
 
-            updated_event = (
+            updated_event = await run_blocking(
+                GOOGLE_POOL,
                 service.events()
                 .update(calendarId=calendar_id, eventId=event_id, body=event)
-                .execute()
+                .execute,
             )
 
             return {
@@ -255,7 +283,9 @@ def register_calendar_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             List of account IDs that have been authenticated
         """
         try:
-            accounts = oauth_manager.list_authenticated_accounts("calendar")
+            accounts = await run_blocking(
+                GOOGLE_POOL, oauth_manager.list_authenticated_accounts, "calendar"
+            )
             return accounts if accounts else ["No accounts authenticated yet"]
         except Exception as e:
             raise RuntimeError(f"Failed to list Calendar accounts: {str(e)}")
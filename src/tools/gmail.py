@@ -5,145 +5,470 @@ Inspired by:
 - https://github.com/taylorwilsdon/google_workspace_mcp
 """
 
-import base64
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 from email.mime.text import MIMEText
 from mcp.server.fastmcp import FastMCP
+from ..services.executor import GOOGLE_POOL, SQLITE_POOL, run_blocking
+from ..services.gmail_mirror import (
+    DEFAULT_INITIAL_SYNC_LIMIT,
+    GmailMirror,
+    batch_execute,
+    batch_get_messages,
+    get_gmail_mirror,
+)
+from ..services.gmail_mime import AttachmentFetcher, extract_body, list_attachments
 from ..services.oauth import GoogleOAuthManager
+from ..services.paging import decode_page_token, make_page
+from ..services.projection import budgeted
 
+MESSAGE_SOURCES = ("remote", "local")
 
-def register_gmail_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
-    """Register Gmail-related tools with the MCP server."""
+METADATA_HEADERS = ["Subject", "From", "Date"]
+
+
+def _get_header(headers: List[Dict[str, str]], name: str) -> str:
+    """Return the value of the first header matching name (case-insensitive)."""
+    name = name.lower()
+    return next((h["value"] for h in headers if h["name"].lower() == name), "")
+
+
+def _summarize_message(msg_detail: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the summary dict returned by the list/search tools."""
+    headers = msg_detail.get("payload", {}).get("headers", [])
+    return {
+        "id": msg_detail["id"],
+        "threadId": msg_detail["threadId"],
+        "subject": _get_header(headers, "subject"),
+        "from": _get_header(headers, "from"),
+        "date": _get_header(headers, "date"),
+        "snippet": msg_detail.get("snippet", ""),
+    }
+
+
+def _batch_get_metadata(service, message_ids: List[str]) -> List[Dict[str, Any]]:
+    """Fetch message summaries through Gmail's batch HTTP endpoint.
+
+    Only the Subject/From/Date headers are requested (format="metadata"), and
+    each sub-request is handled independently, so a single failing message is
+    reported inline instead of failing the whole list.
+
+    Args:
+        service: Gmail API service object
+        message_ids: Message IDs to fetch
+
+    Returns:
+        Message summaries in the same order as message_ids
+    """
+    results = batch_get_messages(
+        service, message_ids, format="metadata", metadataHeaders=METADATA_HEADERS
+    )
+
+    summaries = []
+    for msg_id in message_ids:
+        result = results.get(msg_id)
+        if result is None:
+            summaries.append({"id": msg_id, "error": "No response in batch"})
+        elif isinstance(result, Exception):
+            summaries.append({"id": msg_id, "error": str(result)})
+        else:
+            summaries.append(_summarize_message(result))
+    return summaries
+
+
+def _summarize_thread(thread: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a one-entry-per-conversation summary from a threads.get response."""
+    messages = thread.get("messages", [])
+    first_headers = messages[0].get("payload", {}).get("headers", []) if messages else []
+    latest = _summarize_message(messages[-1]) if messages else {"id": None}
+    participants = [
+        _get_header(m.get("payload", {}).get("headers", []), "from") for m in messages
+    ]
+    return {
+        "threadId": thread["id"],
+        "id": latest["id"],
+        "subject": _get_header(first_headers, "subject"),
+        "from": latest.get("from", ""),
+        "date": latest.get("date", ""),
+        "snippet": latest.get("snippet", ""),
+        "message_count": len(messages),
+        "participants": list(dict.fromkeys(p for p in participants if p)),
+    }
+
+
+def _batch_get_thread_summaries(service, thread_ids: List[str]) -> List[Dict[str, Any]]:
+    """Fetch thread summaries with one batched threads.get per thread."""
+    threads = service.users().threads()
+    results = batch_execute(
+        service,
+        {
+            thread_id: threads.get(
+                userId="me", id=thread_id, format="metadata", metadataHeaders=METADATA_HEADERS
+            )
+            for thread_id in thread_ids
+        },
+    )
+
+    summaries = []
+    for thread_id in thread_ids:
+        result = results.get(thread_id)
+        if result is None:
+            summaries.append({"threadId": thread_id, "error": "No response in batch"})
+        elif isinstance(result, Exception):
+            summaries.append({"threadId": thread_id, "error": str(result)})
+        else:
+            summaries.append(_summarize_thread(result))
+    return summaries
+
+
+def _attachment_fetcher(service, message_id: str) -> AttachmentFetcher:
+    """Return a callback that fetches one of the message's attachments on demand."""
+
+    def fetch_attachment(attachment_id: str) -> str:
+        # Gmail leaves large parts out of format="full"; fetch them on demand
+        return (
+            service.users()
+            .messages()
+            .attachments()
+            .get(userId="me", messageId=message_id, id=attachment_id)
+            .execute()["data"]
+        )
+
+    return fetch_attachment
+
+
+def _format_message(
+    message: Dict[str, Any],
+    max_body_bytes: Optional[int] = None,
+    fetch_attachment: Optional[AttachmentFetcher] = None,
+    strip_quotes: bool = False,
+) -> Dict[str, Any]:
+    """Convert a messages.get(format="full") response into the tool output."""
+    # Extract headers
+    payload = message.get("payload", {})
+    headers = payload.get("headers", [])
+    subject = _get_header(headers, "subject")
+    from_email = _get_header(headers, "from")
+    to_email = _get_header(headers, "to")
+    date = _get_header(headers, "date")
+
+    # Extract body from the nested MIME tree, preferring text/plain over HTML
+    body = extract_body(payload, max_body_bytes, fetch_attachment, strip_quotes)
+
+    return {
+        "id": message["id"],
+        "threadId": message["threadId"],
+        "subject": subject,
+        "from": from_email,
+        "to": to_email,
+        "date": date,
+        "body": body["body"],
+        "body_source": body["body_source"],
+        "body_bytes": body["body_bytes"],
+        "truncated": body["truncated"],
+        "snippet": message.get("snippet", ""),
+        "labelIds": message.get("labelIds", []),
+        "attachments": list_attachments(payload),
+    }
+
+
+def _format_thread(
+    thread_id: str,
+    messages: List[Dict[str, Any]],
+    max_body_bytes: Optional[int] = None,
+    strip_quotes: bool = True,
+    service=None,
+) -> Dict[str, Any]:
+    """Format a conversation, keeping only per-message fields that differ.
+
+    Args:
+        thread_id: Gmail thread ID
+        messages: Full messages of the thread, oldest first
+        max_body_bytes: Per-message body limit (optional)
+        strip_quotes: Drop quoted earlier messages from each reply
+        service: Gmail service used to fetch large body parts lazily (optional)
+
+    Returns:
+        Thread with subject, participants, message_count, and compact messages
+    """
+    formatted = [
+        _format_message(
+            message,
+            max_body_bytes,
+            _attachment_fetcher(service, message["id"]) if service is not None else None,
+            strip_quotes,
+        )
+        for message in messages
+    ]
+    thread_messages = []
+    for message in formatted:
+        entry = {
+            "id": message["id"],
+            "from": message["from"],
+            "to": message["to"],
+            "date": message["date"],
+            "body": message["body"],
+        }
+        if message["truncated"]:
+            entry["truncated"] = True
+        if message["attachments"]:
+            entry["attachments"] = message["attachments"]
+        thread_messages.append(entry)
+
+    return {
+        "threadId": thread_id,
+        "subject": formatted[0]["subject"] if formatted else "",
+        "participants": list(dict.fromkeys(m["from"] for m in formatted if m["from"])),
+        "message_count": len(formatted),
+        "messages": thread_messages,
+    }
+
+
+def _check_source(source: str) -> None:
+    """Validate the source argument accepted by the read tools."""
+    if source not in MESSAGE_SOURCES:
+        raise ValueError(f"source must be one of {MESSAGE_SOURCES}, got {source!r}")
+
+
+def register_gmail_tools(
+    mcp: FastMCP,
+    oauth_manager: GoogleOAuthManager,
+    data_dir: Path = Path(".data"),
+):
+    """Register Gmail-related tools with the MCP server.
+
+    Args:
+        mcp: FastMCP server instance
+        oauth_manager: OAuth manager used to build Gmail services
+        data_dir: Directory for the local Gmail mirror databases
+    """
+
+    async def _sync_mirror(
+        account_id: str, max_messages: int = DEFAULT_INITIAL_SYNC_LIMIT
+    ) -> Dict[str, Any]:
+        mirror = await run_blocking(SQLITE_POOL, get_gmail_mirror, data_dir, account_id)
+        service = await run_blocking(GOOGLE_POOL, oauth_manager.build_gmail_service, account_id)
+        return await run_blocking(GOOGLE_POOL, mirror.sync, service, max_messages)
+
+    async def _get_local_mirror(account_id: str) -> GmailMirror:
+        """Return the account's mirror, running the initial sync if it never ran."""
+        mirror = await run_blocking(SQLITE_POOL, get_gmail_mirror, data_dir, account_id)
+        if await run_blocking(SQLITE_POOL, getattr, mirror, "history_id") is None:
+            await _sync_mirror(account_id)
+        return mirror
 
     @mcp.tool()
+    @budgeted
     async def gmail_list_messages(
         account_id: str = "default",
         query: str = "",
         max_results: int = 10,
-    ) -> List[Dict[str, Any]]:
+        source: str = "remote",
+        collapse_threads: bool = False,
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """List Gmail messages with optional query.
 
         Args:
             account_id: Google account identifier (default: "default")
-            query: Gmail search query (e.g., "is:unread", "from:example@gmail.com")
-            max_results: Maximum number of messages to return (default: 10)
+            query: Gmail search query (e.g., "is:unread", "from:example@gmail.com").
+                With source="local" the query is matched as plain text against
+                subject, sender, and snippet.
+            max_results: Maximum number of messages per page (default: 10, range: 1-500)
+            source: "remote" to query Gmail, or "local" to answer from the local
+                mirror (see gmail_sync_mirror). If the account's mirror was never
+                synced, the first local call runs that initial sync against Gmail;
+                after that local reads make no network calls
+            collapse_threads: Return one entry per conversation instead of per
+                message, with message_count and participants (default: False)
+            page_token: next_page_token from a previous call to fetch the next page
 
         Returns:
-            List of message summaries with id, threadId, and snippet
+            Dict with items (message summaries with id, threadId, subject, from,
+            date, and snippet) and next_page_token (None on the last page)
         """
+        scope = "gmail_list_threads" if collapse_threads else "gmail_list_messages"
         try:
-            service = oauth_manager.build_gmail_service(account_id)
-            results = (
-                service.users()
-                .messages()
-                .list(userId="me", q=query, maxResults=max_results)
-                .execute()
-            )
-            messages = results.get("messages", [])
+            _check_source(source)
+            max_results = max(1, min(max_results, 500))
+            cursor = decode_page_token(f"{scope}:{source}", page_token)
 
-            # Fetch full message details
-            detailed_messages = []
-            for msg in messages:
-                msg_detail = (
-                    service.users().messages().get(userId="me", id=msg["id"]).execute()
+            if source == "local":
+                mirror = await _get_local_mirror(account_id)
+                list_local = mirror.list_threads if collapse_threads else mirror.list_messages
+                offset = cursor or 0
+                # Fetch one extra row to learn whether another page exists
+                items = await run_blocking(
+                    SQLITE_POOL, list_local, query, max_results + 1, offset
                 )
+                next_offset = offset + max_results if len(items) > max_results else None
+                return make_page(f"{scope}:{source}", items[:max_results], next_offset)
 
-                # Extract headers
-                headers = msg_detail.get("payload", {}).get("headers", [])
-                subject = next(
-                    (h["value"] for h in headers if h["name"].lower() == "subject"), ""
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_gmail_service, account_id
+            )
+            if collapse_threads:
+                results = await run_blocking(
+                    GOOGLE_POOL,
+                    service.users()
+                    .threads()
+                    .list(userId="me", q=query, maxResults=max_results, pageToken=cursor)
+                    .execute,
                 )
-                from_email = next(
-                    (h["value"] for h in headers if h["name"].lower() == "from"), ""
+                items = await run_blocking(
+                    GOOGLE_POOL,
+                    _batch_get_thread_summaries,
+                    service,
+                    [thread["id"] for thread in results.get("threads", [])],
                 )
-                date = next(
-                    (h["value"] for h in headers if h["name"].lower() == "date"), ""
+            else:
+                results = await run_blocking(
+                    GOOGLE_POOL,
+                    service.users()
+                    .messages()
+                    .list(userId="me", q=query, maxResults=max_results, pageToken=cursor)
+                    .execute,
                 )
-
-                detailed_messages.append(
-                    {
-                        "id": msg_detail["id"],
-                        "threadId": msg_detail["threadId"],
-                        "subject": subject,
-                        "from": from_email,
-                        "date": date,
-                        "snippet": msg_detail.get("snippet", ""),
-                    }
+                items = await run_blocking(
+                    GOOGLE_POOL,
+                    _batch_get_metadata,
+                    service,
+                    [msg["id"] for msg in results.get("messages", [])],
                 )
-
-            return detailed_messages
+            return make_page(f"{scope}:{source}", items, results.get("nextPageToken"))
         except Exception as e:
             raise RuntimeError(f"Failed to list Gmail messages: {str(e)}")
 
     @mcp.tool()
+    @budgeted
     async def gmail_get_message(
         message_id: str,
         account_id: str = "default",
+        source: str = "remote",
+        max_body_bytes: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Get full details of a specific Gmail message.
 
+        The body is taken from the first text/plain part anywhere in the MIME
+        tree, falling back to HTML converted to text, and decoded using each
+        part's declared charset.
+
         Args:
             message_id: Gmail message ID
             account_id: Google account identifier (default: "default")
+            source: "remote" to fetch from Gmail, or "local" to read the local mirror
+            max_body_bytes: Truncate the body to this many bytes (optional)
 
         Returns:
-            Full message details including body, headers, and attachments
+            Full message details including body, headers, and attachment metadata.
+            body_bytes is the full body size and truncated tells whether it was cut.
         """
         try:
-            service = oauth_manager.build_gmail_service(account_id)
-            message = (
-                service.users().messages().get(userId="me", id=message_id, format="full").execute()
+            _check_source(source)
+            if source == "local":
+                mirror = await _get_local_mirror(account_id)
+                message = await run_blocking(SQLITE_POOL, mirror.get_message, message_id)
+                if message is None:
+                    raise ValueError(
+                        f"Message {message_id} is not in the local mirror; "
+                        "run gmail_sync_mirror or use source='remote'"
+                    )
+                return await run_blocking(SQLITE_POOL, _format_message, message, max_body_bytes)
+
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_gmail_service, account_id
+            )
+            message = await run_blocking(
+                GOOGLE_POOL,
+                service.users()
+                .messages()
+                .get(userId="me", id=message_id, format="full")
+                .execute,
             )
 
-            # Extract headers
-            headers = message.get("payload", {}).get("headers", [])
-            subject = next((h["value"] for h in headers if h["name"].lower() == "subject"), "")
-            from_email = next((h["value"] for h in headers if h["name"].lower() == "from"), "")
-            to_email = next((h["value"] for h in headers if h["name"].lower() == "to"), "")
-            date = next((h["value"] for h in headers if h["name"].lower() == "date"), "")
-
-            # Extract body
-            body = ""
-            if "parts" in message["payload"]:
-                for part in message["payload"]["parts"]:
-                    if part["mimeType"] == "text/plain":
-                        body_data = part["body"].get("data", "")
-                        body = base64.urlsafe_b64decode(body_data).decode("utf-8")
-                        break
-            else:
-                body_data = message["payload"]["body"].get("data", "")
-                if body_data:
-                    body = base64.urlsafe_b64decode(body_data).decode("utf-8")
-
-            return {
-                "id": message["id"],
-                "threadId": message["threadId"],
-                "subject": subject,
-                "from": from_email,
-                "to": to_email,
-                "date": date,
-                "body": body,
-                "snippet": message.get("snippet", ""),
-                "labelIds": message.get("labelIds", []),
-            }
+            return await run_blocking(
+                GOOGLE_POOL,
+                _format_message,
+                message,
+                max_body_bytes,
+                _attachment_fetcher(service, message_id),
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to get Gmail message: {str(e)}")
 
     @mcp.tool()
+    @budgeted
+    async def gmail_get_thread(
+        thread_id: str,
+        account_id: str = "default",
+        source: str = "remote",
+        max_body_bytes: Optional[int] = None,
+        strip_quotes: bool = True,
+    ) -> Dict[str, Any]:
+        """Get a whole email conversation in one call.
+
+        Args:
+            thread_id: Gmail thread ID (threadId from list/search results)
+            account_id: Google account identifier (default: "default")
+            source: "remote" to fetch from Gmail, or "local" to read the local mirror
+            max_body_bytes: Truncate each message body to this many bytes (optional)
+            strip_quotes: Remove quoted text of earlier messages from replies (default: True)
+
+        Returns:
+            Thread with subject, participants, message_count, and messages
+            (id, from, to, date, body) in chronological order
+        """
+        try:
+            _check_source(source)
+            if source == "local":
+                mirror = await _get_local_mirror(account_id)
+                messages = await run_blocking(SQLITE_POOL, mirror.get_thread_messages, thread_id)
+                if not messages:
+                    raise ValueError(
+                        f"Thread {thread_id} is not in the local mirror; "
+                        "run gmail_sync_mirror or use source='remote'"
+                    )
+                return await run_blocking(
+                    SQLITE_POOL, _format_thread, thread_id, messages, max_body_bytes, strip_quotes
+                )
+
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_gmail_service, account_id
+            )
+            thread = await run_blocking(
+                GOOGLE_POOL,
+                service.users().threads().get(userId="me", id=thread_id, format="full").execute,
+            )
+            return await run_blocking(
+                GOOGLE_POOL,
+                _format_thread,
+                thread_id,
+                thread.get("messages", []),
+                max_body_bytes,
+                strip_quotes,
+                service,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to get Gmail thread: {str(e)}")
+
+    @mcp.tool()
+    @budgeted
     async def gmail_search(
         query: str,
         account_id: str = "default",
         max_results: int = 20,
-    ) -> List[Dict[str, Any]]:
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Search Gmail messages using advanced Gmail search syntax.
 
         Args:
             query: Gmail search query (e.g., "from:john@example.com subject:meeting")
             account_id: Google account identifier (default: "default")
-            max_results: Maximum number of results (default: 20)
+            max_results: Maximum number of results per page (default: 20, range: 1-500)
+            page_token: next_page_token from a previous call to fetch the next page
 
         Returns:
-            List of matching messages
+            Dict with items (matching messages) and next_page_token
 
         Examples:
             - "is:unread" - Unread messages
@@ -151,7 +476,66 @@ def register_gmail_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             - "subject:invoice after:2024/01/01" - Messages with subject containing "invoice" after date
             - "has:attachment larger:5M" - Messages with attachments larger than 5MB
         """
-        return await gmail_list_messages(account_id, query, max_results)
+        return await gmail_list_messages(
+            account_id, query, max_results, page_token=page_token
+        )
+
+    @mcp.tool()
+    @budgeted
+    async def gmail_fulltext_search(
+        query: str,
+        account_id: str = "default",
+        max_results: int = 20,
+        refresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Ranked full-text search over the local Gmail mirror.
+
+        Searches subject, sender, recipients, and message body, ranking results
+        by relevance (BM25) and returning a snippet around each match. Runs
+        entirely locally; the mirror is synced first if it has never been.
+
+        Args:
+            query: Search query. Bare words must all match; use "quoted text" for
+                phrases, a trailing * for prefixes (e.g., invoic*), OR / NOT to
+                combine terms, and subject: / sender: / recipients: / body: to
+                restrict a term to one field.
+            account_id: Google account identifier (default: "default")
+            max_results: Maximum number of results (default: 20, range: 1-500)
+            refresh: Run an incremental mirror sync before searching (default: False)
+
+        Returns:
+            Matching messages with id, threadId, subject, from, date, score, and snippet
+        """
+        try:
+            if refresh:
+                await _sync_mirror(account_id)
+            max_results = max(1, min(max_results, 500))
+            mirror = await _get_local_mirror(account_id)
+            return await run_blocking(SQLITE_POOL, mirror.search, query, max_results)
+        except Exception as e:
+            raise RuntimeError(f"Failed to search Gmail mirror: {str(e)}")
+
+    @mcp.tool()
+    async def gmail_sync_mirror(
+        account_id: str = "default",
+        max_messages: int = DEFAULT_INITIAL_SYNC_LIMIT,
+    ) -> Dict[str, Any]:
+        """Sync the local Gmail mirror used by source="local" reads.
+
+        The first sync downloads the most recent messages; later syncs fetch only
+        the changes since the previous one via the Gmail History API.
+
+        Args:
+            account_id: Google account identifier (default: "default")
+            max_messages: Number of recent messages to download on a full sync (default: 500)
+
+        Returns:
+            Sync statistics: mode (full/incremental), added, deleted, updated, failed, history_id
+        """
+        try:
+            return await _sync_mirror(account_id, max_messages)
+        except Exception as e:
+            raise RuntimeError(f"Failed to sync Gmail mirror: {str(e)}")
 
     @mcp.tool()
     async def gmail_list_labels(account_id: str = "default") -> List[Dict[str, str]]:
@@ -164,8 +548,12 @@ def register_gmail_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             List of labels with id and name
         """
         try:
-            service = oauth_manager.build_gmail_service(account_id)
-            results = service.users().labels().list(userId="me").execute()
+            service = await run_blocking(
+                GOOGLE_POOL, oauth_manager.build_gmail_service, account_id
+            )
+            results = await run_blocking(
+                GOOGLE_POOL, service.users().labels().list(userId="me").execute
+            )
             labels = results.get("labels", [])
             return [{"id": label["id"], "name": label["name"]} for label in labels]
         except Exception as e:
@@ -179,7 +567,9 @@ def register_gmail_tools(mcp: FastMCP, oauth_manager: GoogleOAuthManager):
             List of account IDs that have been authenticated
         """
         try:
-            accounts = oauth_manager.list_authenticated_accounts("gmail")
+            accounts = await run_blocking(
+                GOOGLE_POOL, oauth_manager.list_authenticated_accounts, "gmail"
+            )
             return accounts if accounts else ["No accounts authenticated yet"]
         except Exception as e:
             raise RuntimeError(f"Failed to list Gmail accounts: {str(e)}")
@@ -8,11 +8,20 @@ Note: Requires macOS and Full Disk Access permission for the application.
 
 import sqlite3
 import platform
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from mcp.server.fastmcp import FastMCP
 
+from ..services.addressbook import get_contact_resolver, handle_keys
+from ..services.apple_time import format_apple_timestamp, format_apple_timestamps
+from ..services.executor import SQLITE_POOL, run_blocking
+from ..services.imessage_contacts import get_contact_summary
+from ..services.imessage_index import get_imessage_index
+from ..services.paging import decode_page_token, make_page
+from ..services.projection import budgeted
+from ..services.sqlite_pool import ReadOnlyConnectionPool, get_readonly_pool
+from ..services.typedstream import message_text
+
 
 def _is_macos() -> bool:
     """Check if running on macOS."""
@@ -24,6 +33,11 @@ def _get_messages_db_path() -> Path:
     return Path.home() / "Library" / "Messages" / "chat.db"
 
 
+def _get_db_pool() -> ReadOnlyConnectionPool:
+    """Get the shared read-only connection pool for the Messages database."""
+    return get_readonly_pool(_get_messages_db_path())
+
+
 def _check_db_access() -> tuple[bool, Optional[str]]:
     """Check if the Messages database is accessible.
 
@@ -39,9 +53,8 @@ def _check_db_access() -> tuple[bool, Optional[str]]:
         return False, f"Messages database not found at {db_path}"
 
     try:
-        # Try to open the database in read-only mode
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.close()
+        # Opening this thread's pooled read-only connection proves access
+        _get_db_pool().connection()
         return True, None
     except sqlite3.OperationalError as e:
         if "unable to open database file" in str(e).lower():
@@ -55,31 +68,8 @@ def _check_db_access() -> tuple[bool, Optional[str]]:
         return False, f"Unexpected error accessing database: {str(e)}"
 
 
-def _convert_apple_timestamp(timestamp: int) -> str:
-    """Convert Apple's timestamp (seconds since 2001-01-01) to readable format.
-
-    Args:
-        timestamp: Apple timestamp in nanoseconds
-
-    Returns:
-        ISO format datetime string
-    """
-    if timestamp == 0:
-        return "Unknown"
-
-    # Convert nanoseconds to seconds and adjust for Apple epoch (2001-01-01)
-    apple_epoch = datetime(2001, 1, 1)
-    actual_seconds = timestamp / 1_000_000_000  # Convert nanoseconds to seconds
-
-    try:
-        dt = apple_epoch + timedelta(seconds=actual_seconds)
-        return dt.isoformat()
-    except (ValueError, OverflowError):
-        return "Invalid date"
-
-
 def _execute_query(query: str, params: tuple = ()) -> List[tuple]:
-    """Execute a query on the Messages database.
+    """Execute a query on the Messages database using the pooled connection.
 
     Args:
         query: SQL query to execute
@@ -91,28 +81,190 @@ def _execute_query(query: str, params: tuple = ()) -> List[tuple]:
     Raises:
         RuntimeError: If database access fails
     """
-    accessible, error = _check_db_access()
-    if not accessible:
-        raise RuntimeError(error)
-
-    db_path = _get_messages_db_path()
-
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
-        return results
-    except Exception as e:
+        return _get_db_pool().execute(query, params)
+    except sqlite3.Error as e:
+        # Only diagnose access problems once a query has actually failed
+        accessible, error = _check_db_access()
+        if not accessible:
+            raise RuntimeError(error)
         raise RuntimeError(f"Database query failed: {str(e)}")
 
 
-def register_imessage_tools(mcp: FastMCP):
+# Most recent conversations, one row per chat.
+#
+# Every lookup is an index seek on chat_message_join (chat_id, message_date,
+# message_id): MAX(message_date) per chat, then the last message and message
+# count for only the LIMIT chats that survive. The window function breaks ties
+# between messages that share the latest timestamp.
+_RECENT_CONVERSATIONS_QUERY = """
+WITH recent AS (
+    SELECT chat_id, last_date
+    FROM (
+        SELECT
+            c.ROWID AS chat_id,
+            (SELECT MAX(message_date) FROM chat_message_join WHERE chat_id = c.ROWID)
+                AS last_date
+        FROM chat c
+    )
+    WHERE last_date IS NOT NULL
+    ORDER BY last_date DESC
+    LIMIT ?
+),
+latest AS (
+    SELECT
+        cmj.chat_id,
+        cmj.message_id,
+        ROW_NUMBER() OVER (
+            PARTITION BY cmj.chat_id ORDER BY cmj.message_id DESC
+        ) AS rn
+    FROM recent r
+    JOIN chat_message_join cmj
+        ON cmj.chat_id = r.chat_id AND cmj.message_date = r.last_date
+)
+SELECT
+    c.ROWID,
+    c.chat_identifier,
+    c.display_name,
+    (SELECT group_concat(h.id, ', ')
+     FROM chat_handle_join chj
+     JOIN handle h ON h.ROWID = chj.handle_id
+     WHERE chj.chat_id = c.ROWID) AS participants,
+    r.last_date,
+    m.ROWID,
+    m.text,
+    m.attributedBody,
+    m.is_from_me,
+    (SELECT COUNT(*) FROM chat_message_join WHERE chat_id = c.ROWID) AS message_count
+FROM recent r
+JOIN latest l ON l.chat_id = r.chat_id AND l.rn = 1
+JOIN chat c ON c.ROWID = r.chat_id
+JOIN message m ON m.ROWID = l.message_id
+ORDER BY r.last_date DESC
+"""
+
+
+# Chats ordered by last activity, paged by keyset on (last_date, ROWID)
+_LIST_CHATS_QUERY = """
+SELECT
+    chat_id,
+    chat_identifier,
+    display_name,
+    style,
+    service_name,
+    last_date,
+    (SELECT group_concat(h.id, ', ')
+     FROM chat_handle_join chj
+     JOIN handle h ON h.ROWID = chj.handle_id
+     WHERE chj.chat_id = d.chat_id) AS participants
+FROM (
+    SELECT
+        c.ROWID AS chat_id,
+        c.chat_identifier,
+        c.display_name,
+        c.style,
+        c.service_name,
+        (SELECT MAX(message_date) FROM chat_message_join WHERE chat_id = c.ROWID)
+            AS last_date
+    FROM chat c
+) d
+WHERE last_date IS NOT NULL
+AND (? IS NULL OR (last_date, chat_id) < (?, ?))
+ORDER BY last_date DESC, chat_id DESC
+LIMIT ?
+"""
+
+# One page of a chat, newest first. Pages after the first are strictly older
+# than the (date, ROWID) cursor, which SQLite turns into a range seek on the
+# chat_message_join (chat_id, message_date, message_id) index, so deep pages
+# cost the same as the first one.
+_READ_CHAT_QUERY = """
+SELECT
+    m.ROWID,
+    m.text,
+    m.attributedBody,
+    cmj.message_date,
+    m.is_from_me,
+    h.id,
+    m.cache_has_attachments
+FROM chat_message_join cmj
+JOIN message m ON m.ROWID = cmj.message_id
+LEFT JOIN handle h ON h.ROWID = m.handle_id
+WHERE cmj.chat_id = ?
+{cursor_filter}
+ORDER BY cmj.message_date DESC, cmj.message_id DESC
+LIMIT ?
+"""
+_READ_CHAT_FIRST_PAGE_QUERY = _READ_CHAT_QUERY.format(cursor_filter="")
+_READ_CHAT_NEXT_PAGE_QUERY = _READ_CHAT_QUERY.format(
+    cursor_filter="AND (cmj.message_date, cmj.message_id) < (?, ?)"
+)
+
+# Apple's chat.style for group conversations (1:1 chats use 45)
+_GROUP_CHAT_STYLE = 43
+
+
+def register_imessage_tools(
+    mcp: FastMCP,
+    data_dir: Path = Path(".data"),
+    addressbook_dir: Optional[Path] = None,
+):
     """Register iMessage-related tools with the MCP server.
 
     Note: These tools only work on macOS and require Full Disk Access permission.
+
+    Args:
+        mcp: FastMCP server instance
+        data_dir: Directory for the local search index and contact summary
+        addressbook_dir: Directory holding the Contacts databases used to show
+            names (default: ~/Library/Application Support/AddressBook)
     """
+    resolver = get_contact_resolver(addressbook_dir)
+
+    def _names(handles: List[Optional[str]]) -> Dict[str, Optional[str]]:
+        """Resolve handle IDs to Contacts display names."""
+        unique = list({handle for handle in handles if handle})
+        return dict(zip(unique, resolver.names_for(unique)))
+
+    def _match_handles(contact: str) -> tuple[List[tuple[int, str]], List[str]]:
+        """Find the handles of a contact given by name, phone number, or email.
+
+        Returns:
+            Tuple of (matching (ROWID, handle ID) pairs, similar handle IDs to
+            suggest when nothing matches)
+        """
+        keys = resolver.keys_for(contact)
+        handles = _execute_query("SELECT ROWID, id FROM handle", ())
+        matches = [
+            (rowid, handle_id) for rowid, handle_id in handles
+            if handle_id == contact or keys.intersection(handle_keys(handle_id))
+        ]
+        if matches:
+            return matches, []
+        # Partial numbers and addresses, e.g. the last digits of a phone number
+        fragments = [key for key in keys if len(key) >= 3] or [contact.lower()]
+        similar = [
+            handle_id for _, handle_id in handles
+            if any(fragment in handle_id.lower() for fragment in fragments)
+        ]
+        return [], similar[:5]
+
+    def _search_index(query: str, limit: int, contact: Optional[str]) -> List[Dict[str, Any]]:
+        """Bring the sidecar index up to date with chat.db, then search it."""
+        index = get_imessage_index(data_dir, _execute_query)
+        index.refresh()
+        contacts = None
+        if contact:
+            # The identifier as given (e.g. a chat) plus every handle it resolves to
+            handles, _ = _match_handles(contact)
+            contacts = [contact] + [handle_id for _, handle_id in handles]
+        return index.search(query, limit, contacts)
+
+    def _contact_page(limit: int, cursor: Optional[tuple]) -> List[Dict[str, Any]]:
+        """Bring the sidecar contact summary up to date with chat.db, then page it."""
+        summary = get_contact_summary(data_dir, _execute_query)
+        summary.refresh()
+        return summary.page(limit, cursor)
 
     @mcp.tool()
     async def imessage_check_availability() -> Dict[str, Any]:
@@ -121,12 +273,13 @@ def register_imessage_tools(mcp: FastMCP):
         Returns:
             Availability status, platform info, and setup instructions
         """
-        accessible, error = _check_db_access()
+        accessible, error = await run_blocking(SQLITE_POOL, _check_db_access)
 
         return {
             "available": accessible,
             "platform": platform.system(),
             "database_path": str(_get_messages_db_path()),
+            "contacts_available": await run_blocking(SQLITE_POOL, lambda: resolver.available),
             "error": error if not accessible else None,
             "requirements": [
                 "macOS operating system",
@@ -143,42 +296,59 @@ def register_imessage_tools(mcp: FastMCP):
         }
 
     @mcp.tool()
+    @budgeted
     async def imessage_list_recent_conversations(limit: int = 20) -> List[Dict[str, Any]]:
-        """List recent iMessage conversations with last message info.
+        """List recent iMessage conversations (1:1 and group chats) with last message info.
 
         Args:
             limit: Maximum number of conversations to return (default: 20, max: 100)
 
         Returns:
-            List of recent conversations with contact, last message, and timestamp
+            List of recent conversations with chat ID, contact, participants
+            (with their Contacts names where known), last message, and timestamp
         """
         limit = min(limit, 100)  # Cap at 100 for performance
 
         try:
-            query = """
-            SELECT
-                h.id as contact,
-                MAX(m.date) as last_date,
-                (SELECT text FROM message
-                 WHERE handle_id = h.ROWID
-                 ORDER BY date DESC LIMIT 1) as last_message,
-                COUNT(m.ROWID) as message_count
-            FROM message m
-            JOIN handle h ON m.handle_id = h.ROWID
-            WHERE m.text IS NOT NULL
-            GROUP BY h.id
-            ORDER BY last_date DESC
-            LIMIT ?
-            """
-
-            results = _execute_query(query, (limit,))
+            results = await run_blocking(
+                SQLITE_POOL, _execute_query, _RECENT_CONVERSATIONS_QUERY, (limit,)
+            )
+            names = await run_blocking(
+                SQLITE_POOL,
+                _names,
+                [row[1] for row in results]
+                + [handle for row in results if row[3] for handle in row[3].split(", ")],
+            )
 
             conversations = []
-            for contact, last_date, last_message, msg_count in results:
+            for (
+                chat_id,
+                chat_identifier,
+                display_name,
+                participants,
+                last_date,
+                message_id,
+                text,
+                attributed_body,
+                is_from_me,
+                msg_count,
+            ) in results:
+                last_message = message_text(message_id, text, attributed_body)
+                participants = participants.split(", ") if participants else []
                 conversations.append({
-                    "contact": contact,
-                    "last_message": last_message[:100] + "..." if last_message and len(last_message) > 100 else last_message,
-                    "last_message_date": _convert_apple_timestamp(last_date),
+                    "chat_id": chat_id,
+                    "contact": chat_identifier,
+                    "contact_name": names.get(chat_identifier),
+                    "display_name": display_name or None,
+                    "participants": participants,
+                    "participant_names": [names.get(handle) for handle in participants],
+                    "last_message": (
+                        last_message[:100] + "..."
+                        if last_message and len(last_message) > 100
+                        else last_message
+                    ),
+                    "last_message_from_me": bool(is_from_me),
+                    "last_message_date": format_apple_timestamp(last_date),
                     "total_messages": msg_count,
                 })
 
@@ -190,15 +360,167 @@ def register_imessage_tools(mcp: FastMCP):
             return [{"error": f"Failed to list conversations: {str(e)}"}]
 
     @mcp.tool()
+    @budgeted
+    async def imessage_list_chats(
+        limit: int = 50,
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """List iMessage/SMS chats (1:1 and group), most recently active first.
+
+        Use the chat_id with imessage_read_chat to read a whole conversation,
+        including group chats.
+
+        Args:
+            limit: Maximum number of chats per page (default: 50, max: 200)
+            page_token: Token from a previous call's next_page_token
+
+        Returns:
+            Dict with items (chat_id, contact, contact_name, display_name,
+            is_group, participants, participant_names, service,
+            last_message_date) and next_page_token
+        """
+        limit = min(limit, 200)  # Cap at 200 for performance
+
+        try:
+            cursor = decode_page_token("imessage_list_chats", page_token)
+            last_date, last_chat_id = cursor if cursor else (None, None)
+            results = await run_blocking(
+                SQLITE_POOL,
+                _execute_query,
+                _LIST_CHATS_QUERY,
+                (last_date, last_date, last_chat_id, limit),
+            )
+            names = await run_blocking(
+                SQLITE_POOL,
+                _names,
+                [row[1] for row in results]
+                + [handle for row in results if row[6] for handle in row[6].split(", ")],
+            )
+
+            dates = format_apple_timestamps(row[5] for row in results)
+            chats = []
+            for (
+                chat_id,
+                chat_identifier,
+                display_name,
+                style,
+                service_name,
+                _,
+                participants,
+            ), last_date in zip(results, dates):
+                participants = participants.split(", ") if participants else []
+                chats.append({
+                    "chat_id": chat_id,
+                    "contact": chat_identifier,
+                    "contact_name": names.get(chat_identifier),
+                    "display_name": display_name or None,
+                    "is_group": style == _GROUP_CHAT_STYLE,
+                    "participants": participants,
+                    "participant_names": [names.get(handle) for handle in participants],
+                    "service": service_name,
+                    "last_message_date": last_date,
+                })
+
+            next_cursor = [results[-1][5], results[-1][0]] if len(results) == limit else None
+            return make_page("imessage_list_chats", chats, next_cursor)
+
+        except (RuntimeError, ValueError) as e:
+            return {"error": str(e)}
+        except Exception as e:
+            return {"error": f"Failed to list chats: {str(e)}"}
+
+    @mcp.tool()
+    @budgeted
+    async def imessage_read_chat(
+        chat_id: int,
+        before_rowid: Optional[int] = None,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """Read messages from one chat (1:1 or group), paging back through history.
+
+        Args:
+            chat_id: Chat ID from imessage_list_chats or imessage_list_recent_conversations
+            before_rowid: Only return messages older than this message_id; pass the
+                previous call's next_before_rowid to get the next (older) page
+            limit: Maximum number of messages to return (default: 50, max: 200)
+
+        Returns:
+            Dict with chat_id, items (messages oldest first, with message_id,
+            text, date, and sender handle and Contacts name) and next_before_rowid (None when the
+            start of the chat has been reached)
+        """
+        limit = min(limit, 200)  # Cap at 200 for performance
+
+        try:
+            query, params = _READ_CHAT_FIRST_PAGE_QUERY, (chat_id, limit)
+            if before_rowid is not None:
+                cursor_rows = await run_blocking(
+                    SQLITE_POOL,
+                    _execute_query,
+                    "SELECT message_date FROM chat_message_join "
+                    "WHERE chat_id = ? AND message_id = ?",
+                    (chat_id, before_rowid),
+                )
+                if not cursor_rows:
+                    return {"error": f"Message {before_rowid} is not in chat {chat_id}"}
+                query = _READ_CHAT_NEXT_PAGE_QUERY
+                params = (chat_id, cursor_rows[0][0], before_rowid, limit)
+
+            results = await run_blocking(SQLITE_POOL, _execute_query, query, params)
+            names = await run_blocking(SQLITE_POOL, _names, [row[5] for row in results])
+
+            dates = format_apple_timestamps(row[3] for row in results)
+            messages = []
+            for (
+                message_id,
+                text,
+                attributed_body,
+                _,
+                is_from_me,
+                sender,
+                has_attachments,
+            ), date in zip(results, dates):
+                messages.append({
+                    "message_id": message_id,
+                    "text": message_text(message_id, text, attributed_body),
+                    "date": date,
+                    "from": "me" if is_from_me else sender,
+                    "from_name": None if is_from_me else names.get(sender),
+                    "is_from_me": bool(is_from_me),
+                    "has_attachments": bool(has_attachments),
+                })
+
+            # Return in chronological order (oldest first)
+            messages.reverse()
+
+            return {
+                "chat_id": chat_id,
+                "items": messages,
+                "next_before_rowid": messages[0]["message_id"] if len(messages) == limit else None,
+            }
+
+        except RuntimeError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            return {"error": f"Failed to read chat: {str(e)}"}
+
+    @mcp.tool()
+    @budgeted
     async def imessage_read_messages(
         contact: str,
         limit: int = 50,
+        before_rowid: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Read recent messages from a specific contact or phone number.
+        """Read recent messages from a specific contact, phone number, or email.
+
+        For group chats, use imessage_read_chat instead.
 
         Args:
-            contact: Contact phone number (e.g., +15551234567) or email
+            contact: Contact name as shown in Contacts (e.g., Jane Appleseed),
+                phone number in any format (e.g., +15551234567), or email
             limit: Maximum number of messages to return (default: 50, max: 200)
+            before_rowid: Only return messages older than this message_id; pass the
+                message_id of the oldest message already read to page back
 
         Returns:
             List of messages with text, timestamp, and sender info
@@ -206,51 +528,85 @@ def register_imessage_tools(mcp: FastMCP):
         limit = min(limit, 200)  # Cap at 200 for performance
 
         try:
-            query = """
+            # Every handle of the contact: a person can have several numbers
+            # and emails, and each service (iMessage, SMS) has its own handle
+            handles, similar = await run_blocking(SQLITE_POOL, _match_handles, contact)
+            handle_rowids = [rowid for rowid, _ in handles]
+
+            cursor_filter, cursor_params = "", ()
+            if before_rowid is not None:
+                # Keyset on (date, ROWID): message_idx_handle is (handle_id, date)
+                # plus the implicit ROWID, so older pages are a range seek
+                cursor_filter = (
+                    "AND (m.date, m.ROWID) < "
+                    "((SELECT date FROM message WHERE ROWID = ?), ?)"
+                )
+                cursor_params = (before_rowid, before_rowid)
+
+            handle_placeholders = ", ".join("?" * len(handle_rowids))
+            query = f"""
             SELECT
+                m.ROWID,
                 m.text,
+                m.attributedBody,
                 m.date,
                 m.is_from_me,
                 h.id as contact_id,
                 m.cache_has_attachments
             FROM message m
             JOIN handle h ON m.handle_id = h.ROWID
-            WHERE h.id = ?
-            AND m.text IS NOT NULL
-            ORDER BY m.date DESC
+            WHERE m.handle_id IN ({handle_placeholders})
+            AND (m.text IS NOT NULL OR m.attributedBody IS NOT NULL)
+            {cursor_filter}
+            ORDER BY m.date DESC, m.ROWID DESC
             LIMIT ?
             """
 
-            results = _execute_query(query, (contact, limit))
+            results = []
+            if handle_rowids:
+                params = (*handle_rowids, *cursor_params, limit)
+                results = await run_blocking(SQLITE_POOL, _execute_query, query, params)
+
+            if not results and before_rowid is not None:
+                return []
 
             if not results:
-                # Try to find similar contacts
-                search_query = """
-                SELECT DISTINCT h.id
-                FROM handle h
-                WHERE h.id LIKE ?
-                LIMIT 5
-                """
-                similar = _execute_query(search_query, (f"%{contact}%",))
-
-                if similar:
+                similar_names = await run_blocking(SQLITE_POOL, resolver.search, contact)
+                if similar or similar_names:
                     return [{
                         "error": f"No messages found for '{contact}'",
                         "suggestion": "Try one of these contacts:",
-                        "similar_contacts": [s[0] for s in similar]
+                        "similar_contacts": similar,
+                        "similar_names": similar_names,
                     }]
                 else:
                     return [{
                         "error": f"No messages found for '{contact}'",
-                        "note": "Make sure to use the full phone number (e.g., +15551234567) or email address"
+                        "note": (
+                            "Use a name from Contacts, the full phone number "
+                            "(e.g., +15551234567), or an email address"
+                        ),
                     }]
 
+            names = await run_blocking(SQLITE_POOL, _names, [row[5] for row in results])
+
+            dates = format_apple_timestamps(row[3] for row in results)
             messages = []
-            for text, date, is_from_me, contact_id, has_attachments in results:
+            for (
+                message_id,
+                text,
+                attributed_body,
+                _,
+                is_from_me,
+                contact_id,
+                has_attachments,
+            ), date in zip(results, dates):
                 messages.append({
-                    "text": text,
-                    "date": _convert_apple_timestamp(date),
+                    "message_id": message_id,
+                    "text": message_text(message_id, text, attributed_body),
+                    "date": date,
                     "from": "me" if is_from_me else contact_id,
+                    "from_name": None if is_from_me else names.get(contact_id),
                     "is_from_me": bool(is_from_me),
                     "has_attachments": bool(has_attachments),
                 })
@@ -266,55 +622,34 @@ def register_imessage_tools(mcp: FastMCP):
             return [{"error": f"Failed to read messages: {str(e)}"}]
 
     @mcp.tool()
+    @budgeted
     async def imessage_search_messages(
         query: str,
         limit: int = 50,
         contact: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Search for messages containing specific text.
+        """Search for messages containing specific text, most relevant first.
+
+        Uses a local full-text index that is brought up to date with new
+        messages before each search. Supports FTS5 syntax: "exact phrase",
+        prefix*, OR, NOT.
 
         Args:
             query: Search text to find in messages
             limit: Maximum number of results (default: 50, max: 200)
-            contact: Optional contact to limit search to specific conversation
+            contact: Optional contact name, phone number, email, or chat
+                identifier to limit the search to
 
         Returns:
-            List of matching messages with context
+            List of matching messages with a highlighted snippet and relevance score
         """
         limit = min(limit, 200)  # Cap at 200 for performance
 
         try:
-            if contact:
-                sql_query = """
-                SELECT
-                    m.text,
-                    m.date,
-                    m.is_from_me,
-                    h.id as contact_id
-                FROM message m
-                JOIN handle h ON m.handle_id = h.ROWID
-                WHERE h.id = ?
-                AND m.text LIKE ?
-                ORDER BY m.date DESC
-                LIMIT ?
-                """
-                params = (contact, f"%{query}%", limit)
-            else:
-                sql_query = """
-                SELECT
-                    m.text,
-                    m.date,
-                    m.is_from_me,
-                    h.id as contact_id
-                FROM message m
-                JOIN handle h ON m.handle_id = h.ROWID
-                WHERE m.text LIKE ?
-                ORDER BY m.date DESC
-                LIMIT ?
-                """
-                params = (f"%{query}%", limit)
-
-            results = _execute_query(sql_query, params)
+            results = await run_blocking(SQLITE_POOL, _search_index, query, limit, contact)
+            names = await run_blocking(
+                SQLITE_POOL, _names, [result["contact"] for result in results]
+            )
 
             if not results:
                 return [{
@@ -323,13 +658,18 @@ def register_imessage_tools(mcp: FastMCP):
                 }]
 
             messages = []
-            for text, date, is_from_me, contact_id in results:
+            for result in results:
                 messages.append({
-                    "text": text,
-                    "date": _convert_apple_timestamp(date),
-                    "contact": contact_id,
-                    "from": "me" if is_from_me else contact_id,
-                    "is_from_me": bool(is_from_me),
+                    "message_id": result["message_id"],
+                    "text": result["text"],
+                    "snippet": result["snippet"],
+                    "score": result["score"],
+                    "date": format_apple_timestamp(result["date"]),
+                    "contact": result["contact"],
+                    "contact_name": names.get(result["contact"]),
+                    "chat": result["chat"],
+                    "from": "me" if result["is_from_me"] else result["contact"],
+                    "is_from_me": result["is_from_me"],
                 })
 
             return messages
@@ -340,38 +680,56 @@ def register_imessage_tools(mcp: FastMCP):
             return [{"error": f"Failed to search messages: {str(e)}"}]
 
     @mcp.tool()
-    async def imessage_get_contact_list() -> List[Dict[str, Any]]:
-        """Get a list of all contacts you've messaged with.
+    @budgeted
+    async def imessage_get_contact_list(
+        limit: int = 100,
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get the contacts you've messaged with, most recently messaged first.
+
+        Args:
+            limit: Maximum number of contacts per page (default: 100, max: 500)
+            page_token: Token from a previous call's next_page_token
 
         Returns:
-            List of contacts with their identifiers (phone numbers or emails)
+            Dict with items (contact identifiers such as phone numbers or
+            emails, with their Contacts name, message_count, last_contact,
+            last_message, and last_message_from_me) and next_page_token
         """
-        try:
-            query = """
-            SELECT DISTINCT
-                h.id as contact,
-                COUNT(m.ROWID) as message_count,
-                MAX(m.date) as last_contact
-            FROM handle h
-            JOIN message m ON m.handle_id = h.ROWID
-            GROUP BY h.id
-            HAVING message_count > 0
-            ORDER BY last_contact DESC
-            """
+        limit = min(limit, 500)  # Cap at 500 for performance
 
-            results = _execute_query(query)
+        try:
+            cursor = decode_page_token("imessage_get_contact_list", page_token)
+            results = await run_blocking(
+                SQLITE_POOL, _contact_page, limit, tuple(cursor) if cursor else None
+            )
+            names = await run_blocking(
+                SQLITE_POOL, _names, [result["contact"] for result in results]
+            )
 
+            dates = format_apple_timestamps(result["last_date"] for result in results)
             contacts = []
-            for contact, msg_count, last_date in results:
+            for result, last_date in zip(results, dates):
+                last_message = result["last_text"]
                 contacts.append({
-                    "contact": contact,
-                    "message_count": msg_count,
-                    "last_contact": _convert_apple_timestamp(last_date),
+                    "contact": result["contact"],
+                    "name": names.get(result["contact"]),
+                    "message_count": result["message_count"],
+                    "last_contact": last_date,
+                    "last_message": (
+                        last_message[:100] + "..."
+                        if last_message and len(last_message) > 100
+                        else last_message
+                    ),
+                    "last_message_from_me": result["last_from_me"],
                 })
 
-            return contacts
+            next_cursor = None
+            if len(results) == limit:
+                next_cursor = [results[-1]["last_date"], results[-1]["contact"]]
+            return make_page("imessage_get_contact_list", contacts, next_cursor)
 
-        except RuntimeError as e:
-            return [{"error": str(e)}]
+        except (RuntimeError, ValueError) as e:
+            return {"error": str(e)}
         except Exception as e:
-            return [{"error": f"Failed to get contact list: {str(e)}"}]
+            return {"error": f"Failed to get contact list: {str(e)}"}
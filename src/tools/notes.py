@@ -6,15 +6,31 @@ This approach is more reliable than AppleScript and provides better functionalit
 Note: Requires macOS and Full Disk Access permission for the application.
 """
 
+import base64
 import sqlite3
 import platform
+import threading
+import time
 import gzip
 import re
-from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from mcp.server.fastmcp import FastMCP
 
+from ..services.apple_time import format_apple_timestamp, format_apple_timestamps
+from ..services.executor import SQLITE_POOL, run_blocking
+from ..services.lru import LRUCache
+from ..services.notes_attachments import NotesAttachments, get_notes_attachments
+from ..services.notes_export import DEFAULT_CHUNK_SIZE, export_notes
+from ..services.notes_index import get_notes_index
+from ..services.notestore import NoteDecodeError, decode_note, render_note
+from ..services.projection import budgeted
+from ..services.sqlite_pool import (
+    ReadOnlyConnectionPool,
+    get_readonly_pool,
+    modification_signature,
+)
+
 # Try to import BeautifulSoup, fall back to basic parsing if not available
 try:
     from bs4 import BeautifulSoup
@@ -33,6 +49,16 @@ def _get_notes_db_path() -> Path:
     return Path.home() / "Library" / "Group Containers" / "group.com.apple.notes" / "NoteStore.sqlite"
 
 
+def _get_db_pool() -> ReadOnlyConnectionPool:
+    """Get the shared read-only connection pool for the Notes database."""
+    return get_readonly_pool(_get_notes_db_path())
+
+
+def _get_attachments() -> NotesAttachments:
+    """Get the attachment lookup for the Notes database and its media files."""
+    return get_notes_attachments(_execute_query, _get_notes_db_path())
+
+
 def _check_db_access() -> tuple[bool, Optional[str]]:
     """Check if the Notes database is accessible.
 
@@ -48,9 +74,8 @@ def _check_db_access() -> tuple[bool, Optional[str]]:
         return False, f"Notes database not found at {db_path}"
 
     try:
-        # Try to open the database in read-only mode
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.close()
+        # Opening this thread's pooled read-only connection proves access
+        _get_db_pool().connection()
         return True, None
     except sqlite3.OperationalError as e:
         if "unable to open database file" in str(e).lower():
@@ -64,25 +89,14 @@ def _check_db_access() -> tuple[bool, Optional[str]]:
         return False, f"Unexpected error accessing database: {str(e)}"
 
 
-def _convert_apple_timestamp(timestamp: float) -> str:
-    """Convert Apple's Core Data timestamp to readable format.
-
-    Args:
-        timestamp: Apple timestamp in seconds since 2001-01-01
-
-    Returns:
-        ISO format datetime string
-    """
-    if timestamp == 0 or timestamp is None:
-        return "Unknown"
-
-    try:
-        # Apple Core Data epoch is 2001-01-01
-        apple_epoch = datetime(2001, 1, 1)
-        dt = apple_epoch + timedelta(seconds=timestamp)
-        return dt.isoformat()
-    except (ValueError, OverflowError):
-        return "Invalid date"
+# Control characters (except tab and newline) and zero-width characters
+_INVISIBLE_RE = re.compile(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F\u200B-\u200D\uFEFF]')
+# Runs of spaces/tabs that collapse to one space; a lone space already is one
+_HORIZONTAL_SPACE_RE = re.compile(r' [ \t]+|\t[ \t]*')
+# 3+ consecutive non-word/non-space chars
+_SYMBOL_RUN_RE = re.compile(r'[^\w\s]{3,}')
+# Consecutive garbage lines after which the rest of the text is dropped
+_GARBAGE_RUN_LIMIT = 10
 
 
 def _is_garbage_line(line: str) -> bool:
@@ -104,16 +118,21 @@ def _is_garbage_line(line: str) -> bool:
     if len(stripped) <= 4 and ('(' in stripped or ')' in stripped):
         return True
 
-    # Lines that are mostly non-ASCII or control characters
-    ascii_chars = sum(1 for c in stripped if ord(c) < 128)
-    if len(stripped) > 0 and ascii_chars / len(stripped) < 0.5:
-        # More than half non-ASCII might be binary
+    # Lines that are mostly non-ASCII or control characters (more than half
+    # non-ASCII might be binary); encode() counts ASCII characters in C
+    if not stripped.isascii() and len(stripped.encode('ascii', 'ignore')) * 2 < len(stripped):
         return True
 
-    # Lines with repeated weird patterns
-    if re.search(r'[^\w\s]{3,}', stripped):  # 3+ consecutive non-word/non-space chars
-        # But allow URLs, emails, common punctuation
-        if not any(pattern in stripped for pattern in ['http', 'mailto', '://', '@', '.']):
+    # Lines with repeated weird patterns, but allow URLs, emails, common
+    # punctuation (checked first: substring tests are much cheaper than the regex)
+    if not (
+        '.' in stripped
+        or '@' in stripped
+        or '://' in stripped
+        or 'http' in stripped
+        or 'mailto' in stripped
+    ):
+        if _SYMBOL_RUN_RE.search(stripped):
             return True
 
     return False
@@ -128,41 +147,38 @@ def _clean_text(text: str) -> str:
     Returns:
         Cleaned text string
     """
-    # Remove control characters (except newlines and tabs)
-    text = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F]', '', text)
+    # Remove control characters (except newlines and tabs), zero-width
+    # characters, and runs of spaces/tabs (newlines are preserved)
+    text = _INVISIBLE_RE.sub('', text)
+    text = _HORIZONTAL_SPACE_RE.sub(' ', text)
 
-    # Remove zero-width characters and other unicode oddities
-    text = re.sub(r'[\u200B-\u200D\uFEFF]', '', text)
-
-    # Replace multiple whitespace with single space (but preserve newlines)
-    text = re.sub(r'[ \t]+', ' ', text)
-
-    # Split into lines and remove garbage
+    # One pass over the lines drops garbage and collapses blank lines.
     # Be conservative - only remove obviously bad lines, don't stop early
-    lines = text.split('\n')
     cleaned_lines = []
     garbage_count = 0
+    previous_blank = False
 
-    for line in lines:
+    for line in text.split('\n'):
         if _is_garbage_line(line):
             garbage_count += 1
             # Only stop if we hit 10 consecutive garbage lines (very conservative)
             # This catches the binary metadata at the end but preserves content
-            if garbage_count >= 10:
+            if garbage_count >= _GARBAGE_RUN_LIMIT:
                 break
             # Don't include the garbage line itself, just skip it
             continue
+        garbage_count = 0
+        # Keep non-garbage lines, but at most one empty line in a row (a
+        # paragraph break) instead of collapsing 3+ newlines afterwards
+        if not line:
+            if previous_blank:
+                continue
+            previous_blank = True
         else:
-            garbage_count = 0
-            # Keep all non-garbage lines, including empty ones (for paragraph breaks)
-            cleaned_lines.append(line)
-
-    text = '\n'.join(cleaned_lines)
+            previous_blank = False
+        cleaned_lines.append(line)
 
-    # Remove excessive newlines (more than 2 consecutive)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-
-    return text.strip()
+    return '\n'.join(cleaned_lines).strip()
 
 
 def _extract_text_from_html(html_content: str) -> str:
@@ -226,7 +242,7 @@ def _extract_text_from_html(html_content: str) -> str:
 
 
 def _execute_query(query: str, params: tuple = ()) -> List[tuple]:
-    """Execute a query on the Notes database.
+    """Execute a query on the Notes database using the pooled connection.
 
     Args:
         query: SQL query to execute
@@ -238,29 +254,437 @@ def _execute_query(query: str, params: tuple = ()) -> List[tuple]:
     Raises:
         RuntimeError: If database access fails
     """
-    accessible, error = _check_db_access()
-    if not accessible:
-        raise RuntimeError(error)
+    try:
+        return _get_db_pool().execute(query, params)
+    except sqlite3.Error as e:
+        # Only diagnose access problems once a query has actually failed
+        accessible, error = _check_db_access()
+        if not accessible:
+            raise RuntimeError(error)
+        raise RuntimeError(f"Database query failed: {str(e)}")
+
+
+# Core Data entity numbers (Z_ENT) of notes and folders differ between macOS
+# versions; these are only used if Z_PRIMARYKEY does not list an entity
+_DEFAULT_ENTITIES = {"ICNote": 12, "ICFolder": 15}
+_entities: Dict[Path, Dict[str, int]] = {}
+_entities_lock = threading.Lock()
 
+# Nested folder tree with note counts, reused while NoteStore.sqlite is unchanged
+_folder_tree: Optional[Tuple[Any, List[Dict[str, Any]]]] = None
+_folder_tree_lock = threading.Lock()
+
+
+def _get_entities() -> Dict[str, int]:
+    """Return the Z_ENT of ICNote and ICFolder rows, read once from Z_PRIMARYKEY.
+
+    Returns:
+        Mapping of entity name ("ICNote", "ICFolder") to Z_ENT
+
+    Raises:
+        RuntimeError: If database access fails
+    """
     db_path = _get_notes_db_path()
+    with _entities_lock:
+        entities = _entities.get(db_path)
+        if entities is None:
+            placeholders = ", ".join("?" * len(_DEFAULT_ENTITIES))
+            rows = _execute_query(
+                f"SELECT Z_NAME, Z_ENT FROM Z_PRIMARYKEY WHERE Z_NAME IN ({placeholders})",
+                tuple(_DEFAULT_ENTITIES),
+            )
+            entities = _entities[db_path] = {**_DEFAULT_ENTITIES, **dict(rows)}
+        return entities
+
+
+def _note_entity() -> int:
+    """Z_ENT of ICNote rows."""
+    return _get_entities()["ICNote"]
+
+
+def _build_folder_tree(rows: List[tuple]) -> List[Dict[str, Any]]:
+    """Nest folders under their parent folder (ZPARENT).
+
+    Args:
+        rows: (Z_PK, name, parent Z_PK, note count) per folder, in display order
+
+    Returns:
+        Top-level folders, each with its subfolders under "children"
+    """
+    folders = {
+        row[0]: {"id": row[0], "name": row[1], "note_count": row[3], "children": []}
+        for row in rows
+    }
+    parents = {row[0]: row[2] for row in rows}
+
+    def reaches_top(folder_id: int) -> bool:
+        seen = {folder_id}
+        parent = parents[folder_id]
+        while parent in folders:
+            if parent in seen:
+                return False
+            seen.add(parent)
+            parent = parents[parent]
+        return True
+
+    roots = []
+    for folder_id, folder in folders.items():
+        # A folder whose parent is missing, or whose ancestors loop, is shown at the top
+        parent = parents[folder_id]
+        if parent in folders and reaches_top(folder_id):
+            folders[parent]["children"].append(folder)
+        else:
+            roots.append(folder)
+    return roots
+
 
+def _load_folder_tree() -> List[Dict[str, Any]]:
+    """Return the folder tree with note counts, querying only after NoteStore.sqlite changed.
+
+    Returns:
+        Top-level folders, each with id, name, note_count, and children
+
+    Raises:
+        RuntimeError: If database access fails
+    """
+    global _folder_tree
+    db_path = _get_notes_db_path()
+    signature = (db_path, modification_signature(db_path))
+    with _folder_tree_lock:
+        if _folder_tree is not None and _folder_tree[0] == signature:
+            return _folder_tree[1]
+
+    entities = _get_entities()
+    # One pass over the notes counts them for every folder at once
+    rows = _execute_query(
+        """
+        SELECT folder.Z_PK, folder.ZTITLE2, folder.ZPARENT, COUNT(note.Z_PK)
+        FROM ZICCLOUDSYNCINGOBJECT folder
+        LEFT JOIN ZICCLOUDSYNCINGOBJECT note
+            ON note.ZFOLDER = folder.Z_PK AND note.Z_ENT = ?
+        WHERE folder.Z_ENT = ?
+        GROUP BY folder.Z_PK
+        ORDER BY folder.ZTITLE2
+        """,
+        (entities["ICNote"], entities["ICFolder"]),
+    )
+    tree = _build_folder_tree(rows)
+    with _folder_tree_lock:
+        _folder_tree = (signature, tree)
+    return tree
+
+
+# Extracted note bodies with their attachment metadata, keyed by
+# (Z_PK, ZMODIFICATIONDATE1) so an edited note misses the cache instead of
+# returning stale text
+NOTE_TEXT_CACHE_SIZE = 512
+NOTE_TEXT_CACHE_CHARS = 64 * 1024 * 1024
+_note_text_cache: LRUCache[Tuple[str, List[Dict[str, Any]]]] = LRUCache(
+    NOTE_TEXT_CACHE_SIZE, NOTE_TEXT_CACHE_CHARS, weigh=lambda value: len(value[0])
+)
+
+# Bytes of an attachment's file returned per notes_get_attachment call
+ATTACHMENT_CHUNK_BYTES = 1024 * 1024
+MAX_ATTACHMENT_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def _extract_note_content(content_data: bytes) -> str:
+    """Decompress a ZICNOTEDATA.ZDATA blob and extract its text.
+
+    Notes bodies are decoded as NoteStoreProto protobufs, keeping headings,
+    lists, checklists, links, and attachment markers. Data in any other
+    format falls back to the text heuristics.
+
+    Args:
+        content_data: gzip-compressed note data
+
+    Returns:
+        Text content of the note
+    """
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
-        return results
-    except Exception as e:
+        return render_note(decode_note(content_data))
+    except NoteDecodeError:
+        pass
+    decompressed = gzip.decompress(content_data)
+    html_content = decompressed.decode('utf-8', errors='ignore')
+    return _extract_text_from_html(html_content)
+
+
+def _extract_note_with_attachments(content_data: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+    """Extract a note's text with its attachments resolved from their database rows.
+
+    Hashtags and mentions show their text, tables are rendered as Markdown,
+    links as ``[title](url)``, and files by kind and name. No media file is read.
+
+    Args:
+        content_data: gzip-compressed note data
+
+    Returns:
+        Tuple of (text content, attachment metadata in note order)
+    """
+    try:
+        content = decode_note(content_data)
+    except NoteDecodeError:
+        return _extract_note_content(content_data), []
+    identifiers = [identifier for identifier, _ in content.attachments()]
+    if not identifiers:
+        return render_note(content), []
+    attachments = _get_attachments().lookup(identifiers)
+    labels = {identifier: attachment.label() for identifier, attachment in attachments.items()}
+    metadata = [
+        attachments[identifier].metadata()
+        for identifier in dict.fromkeys(identifiers)
+        if identifier in attachments
+    ]
+    return render_note(content, labels), metadata
+
+
+def _load_note_content(
+    note_id: int, modified: Optional[float], data_id: Optional[int]
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """Return a note's extracted text and attachments, decoding its data only on a cache miss.
+
+    Args:
+        note_id: Note Z_PK
+        modified: Note ZMODIFICATIONDATE1 (part of the cache key)
+        data_id: Z_PK of the note's ZICNOTEDATA row
+
+    Returns:
+        Tuple of (plain text content, attachment metadata); ("", []) if the
+        note has no data
+    """
+    key = (note_id, modified)
+    cached = _note_text_cache.get(key)
+    if cached is not None:
+        return cached
+    rows = _execute_query("SELECT ZDATA FROM ZICNOTEDATA WHERE Z_PK = ?", (data_id,))
+    if not rows or not rows[0][0]:
+        return "", []
+    result = _extract_note_with_attachments(rows[0][0])
+    _note_text_cache.put(key, result)
+    return result
+
+
+def _note_attachments(note_id: int) -> Optional[List[Dict[str, Any]]]:
+    """Return the attachment metadata of a note, or None if there is no such note."""
+    rows = _execute_query(
+        "SELECT ZMODIFICATIONDATE1, ZNOTEDATA FROM ZICCLOUDSYNCINGOBJECT "
+        "WHERE Z_PK = ? AND Z_ENT = ?",
+        (note_id, _note_entity()),
+    )
+    if not rows:
+        return None
+    if not rows[0][1]:
+        return []
+    return _load_note_content(note_id, rows[0][0], rows[0][1])[1]
+
+
+def _read_attachment(
+    attachment_id: str, include_data: bool, offset: int, max_bytes: int
+) -> Dict[str, Any]:
+    """Look up an attachment and, if asked, read one chunk of its file.
+
+    Args:
+        attachment_id: Attachment identifier
+        include_data: Whether to read the file
+        offset: First byte of the file to return
+        max_bytes: Maximum number of bytes to return
+
+    Returns:
+        Attachment metadata (plus table rows for tables); with include_data,
+        the chunk base64-encoded with the file size and the next offset
+    """
+    attachments = _get_attachments()
+    attachment = attachments.get(attachment_id)
+    if attachment is None:
+        return {
+            "error": f"Attachment {attachment_id} not found",
+            "suggestion": "Use notes_list_attachments to find valid attachment IDs",
+        }
+    result = attachment.metadata()
+    rows = attachment.table_rows()
+    if rows is not None:
+        result["rows"] = rows
+    if not include_data:
+        return result
+
+    path = attachments.media_path(attachment)
+    if path is None:
+        result["error"] = (
+            "Attachment has no file on this Mac"
+            if attachment.media_id
+            else f"Attachment of kind '{attachment.kind}' has no file"
+        )
+        return result
+    data, size = attachments.read_media(path, offset, max_bytes)
+    end = offset + len(data)
+    result.update({
+        "size": size,
+        "offset": offset,
+        "data": base64.b64encode(data).decode("ascii"),
+        "next_offset": end if end < size else None,
+    })
+    return result
+
+
+def _search_snippets(query: str, limit: int) -> List[Dict[str, Any]]:
+    """Match a query against note titles and snippets only (no index needed).
+
+    Args:
+        query: Search text (case-insensitive substring)
+        limit: Maximum number of results
+
+    Returns:
+        Matching notes, most recently modified first, with a preview around
+        the match
+    """
+    sql_query = """
+        SELECT
+            note.Z_PK as id,
+            note.ZTITLE1 as title,
+            folder.ZTITLE2 as folder_name,
+            note.ZMODIFICATIONDATE1 as modified,
+            note.ZSNIPPET as snippet
+        FROM ZICCLOUDSYNCINGOBJECT note
+        LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
+        WHERE note.Z_ENT = ?
+          AND (note.ZTITLE1 LIKE ? OR note.ZSNIPPET LIKE ?)
+        ORDER BY note.ZMODIFICATIONDATE1 DESC
+        LIMIT ?
+    """
+
+    search_pattern = f"%{query}%"
+    results = _execute_query(
+        sql_query, (_note_entity(), search_pattern, search_pattern, limit)
+    )
+
+    modified = format_apple_timestamps(row[3] for row in results)
+    notes = []
+    for row, row_modified in zip(results, modified):
+        # Find the matching snippet
+        snippet = row[4] or ""
+        title = row[1]
+
+        # Try to extract context around the match
+        preview = ""
+        if query.lower() in snippet.lower():
+            # Find the match position and extract context
+            pos = snippet.lower().find(query.lower())
+            start = max(0, pos - 100)
+            end = min(len(snippet), pos + len(query) + 100)
+            preview = "..." + snippet[start:end] + "..."
+        elif snippet:
+            preview = snippet[:200]
+
+        notes.append({
+            "id": row[0],
+            "title": title,
+            "folder": row[2] or "Unknown",
+            "modified": row_modified,
+            "preview": preview
+        })
+
+    return notes
+
+
+def export_all_notes(
+    output_path: Path,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Export every note with its decoded content to an NDJSON file.
+
+    Args:
+        output_path: File to write (overwritten)
+        workers: Decoder processes (default: CPU count)
+        chunk_size: Notes decoded per worker task
+
+    Returns:
+        Export summary (path, notes, errors, bytes, workers, seconds)
+
+    Raises:
+        RuntimeError: If database access fails
+    """
+    accessible, error = _check_db_access()
+    if not accessible:
+        raise RuntimeError(error)
+    try:
+        return export_notes(
+            _get_db_pool().connection(),
+            output_path,
+            _extract_note_content,
+            workers,
+            chunk_size,
+            _note_entity(),
+        )
+    except sqlite3.Error as e:
         raise RuntimeError(f"Database query failed: {str(e)}")
 
 
-def register_notes_tools(mcp: FastMCP):
+def register_notes_tools(mcp: FastMCP, data_dir: Path):
     """Register Mac Notes-related tools with the MCP server.
 
     Note: These tools only work on macOS and require Full Disk Access permission.
+
+    Args:
+        mcp: FastMCP server instance
+        data_dir: Directory for local data (the Notes search index lives here)
     """
 
+    def _get_index():
+        return get_notes_index(
+            data_dir, _execute_query, _extract_note_content, _get_notes_db_path(), _note_entity()
+        )
+
+    def _search_index(query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Bring the sidecar index up to date with NoteStore.sqlite, then search it.
+
+        Returns:
+            Matching notes, or None while the first index build is still running
+        """
+        index = _get_index()
+        if not index.ready:
+            index.start_background_build()
+            return None
+        index.refresh()
+        results = index.search(query, limit)
+        if not results:
+            return []
+
+        # Folder and dates come from Notes itself, so moved notes show their current folder
+        placeholders = ", ".join("?" * len(results))
+        rows = _execute_query(
+            f"""
+            SELECT note.Z_PK, folder.ZTITLE2, note.ZMODIFICATIONDATE1
+            FROM ZICCLOUDSYNCINGOBJECT note
+            LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
+            WHERE note.Z_PK IN ({placeholders})
+            """,
+            tuple(result["note_id"] for result in results),
+        )
+        metadata = {row[0]: row[1:] for row in rows}
+        results = [result for result in results if result["note_id"] in metadata]
+        dates = format_apple_timestamps(metadata[result["note_id"]][1] for result in results)
+
+        notes = []
+        for result, row_modified in zip(results, dates):
+            notes.append({
+                "id": result["note_id"],
+                "title": result["title"],
+                "folder": metadata[result["note_id"]][0] or "Unknown",
+                "modified": row_modified,
+                "preview": result["snippet"],
+                "score": result["score"],
+            })
+        return notes
+
+    def _index_status() -> Dict[str, Any]:
+        """Return the search index status, starting its first build if needed."""
+        index = _get_index()
+        if not index.ready:
+            index.start_background_build()
+        return index.status()
+
     @mcp.tool()
     async def notes_check_availability() -> Dict[str, Any]:
         """Check if Mac Notes tools are available on this system.
@@ -268,7 +692,7 @@ def register_notes_tools(mcp: FastMCP):
         Returns:
             Availability status, database path, and setup instructions
         """
-        is_available, error = _check_db_access()
+        is_available, error = await run_blocking(SQLITE_POOL, _check_db_access)
         db_path = _get_notes_db_path()
 
         result = {
@@ -277,7 +701,9 @@ def register_notes_tools(mcp: FastMCP):
             "database_path": str(db_path),
         }
 
-        if not is_available:
+        if is_available:
+            result["search_index"] = await run_blocking(SQLITE_POOL, _index_status)
+        else:
             result["error"] = error
             result["setup_instructions"] = (
                 "1. Open System Settings > Privacy & Security > Full Disk Access\n"
@@ -289,36 +715,16 @@ def register_notes_tools(mcp: FastMCP):
         return result
 
     @mcp.tool()
+    @budgeted
     async def notes_list_folders() -> List[Dict[str, Any]]:
-        """List all folders in Mac Notes app.
+        """List all folders in Mac Notes app as a nested tree.
 
         Returns:
-            List of folders with id, name, and note count
+            Top-level folders with id, name, note count, and their subfolders
+            under "children" (nested the same way)
         """
         try:
-            query = """
-                SELECT
-                    Z_PK as id,
-                    ZTITLE2 as name,
-                    (SELECT COUNT(*)
-                     FROM ZICCLOUDSYNCINGOBJECT note
-                     WHERE note.ZFOLDER = folder.Z_PK AND note.Z_ENT = 12) as note_count
-                FROM ZICCLOUDSYNCINGOBJECT folder
-                WHERE Z_ENT = 15
-                ORDER BY ZTITLE2
-            """
-
-            results = _execute_query(query)
-
-            folders = []
-            for row in results:
-                folders.append({
-                    "id": row[0],
-                    "name": row[1],
-                    "note_count": row[2]
-                })
-
-            return folders
+            return await run_blocking(SQLITE_POOL, _load_folder_tree)
 
         except Exception as e:
             return [{
@@ -327,6 +733,7 @@ def register_notes_tools(mcp: FastMCP):
             }]
 
     @mcp.tool()
+    @budgeted
     async def notes_list_notes(
         folder: Optional[str] = None,
         limit: int = 20,
@@ -341,6 +748,7 @@ def register_notes_tools(mcp: FastMCP):
             List of notes with id, title, folder, modification date, and preview
         """
         try:
+            note_entity = await run_blocking(SQLITE_POOL, _note_entity)
             if folder:
                 query = """
                     SELECT
@@ -351,12 +759,14 @@ def register_notes_tools(mcp: FastMCP):
                         note.ZSNIPPET as snippet
                     FROM ZICCLOUDSYNCINGOBJECT note
                     LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
-                    WHERE note.Z_ENT = 12
+                    WHERE note.Z_ENT = ?
                       AND folder.ZTITLE2 = ?
                     ORDER BY note.ZMODIFICATIONDATE1 DESC
                     LIMIT ?
                 """
-                results = _execute_query(query, (folder, limit))
+                results = await run_blocking(
+                    SQLITE_POOL, _execute_query, query, (note_entity, folder, limit)
+                )
             else:
                 query = """
                     SELECT
@@ -367,19 +777,22 @@ def register_notes_tools(mcp: FastMCP):
                         note.ZSNIPPET as snippet
                     FROM ZICCLOUDSYNCINGOBJECT note
                     LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
-                    WHERE note.Z_ENT = 12
+                    WHERE note.Z_ENT = ?
                     ORDER BY note.ZMODIFICATIONDATE1 DESC
                     LIMIT ?
                 """
-                results = _execute_query(query, (limit,))
+                results = await run_blocking(
+                    SQLITE_POOL, _execute_query, query, (note_entity, limit)
+                )
 
+            modified = format_apple_timestamps(row[3] for row in results)
             notes = []
-            for row in results:
+            for row, row_modified in zip(results, modified):
                 notes.append({
                     "id": row[0],
                     "title": row[1],
                     "folder": row[2] or "Unknown",
-                    "modified": _convert_apple_timestamp(row[3]),
+                    "modified": row_modified,
                     "preview": row[4][:200] if row[4] else ""
                 })
 
@@ -392,6 +805,7 @@ def register_notes_tools(mcp: FastMCP):
             }]
 
     @mcp.tool()
+    @budgeted
     async def notes_read_note(note_id: int) -> Dict[str, Any]:
         """Read the content of a specific note.
 
@@ -399,7 +813,8 @@ def register_notes_tools(mcp: FastMCP):
             note_id: Note ID (from notes_list_notes)
 
         Returns:
-            Note content with title, body (plain text), folder, and metadata
+            Note content with title, body (plain text), folder, and metadata,
+            plus attachment metadata (no file data) if the note has attachments
         """
         try:
             query = """
@@ -409,14 +824,16 @@ def register_notes_tools(mcp: FastMCP):
                     folder.ZTITLE2 as folder_name,
                     note.ZMODIFICATIONDATE1 as modified,
                     note.ZCREATIONDATE1 as created,
-                    data.ZDATA as content_data
+                    note.ZNOTEDATA as data_id
                 FROM ZICCLOUDSYNCINGOBJECT note
                 LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
-                LEFT JOIN ZICNOTEDATA data ON note.ZNOTEDATA = data.Z_PK
-                WHERE note.Z_PK = ? AND note.Z_ENT = 12
+                WHERE note.Z_PK = ? AND note.Z_ENT = ?
             """
 
-            results = _execute_query(query, (note_id,))
+            note_entity = await run_blocking(SQLITE_POOL, _note_entity)
+            results = await run_blocking(
+                SQLITE_POOL, _execute_query, query, (note_id, note_entity)
+            )
 
             if not results:
                 return {
@@ -428,25 +845,26 @@ def register_notes_tools(mcp: FastMCP):
             title = row[0]
             snippet = row[1]
             folder = row[2] or "Unknown"
-            modified = _convert_apple_timestamp(row[3])
-            created = _convert_apple_timestamp(row[4])
-            content_data = row[5]
+            modified = format_apple_timestamp(row[3])
+            created = format_apple_timestamp(row[4])
+            data_id = row[5]
 
-            # Extract note content
+            # Extract note content (cached until the note is modified)
             content = ""
-            if content_data:
+            attachments: List[Dict[str, Any]] = []
+            if data_id:
                 try:
-                    # Note content is gzip-compressed
-                    decompressed = gzip.decompress(content_data)
-                    html_content = decompressed.decode('utf-8', errors='ignore')
-                    # Extract plain text from HTML
-                    content = _extract_text_from_html(html_content)
+                    content, attachments = await run_blocking(
+                        SQLITE_POOL, _load_note_content, note_id, row[3], data_id
+                    )
 
                     # Only fall back to snippet if extraction completely failed
                     # (snippet is often truncated, so prefer full extraction)
                     if not content or len(content) < 5:
                         if snippet:
                             content = snippet
+                except RuntimeError:
+                    raise
                 except Exception as e:
                     content = f"Failed to decompress content: {str(e)}"
                     # Fall back to snippet if available
@@ -459,7 +877,7 @@ def register_notes_tools(mcp: FastMCP):
             if not content:
                 content = "[Note appears to be empty or content could not be extracted]"
 
-            return {
+            note = {
                 "id": note_id,
                 "title": title,
                 "content": content,
@@ -467,6 +885,9 @@ def register_notes_tools(mcp: FastMCP):
                 "modified": modified,
                 "created": created
             }
+            if attachments:
+                note["attachments"] = attachments
+            return note
 
         except Exception as e:
             return {
@@ -475,67 +896,139 @@ def register_notes_tools(mcp: FastMCP):
             }
 
     @mcp.tool()
+    @budgeted
     async def notes_search_notes(
         query: str,
         limit: int = 20
     ) -> List[Dict[str, Any]]:
-        """Search notes by title or content.
+        """Search notes by title or content, most relevant first.
+
+        Uses a local full-text index of the complete note bodies that is brought
+        up to date with added, edited, and deleted notes before each search.
+        Supports FTS5 syntax: "exact phrase", prefix*, OR, NOT. The index is
+        built in the background on first use; until then only titles and
+        snippets are searched, most recently modified first.
 
         Args:
-            query: Search query (case-insensitive)
-            limit: Maximum number of results (default: 20)
+            query: Search query
+            limit: Maximum number of results (default: 20, max: 200)
 
         Returns:
-            List of matching notes with id, title, folder, and preview
+            List of matching notes with id, title, folder, modification date,
+            a preview around the match (hits wrapped in [ ]), and relevance score
         """
+        limit = min(limit, 200)
+
         try:
-            sql_query = """
-                SELECT
-                    note.Z_PK as id,
-                    note.ZTITLE1 as title,
-                    folder.ZTITLE2 as folder_name,
-                    note.ZMODIFICATIONDATE1 as modified,
-                    note.ZSNIPPET as snippet
-                FROM ZICCLOUDSYNCINGOBJECT note
-                LEFT JOIN ZICCLOUDSYNCINGOBJECT folder ON note.ZFOLDER = folder.Z_PK
-                WHERE note.Z_ENT = 12
-                  AND (note.ZTITLE1 LIKE ? OR note.ZSNIPPET LIKE ?)
-                ORDER BY note.ZMODIFICATIONDATE1 DESC
-                LIMIT ?
-            """
+            notes = await run_blocking(SQLITE_POOL, _search_index, query, limit)
+            if notes is None:
+                notes = await run_blocking(SQLITE_POOL, _search_snippets, query, limit)
+                for note in notes:
+                    note["index_building"] = True
+            return notes
 
-            search_pattern = f"%{query}%"
-            results = _execute_query(sql_query, (search_pattern, search_pattern, limit))
+        except Exception as e:
+            return [{
+                "error": f"Failed to search notes: {str(e)}",
+                "suggestion": "Ensure Full Disk Access is granted. See notes_check_availability for setup."
+            }]
 
-            notes = []
-            for row in results:
-                # Find the matching snippet
-                snippet = row[4] or ""
-                title = row[1]
-
-                # Try to extract context around the match
-                preview = ""
-                if query.lower() in snippet.lower():
-                    # Find the match position and extract context
-                    pos = snippet.lower().find(query.lower())
-                    start = max(0, pos - 100)
-                    end = min(len(snippet), pos + len(query) + 100)
-                    preview = "..." + snippet[start:end] + "..."
-                elif snippet:
-                    preview = snippet[:200]
+    @mcp.tool()
+    @budgeted
+    async def notes_list_attachments(note_id: int) -> List[Dict[str, Any]]:
+        """List the attachments of a note: images, PDFs, scans, tables, links, and hashtags.
 
-                notes.append({
-                    "id": row[0],
-                    "title": title,
-                    "folder": row[2] or "Unknown",
-                    "modified": _convert_apple_timestamp(row[3]),
-                    "preview": preview
-                })
+        Only metadata is returned; use notes_get_attachment for a table's cells
+        or a file's bytes.
 
-            return notes
+        Args:
+            note_id: Note ID (from notes_list_notes)
+
+        Returns:
+            Attachments in note order with id, type UTI, kind, title or file
+            name, size, and whether a file is available (scans list their pages)
+        """
+        try:
+            attachments = await run_blocking(SQLITE_POOL, _note_attachments, note_id)
+            if attachments is None:
+                return [{
+                    "error": f"Note with id {note_id} not found",
+                    "suggestion": "Use notes_list_notes to find valid note IDs"
+                }]
+            return attachments
 
         except Exception as e:
             return [{
-                "error": f"Failed to search notes: {str(e)}",
+                "error": f"Failed to list attachments: {str(e)}",
                 "suggestion": "Ensure Full Disk Access is granted. See notes_check_availability for setup."
             }]
+
+    @mcp.tool()
+    async def notes_get_attachment(
+        attachment_id: str,
+        include_data: bool = False,
+        offset: int = 0,
+        max_bytes: int = ATTACHMENT_CHUNK_BYTES,
+    ) -> Dict[str, Any]:
+        """Get one note attachment, and optionally a chunk of its file.
+
+        Without include_data only metadata is returned (plus the cells of a
+        table), so large files are never read unless asked for. File data is
+        read from the Notes container one chunk at a time; keep calling with
+        offset=next_offset until next_offset is null.
+
+        Args:
+            attachment_id: Attachment ID (from notes_list_attachments or notes_read_note)
+            include_data: Return file bytes, base64-encoded (default: False)
+            offset: Byte offset of the chunk to return (default: 0)
+            max_bytes: Maximum bytes per chunk (default: 1 MB, max: 4 MB)
+
+        Returns:
+            Attachment metadata; table rows for tables; with include_data, the
+            chunk as base64 "data" with the file "size" and "next_offset"
+        """
+        if offset < 0 or max_bytes < 1:
+            return {"error": "offset must be >= 0 and max_bytes >= 1"}
+        max_bytes = min(max_bytes, MAX_ATTACHMENT_CHUNK_BYTES)
+
+        try:
+            return await run_blocking(
+                SQLITE_POOL, _read_attachment, attachment_id, include_data, offset, max_bytes
+            )
+        except Exception as e:
+            return {
+                "error": f"Failed to get attachment: {str(e)}",
+                "suggestion": "Ensure Full Disk Access is granted. See notes_check_availability for setup."
+            }
+
+    @mcp.tool()
+    async def notes_export_all(
+        filename: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Export all notes with their full content to a newline-delimited JSON file.
+
+        Note bodies are decoded in parallel worker processes and written as they
+        finish, one JSON object per line (id, identifier, title, folder, created,
+        modified, content). The file is saved under the server's data directory.
+
+        Args:
+            filename: Output file name (default: notes-<timestamp>.ndjson)
+            workers: Number of decoder processes (default: CPU count)
+
+        Returns:
+            Export summary with the file path, notes written, decode errors,
+            bytes written, and elapsed seconds
+        """
+        filename = filename or f"notes-{time.strftime('%Y%m%d-%H%M%S')}.ndjson"
+        if Path(filename).name != filename or filename in (".", ".."):
+            return {"error": "filename must be a plain file name, not a path"}
+
+        try:
+            return await run_blocking(
+                SQLITE_POOL, export_all_notes, Path(data_dir) / "exports" / filename, workers
+            )
+        except RuntimeError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            return {"error": f"Failed to export notes: {str(e)}"}
@@ -9,6 +9,15 @@ from mcp.server.fastmcp import FastMCP
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from ..services.executor import SLACK_POOL, run_blocking
+from ..services.paging import decode_page_token, make_page
+from ..services.projection import budgeted
+
+
+def _next_cursor(response) -> Optional[str]:
+    """Return Slack's next_cursor, or None on the last page."""
+    return (response.get("response_metadata") or {}).get("next_cursor") or None
+
 
 def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
     """Register Slack-related tools with the MCP server.
@@ -37,23 +46,32 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
     client = WebClient(token=slack_token)
 
     @mcp.tool()
+    @budgeted
     async def slack_list_channels(
         types: str = "public_channel,private_channel",
         limit: int = 100,
-    ) -> List[Dict[str, Any]]:
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """List Slack channels.
 
         Args:
             types: Comma-separated channel types (default: "public_channel,private_channel")
-            limit: Maximum number of channels to return (default: 100)
+            limit: Maximum number of channels per page (default: 100)
+            page_token: next_page_token from a previous call to fetch the next page
 
         Returns:
-            List of channels with id, name, and details
+            Dict with items (channels with id, name, and details) and next_page_token
         """
         try:
-            response = client.conversations_list(types=types, limit=limit)
+            response = await run_blocking(
+                SLACK_POOL,
+                client.conversations_list,
+                types=types,
+                limit=limit,
+                cursor=decode_page_token("slack_list_channels", page_token),
+            )
             channels = response["channels"]
-            return [
+            items = [
                 {
                     "id": ch["id"],
                     "name": ch["name"],
@@ -64,31 +82,38 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
                 }
                 for ch in channels
             ]
+            return make_page("slack_list_channels", items, _next_cursor(response))
         except SlackApiError as e:
             raise RuntimeError(f"Failed to list Slack channels: {e.response['error']}")
 
     @mcp.tool()
+    @budgeted
     async def slack_read_messages(
         channel_id: str,
         limit: int = 20,
         oldest: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Read messages from a Slack channel.
 
         Args:
             channel_id: Channel ID to read from
-            limit: Maximum number of messages to return (default: 20)
+            limit: Maximum number of messages per page (default: 20)
             oldest: Only messages after this Unix timestamp (optional)
+            page_token: next_page_token from a previous call to fetch older messages
 
         Returns:
-            List of messages with text, user, and timestamp
+            Dict with items (messages with text, user, and timestamp) and next_page_token
         """
         try:
             kwargs = {"channel": channel_id, "limit": limit}
             if oldest:
                 kwargs["oldest"] = oldest
+            cursor = decode_page_token("slack_read_messages", page_token)
+            if cursor:
+                kwargs["cursor"] = cursor
 
-            response = client.conversations_history(**kwargs)
+            response = await run_blocking(SLACK_POOL, client.conversations_history, **kwargs)
             messages = response["messages"]
 
             formatted_messages = []
@@ -103,11 +128,12 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
                     }
                 )
 
-            return formatted_messages
+            return make_page("slack_read_messages", formatted_messages, _next_cursor(response))
         except SlackApiError as e:
             raise RuntimeError(f"Failed to read Slack messages: {e.response['error']}")
 
     @mcp.tool()
+    @budgeted
     async def slack_search_messages(
         query: str,
         count: int = 20,
@@ -122,7 +148,9 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
             List of matching messages
         """
         try:
-            response = client.search_messages(query=query, count=count)
+            response = await run_blocking(
+                SLACK_POOL, client.search_messages, query=query, count=count
+            )
             matches = response["messages"]["matches"]
 
             return [
@@ -139,6 +167,7 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
             raise RuntimeError(f"Failed to search Slack messages: {e.response['error']}")
 
     @mcp.tool()
+    @budgeted
     async def slack_get_thread(
         channel_id: str,
         thread_ts: str,
@@ -153,7 +182,9 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
             List of messages in the thread
         """
         try:
-            response = client.conversations_replies(channel=channel_id, ts=thread_ts)
+            response = await run_blocking(
+                SLACK_POOL, client.conversations_replies, channel=channel_id, ts=thread_ts
+            )
             messages = response["messages"]
 
             return [
@@ -168,20 +199,31 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
             raise RuntimeError(f"Failed to get Slack thread: {e.response['error']}")
 
     @mcp.tool()
-    async def slack_list_users(limit: int = 100) -> List[Dict[str, str]]:
+    @budgeted
+    async def slack_list_users(
+        limit: int = 100,
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """List users in the Slack workspace.
 
         Args:
-            limit: Maximum number of users to return (default: 100)
+            limit: Maximum number of users per page (default: 100)
+            page_token: next_page_token from a previous call to fetch the next page
 
         Returns:
-            List of users with id, name, and real name
+            Dict with items (users with id, name, and real name) and next_page_token.
+            Deactivated users are skipped, so a page may hold fewer than limit items.
         """
         try:
-            response = client.users_list(limit=limit)
+            response = await run_blocking(
+                SLACK_POOL,
+                client.users_list,
+                limit=limit,
+                cursor=decode_page_token("slack_list_users", page_token),
+            )
             users = response["members"]
 
-            return [
+            items = [
                 {
                     "id": user["id"],
                     "name": user.get("name", ""),
@@ -192,5 +234,6 @@ def register_slack_tools(mcp: FastMCP, slack_token: Optional[str] = None):
                 for user in users
                 if not user.get("deleted", False)
             ]
+            return make_page("slack_list_users", items, _next_cursor(response))
         except SlackApiError as e:
             raise RuntimeError(f"Failed to list Slack users: {e.response['error']}")
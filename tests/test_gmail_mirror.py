@@ -0,0 +1,250 @@
+"""Tests for the local Gmail mirror's sync and history handling.
+
+The Gmail service is built from the bundled discovery document on top of a fake
+httplib2 transport, so requests go through googleapiclient's real request and
+batch machinery and only the HTTP exchange is simulated.
+"""
+
+import json
+import re
+from urllib.parse import parse_qs, urlparse
+
+import httplib2
+import pytest
+
+from src.services import gmail_mirror
+from src.services.gmail_mirror import GmailMirror
+from src.services.oauth import build_api_service
+
+
+def _message(msg_id, subject="", labels=("INBOX",)):
+    return {
+        "id": msg_id,
+        "threadId": f"t-{msg_id}",
+        "internalDate": "1700000000000",
+        "labelIds": list(labels),
+        "snippet": subject,
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "Subject", "value": subject},
+                {"name": "From", "value": "alice@example.com"},
+                {"name": "To", "value": "bob@example.com"},
+            ],
+            "body": {"data": ""},
+        },
+    }
+
+
+class FakeGmailHttp:
+    """Minimal Gmail backend behind an httplib2-compatible request() method.
+
+    Attributes:
+        messages: Message ID to messages.get response
+        history_id: historyId reported by getProfile and history.list
+        history: Records returned by history.list
+        failures: Message ID to a list of HTTP statuses returned by its next
+            batched messages.get calls (one status is consumed per call)
+    """
+
+    def __init__(self):
+        self.messages = {}
+        self.history_id = "100"
+        self.history = []
+        self.failures = {}
+        self.batch_calls = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        path = urlparse(uri).path
+        if path == "/batch":
+            return self._batch(body, headers)
+        query = parse_qs(urlparse(uri).query)
+        if path.endswith("/profile"):
+            return self._json(200, {"historyId": self.history_id})
+        if path.endswith("/history"):
+            return self._json(200, {"history": self.history, "historyId": self.history_id})
+        if path.endswith("/messages"):
+            ids = sorted(self.messages)[: int(query.get("maxResults", ["100"])[0])]
+            return self._json(200, {"messages": [{"id": i} for i in ids]})
+        raise AssertionError(f"Unexpected request: {method} {uri}")
+
+    def _get_status(self, msg_id):
+        statuses = self.failures.get(msg_id)
+        if statuses:
+            return statuses.pop(0)
+        return 200 if msg_id in self.messages else 404
+
+    def _batch(self, body, headers):
+        boundary = "batch_response"
+        parts = []
+        requested = []
+        for content_id, msg_id in re.findall(
+            r"Content-ID: <([^>]+)>.*?GET /gmail/v1/users/me/messages/([^?\s]+)", body, re.DOTALL
+        ):
+            requested.append(msg_id)
+            status = self._get_status(msg_id)
+            if status == 200:
+                payload = json.dumps(self.messages[msg_id])
+            else:
+                payload = json.dumps({"error": {"code": status, "message": "error"}})
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} Status\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        self.batch_calls.append(requested)
+        content = "".join(parts) + f"--{boundary}--"
+        response = httplib2.Response(
+            {"status": 200, "content-type": f"multipart/mixed; boundary={boundary}"}
+        )
+        return response, content.encode("utf-8")
+
+    @staticmethod
+    def _json(status, payload):
+        response = httplib2.Response({"status": status, "content-type": "application/json"})
+        return response, json.dumps(payload).encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(gmail_mirror, "RETRY_BACKOFF_SECONDS", 0)
+
+
+@pytest.fixture
+def backend():
+    backend = FakeGmailHttp()
+    backend.messages = {f"m{i}": _message(f"m{i}", f"Subject {i}") for i in range(3)}
+    return backend
+
+
+@pytest.fixture
+def service(backend):
+    return build_api_service("gmail", "v1", backend)
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return GmailMirror(tmp_path / "mirror.sqlite")
+
+
+def _ids(mirror):
+    return sorted(m["id"] for m in mirror.list_messages(limit=100))
+
+
+def test_full_sync_stores_messages_and_history_id(mirror, service):
+    result = mirror.sync(service)
+
+    assert result["mode"] == "full"
+    assert result["added"] == 3
+    assert result["failed"] == 0
+    assert mirror.history_id == "100"
+    assert _ids(mirror) == ["m0", "m1", "m2"]
+    assert [m["id"] for m in mirror.search("subject")] != []
+
+
+def test_transient_batch_failure_is_retried(mirror, service, backend):
+    backend.failures = {"m1": [429], "m2": [503, 500]}
+
+    result = mirror.sync(service)
+
+    assert result["added"] == 3
+    assert result["failed"] == 0
+    assert backend.batch_calls == [["m0", "m1", "m2"], ["m1", "m2"], ["m2"]]
+    assert mirror.history_id == "100"
+
+
+def test_full_sync_with_lasting_429_stays_unsynced(mirror, service, backend):
+    backend.failures = {"m1": [429] * (gmail_mirror.FETCH_RETRIES + 1)}
+
+    result = mirror.sync(service)
+
+    assert result["failed"] == 1
+    assert result["history_id"] is None
+    assert mirror.history_id is None
+    assert _ids(mirror) == ["m0", "m2"]
+
+    # The next sync starts over and picks up the message that failed
+    result = mirror.sync(service)
+    assert result["mode"] == "full"
+    assert mirror.history_id == "100"
+    assert _ids(mirror) == ["m0", "m1", "m2"]
+
+
+def test_incremental_sync_with_lasting_429_keeps_history_id(mirror, service, backend):
+    mirror.sync(service)
+    backend.messages["m3"] = _message("m3", "New message")
+    backend.history = [{"messagesAdded": [{"message": {"id": "m3"}}]}]
+    backend.history_id = "200"
+    backend.failures = {"m3": [429] * (gmail_mirror.FETCH_RETRIES + 1)}
+
+    result = mirror.sync(service)
+
+    assert result["mode"] == "incremental"
+    assert result["failed"] == 1
+    assert result["history_id"] == "100"
+    assert mirror.history_id == "100"
+    assert "m3" not in _ids(mirror)
+
+    # Replaying the same history once Gmail recovers stores the message
+    result = mirror.sync(service)
+    assert result["failed"] == 0
+    assert mirror.history_id == "200"
+    assert "m3" in _ids(mirror)
+
+
+def test_permanent_failure_is_not_retried(mirror, service, backend):
+    backend.failures = {"m1": [400]}
+
+    result = mirror.sync(service)
+
+    assert result["failed"] == 1
+    assert backend.batch_calls == [["m0", "m1", "m2"]]
+    assert mirror.history_id is None
+
+
+def test_message_deleted_before_get_is_dropped(mirror, service, backend):
+    mirror.sync(service)
+    backend.history = [{"messagesAdded": [{"message": {"id": "gone"}}]}]
+    backend.history_id = "200"
+
+    result = mirror.sync(service)
+
+    assert result["added"] == 0
+    assert result["failed"] == 0
+    assert mirror.history_id == "200"
+
+
+def test_incremental_sync_applies_deletes_and_label_changes(mirror, service, backend):
+    mirror.sync(service)
+    backend.history = [
+        {"messagesDeleted": [{"message": {"id": "m0"}}]},
+        {"labelsAdded": [{"message": {"id": "m1", "labelIds": ["INBOX", "STARRED"]}}]},
+    ]
+    backend.history_id = "200"
+
+    result = mirror.sync(service)
+
+    assert (result["deleted"], result["updated"]) == (1, 1)
+    assert _ids(mirror) == ["m1", "m2"]
+    assert mirror.get_message("m1")["labelIds"] == ["INBOX", "STARRED"]
+    assert mirror.search("Subject 0") == []
+
+
+def test_expired_history_id_falls_back_to_full_sync(mirror, service, backend, monkeypatch):
+    mirror.sync(service)
+
+    def expired(*args, **kwargs):
+        return backend._json(404, {"error": {"code": 404, "message": "expired"}})
+
+    original = backend.request
+    monkeypatch.setattr(
+        backend,
+        "request",
+        lambda uri, *a, **kw: (
+            expired() if urlparse(uri).path.endswith("/history") else original(uri, *a, **kw)
+        ),
+    )
+    assert mirror.sync(service)["mode"] == "full"
@@ -0,0 +1,165 @@
+"""Tests for the iMessage FTS5 sidecar index and its high-water mark."""
+
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic_chat_db import SCHEMA, encode_attributed_body
+from src.services import imessage_index
+from src.services.imessage_index import IMessageIndex
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+
+
+def _make_chat_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.execute(
+            "INSERT INTO handle (ROWID, id, service) VALUES (1, '+15550000001', 'iMessage')"
+        )
+        conn.execute(
+            "INSERT INTO handle (ROWID, id, service) VALUES (2, '+15550000002', 'iMessage')"
+        )
+        conn.execute(
+            "INSERT INTO chat (ROWID, guid, style, chat_identifier, service_name) "
+            "VALUES (1, 'iMessage;-;+15550000001', 45, '+15550000001', 'iMessage')"
+        )
+        conn.execute(
+            "INSERT INTO chat (ROWID, guid, style, chat_identifier, service_name) "
+            "VALUES (2, 'iMessage;-;+15550000002', 45, '+15550000002', 'iMessage')"
+        )
+    conn.close()
+
+
+def _add_message(path, rowid, text, handle_id=1, attributed=False):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            "INSERT INTO message (ROWID, guid, text, attributedBody, handle_id, date) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                rowid,
+                f"guid-{rowid}",
+                None if attributed else text,
+                encode_attributed_body(text) if attributed and text else None,
+                handle_id,
+                rowid * 1_000_000_000,
+            ),
+        )
+        conn.execute(
+            "INSERT INTO chat_message_join (chat_id, message_id, message_date) VALUES (?, ?, ?)",
+            (handle_id, rowid, rowid * 1_000_000_000),
+        )
+    conn.close()
+
+
+@pytest.fixture
+def chat_db(tmp_path):
+    path = tmp_path / "chat.db"
+    _make_chat_db(path)
+    _add_message(path, 1, "lunch tomorrow at noon")
+    _add_message(path, 2, "running late for lunch", handle_id=2)
+    _add_message(path, 3, "see you at the airport", attributed=True)
+    return path
+
+
+@pytest.fixture
+def pool(chat_db):
+    pool = ReadOnlyConnectionPool(chat_db)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def index(tmp_path, pool):
+    return IMessageIndex(tmp_path / "data" / "imessage_index.sqlite", pool.execute)
+
+
+def _ids(results):
+    return sorted(result["message_id"] for result in results)
+
+
+def test_refresh_indexes_text_and_attributed_body(index):
+    assert index.refresh() == {"indexed": 3, "high_water": 3}
+
+    assert _ids(index.search("lunch")) == [1, 2]
+    airport = index.search("airport")
+    assert _ids(airport) == [3]
+    assert airport[0]["contact"] == "+15550000001"
+    assert airport[0]["chat"] == "+15550000001"
+    assert "[airport]" in airport[0]["snippet"]
+
+
+def test_refresh_only_copies_messages_above_high_water(index, chat_db):
+    index.refresh()
+    assert index.refresh() == {"indexed": 0, "high_water": 3}
+
+    _add_message(chat_db, 4, "lunch moved to friday")
+    assert index.refresh() == {"indexed": 1, "high_water": 4}
+    assert _ids(index.search("lunch")) == [1, 2, 4]
+
+
+def test_refresh_in_batches(index, chat_db, monkeypatch):
+    monkeypatch.setattr(imessage_index, "REFRESH_BATCH_SIZE", 2)
+    for rowid in range(4, 8):
+        _add_message(chat_db, rowid, f"lunch number {rowid}")
+
+    assert index.refresh() == {"indexed": 7, "high_water": 7}
+    assert len(index.search("lunch")) == 6
+
+
+def test_messages_without_text_advance_high_water(index, chat_db):
+    index.refresh()
+    _add_message(chat_db, 4, None)
+
+    assert index.refresh() == {"indexed": 0, "high_water": 4}
+    assert index.high_water == 4
+
+
+def test_deleted_messages_are_dropped_on_search(index, chat_db):
+    index.refresh()
+    conn = sqlite3.connect(chat_db)
+    with conn:
+        conn.execute("DELETE FROM message WHERE ROWID = 1")
+    conn.close()
+
+    assert _ids(index.search("lunch")) == [2]
+    with sqlite3.connect(index.index_path) as conn:
+        assert conn.execute("SELECT rowid FROM messages_fts ORDER BY rowid").fetchall() == [
+            (2,),
+            (3,),
+        ]
+
+
+def test_replaced_chat_db_rebuilds_index(index, chat_db, tmp_path):
+    index.refresh()
+
+    # A restored chat.db with fewer messages: ROWIDs no longer line up
+    replacement = tmp_path / "restored.db"
+    _make_chat_db(replacement)
+    _add_message(replacement, 1, "fresh start after restore")
+    os.replace(replacement, chat_db)
+
+    assert index.refresh() == {"indexed": 1, "high_water": 1}
+    assert index.search("lunch") == []
+    assert _ids(index.search("restore")) == [1]
+
+
+def test_contact_filter(index):
+    index.refresh()
+
+    assert _ids(index.search("lunch", contact="+15550000002")) == [2]
+    assert _ids(index.search("lunch", contact=["+15550000001", "+15550000002"])) == [1, 2]
+    assert index.search("lunch", contact="+15559999999") == []
+
+
+def test_version_change_resets_index(index, pool):
+    index.refresh()
+    with sqlite3.connect(index.index_path) as conn:
+        conn.execute("UPDATE sync_state SET value = '1' WHERE key = 'version'")
+
+    reopened = IMessageIndex(index.index_path, pool.execute)
+    assert reopened.high_water == 0
+    assert reopened.search("lunch") == []
+    assert reopened.refresh()["indexed"] == 3
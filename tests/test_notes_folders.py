@@ -0,0 +1,123 @@
+"""Tests for the Notes folder tree and its cache."""
+
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic_notestore import SCHEMA
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+from src.tools import notes
+
+# Non-default entity numbers, as on macOS versions where they shifted
+NOTE_ENTITY = 10
+FOLDER_ENTITY = 14
+
+# (Z_PK, name, parent Z_PK)
+FOLDERS = [(1, "Work", None), (2, "Projects", 1), (3, "Archive", 2), (4, "Personal", None)]
+
+
+def _add_notes(path, folder_id, count, first_pk):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO ZICCLOUDSYNCINGOBJECT (Z_PK, Z_ENT, ZFOLDER, ZTITLE1) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (pk, NOTE_ENTITY, folder_id, f"Note {pk}")
+                for pk in range(first_pk, first_pk + count)
+            ],
+        )
+    conn.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "NoteStore.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.executemany(
+            "INSERT INTO Z_PRIMARYKEY (Z_ENT, Z_NAME, Z_SUPER, Z_MAX) VALUES (?, ?, 1, 0)",
+            [(NOTE_ENTITY, "ICNote"), (FOLDER_ENTITY, "ICFolder")],
+        )
+        conn.executemany(
+            "INSERT INTO ZICCLOUDSYNCINGOBJECT (Z_PK, Z_ENT, ZTITLE2, ZPARENT) VALUES (?, ?, ?, ?)",
+            [(pk, FOLDER_ENTITY, name, parent) for pk, name, parent in FOLDERS],
+        )
+    conn.close()
+    _add_notes(path, 1, 2, 100)
+    _add_notes(path, 3, 1, 200)
+    return path
+
+
+class CountingPool:
+    """Read-only pool that counts the queries run through it."""
+
+    def __init__(self, path):
+        self.pool = ReadOnlyConnectionPool(path)
+        self.queries = 0
+
+    def execute(self, query, params=()):
+        self.queries += 1
+        return self.pool.execute(query, params)
+
+
+@pytest.fixture
+def pool(store, monkeypatch):
+    pool = CountingPool(store)
+    monkeypatch.setattr(notes, "_get_notes_db_path", lambda: store)
+    monkeypatch.setattr(notes, "_get_db_pool", lambda: pool)
+    monkeypatch.setattr(notes, "_entities", {})
+    monkeypatch.setattr(notes, "_folder_tree", None)
+    yield pool
+    pool.pool.close()
+
+
+def _summary(folders):
+    return [
+        (folder["name"], folder["note_count"], _summary(folder["children"])) for folder in folders
+    ]
+
+
+def test_build_folder_tree_nests_children():
+    rows = [(1, "Work", None, 2), (2, "Projects", 1, 0), (3, "Archive", 2, 1)]
+
+    assert _summary(notes._build_folder_tree(rows)) == [
+        ("Work", 2, [("Projects", 0, [("Archive", 1, [])])])
+    ]
+
+
+def test_build_folder_tree_puts_orphans_and_loops_at_the_top():
+    rows = [(1, "Orphan", 99, 0), (2, "A", 3, 0), (3, "B", 2, 0), (4, "C", 3, 0)]
+
+    assert _summary(notes._build_folder_tree(rows)) == [
+        ("Orphan", 0, []),
+        ("A", 0, []),
+        ("B", 0, []),
+        ("C", 0, []),
+    ]
+
+
+def test_load_folder_tree_counts_notes(pool):
+    assert _summary(notes._load_folder_tree()) == [
+        ("Personal", 0, []),
+        ("Work", 2, [("Projects", 0, [("Archive", 1, [])])]),
+    ]
+
+
+def test_folder_tree_is_cached_while_database_is_unchanged(pool):
+    tree = notes._load_folder_tree()
+    queries = pool.queries
+
+    assert notes._load_folder_tree() is tree
+    assert pool.queries == queries
+
+
+def test_folder_tree_is_reloaded_after_database_changes(pool, store):
+    tree = notes._load_folder_tree()
+    # Enough rows to add pages, so the file size changes even if mtime is coarse
+    _add_notes(store, 4, 300, 1000)
+
+    reloaded = notes._load_folder_tree()
+    assert reloaded is not tree
+    assert [folder["note_count"] for folder in reloaded] == [300, 2]
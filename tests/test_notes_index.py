@@ -0,0 +1,181 @@
+"""Tests for the Apple Notes FTS5 sidecar index and its modification-date refresh."""
+
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic_notestore import SCHEMA, encode_note
+from src.services.notes_index import NotesIndex
+from src.services.sqlite_pool import ReadOnlyConnectionPool
+from src.tools import notes
+
+NOTE_ENTITY = 12
+
+
+def _write_note(path, note_id, title, body, modified):
+    data = encode_note([(f"{title}\n", 0, None, None, None), (body, None, None, None, None)])
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO ZICCLOUDSYNCINGOBJECT "
+            "(Z_PK, Z_ENT, ZNOTEDATA, ZMODIFICATIONDATE1, ZTITLE1) VALUES (?, ?, ?, ?, ?)",
+            (note_id, NOTE_ENTITY, note_id, modified, title),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO ZICNOTEDATA (Z_PK, ZNOTE, ZDATA) VALUES (?, ?, ?)",
+            (note_id, note_id, data),
+        )
+    conn.close()
+
+
+def _delete_note(path, note_id):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM ZICCLOUDSYNCINGOBJECT WHERE Z_PK = ?", (note_id,))
+        conn.execute("DELETE FROM ZICNOTEDATA WHERE Z_PK = ?", (note_id,))
+    conn.close()
+
+
+class Recorder:
+    """Wraps the source query and extractor to record what the index reads."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.queries = 0
+        self.extracted = []
+
+    def source(self, query, params):
+        self.queries += 1
+        return self.pool.execute(query, params)
+
+    def extract(self, data):
+        text = notes._extract_note_content(data)
+        self.extracted.append(text.split("\n")[0])
+        return text
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "NoteStore.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+    _write_note(path, 1, "Groceries", "milk and bread", 100.0)
+    _write_note(path, 2, "Trip", "book the train to Lyon", 200.0)
+    return path
+
+
+@pytest.fixture
+def recorder(store):
+    pool = ReadOnlyConnectionPool(store)
+    yield Recorder(pool)
+    pool.close()
+
+
+@pytest.fixture
+def index(tmp_path, recorder):
+    return NotesIndex(tmp_path / "data" / "notes_index.sqlite", recorder.source, recorder.extract)
+
+
+def _ids(results):
+    return sorted(result["note_id"] for result in results)
+
+
+def test_first_refresh_builds_index(index, recorder):
+    assert not index.ready
+    assert index.refresh() == {"indexed": 2, "removed": 0}
+
+    assert index.ready
+    assert index.status() == {"ready": True, "building": False, "indexed": 2}
+    assert _ids(index.search("train")) == [2]
+    match = index.search("groceries")[0]
+    assert (match["note_id"], match["title"]) == (1, "Groceries")
+
+
+def test_title_match_ranks_above_body_match(index, store):
+    _write_note(store, 3, "Bread recipe", "flour, water, salt", 300.0)
+    index.refresh()
+
+    assert [result["note_id"] for result in index.search("bread")] == [3, 1]
+
+
+def test_unchanged_notes_are_not_decoded_again(index, recorder):
+    index.refresh()
+    recorder.extracted.clear()
+
+    assert index.refresh() == {"indexed": 0, "removed": 0}
+    assert recorder.extracted == []
+
+
+def test_modified_note_is_reindexed(index, recorder, store):
+    index.refresh()
+    recorder.extracted.clear()
+    _write_note(store, 2, "Trip", "book a flight to Porto", 250.0)
+
+    assert index.refresh() == {"indexed": 1, "removed": 0}
+    assert recorder.extracted == ["# Trip"]
+    assert index.search("Lyon") == []
+    assert _ids(index.search("Porto")) == [2]
+
+
+def test_edit_without_new_modification_date_is_not_seen(index, store):
+    # The modification date is the only change signal the index follows
+    index.refresh()
+    _write_note(store, 2, "Trip", "book a flight to Porto", 200.0)
+
+    assert index.refresh()["indexed"] == 0
+    assert _ids(index.search("Lyon")) == [2]
+
+
+def test_deleted_note_is_removed(index, store):
+    index.refresh()
+    _delete_note(store, 1)
+
+    assert index.refresh() == {"indexed": 0, "removed": 1}
+    assert index.search("milk") == []
+    assert index.status()["indexed"] == 1
+
+
+def test_unchanged_database_files_skip_the_source(tmp_path, recorder, store):
+    index = NotesIndex(
+        tmp_path / "notes_index.sqlite", recorder.source, recorder.extract, source_path=store
+    )
+    index.refresh()
+    queries = recorder.queries
+
+    assert index.refresh() == {"indexed": 0, "removed": 0}
+    assert recorder.queries == queries
+
+    _write_note(store, 3, "Books", "a long list of novels " * 500, 300.0)
+    assert index.refresh() == {"indexed": 1, "removed": 0}
+    assert recorder.queries > queries
+
+
+def test_note_that_fails_to_extract_stays_findable_by_title(tmp_path, recorder):
+    def extract(data):
+        raise ValueError("corrupt note")
+
+    index = NotesIndex(tmp_path / "notes_index.sqlite", recorder.source, extract)
+
+    assert index.refresh()["indexed"] == 2
+    assert _ids(index.search("Trip")) == [2]
+    assert index.search("train") == []
+
+
+def test_background_build(index):
+    assert index.start_background_build()
+    index._build_thread.join(timeout=10)
+
+    assert index.ready
+    assert _ids(index.search("milk")) == [1]
+
+
+def test_version_change_resets_index(index, recorder):
+    index.refresh()
+    with sqlite3.connect(index.index_path) as conn:
+        conn.execute("UPDATE sync_state SET value = '0' WHERE key = 'version'")
+
+    reopened = NotesIndex(index.index_path, recorder.source, recorder.extract)
+    assert not reopened.ready
+    assert reopened.search("milk") == []
+    assert reopened.refresh()["indexed"] == 2
@@ -0,0 +1,157 @@
+"""Tests for the NoteStoreProto note and table decoders."""
+
+import gzip
+
+import pytest
+
+from benchmarks.synthetic_notestore import UTI_HASHTAG, UTI_JPEG, encode_note, encode_table
+from src.services.notestore import (
+    ATTACHMENT_CHARACTER,
+    STYLE_CHECKLIST,
+    STYLE_HEADING,
+    STYLE_NUMBERED_LIST,
+    STYLE_TITLE,
+    NoteDecodeError,
+    decode_note,
+    decode_table,
+    render_note,
+    render_table,
+)
+from src.tools import notes
+
+RUNS = [
+    ("Groceries\n", STYLE_TITLE, None, None, None),
+    ("Today\n", STYLE_HEADING, None, None, None),
+    ("Milk\n", STYLE_CHECKLIST, True, None, None),
+    ("Bread\n", STYLE_CHECKLIST, False, None, None),
+    ("First\n", STYLE_NUMBERED_LIST, None, None, None),
+    ("Second\n", STYLE_NUMBERED_LIST, None, None, None),
+    ("See ", None, None, None, None),
+    ("the shop", None, None, "https://example.com", None),
+    ("\n", None, None, None, None),
+    (ATTACHMENT_CHARACTER, None, None, None, ("IMG-1", UTI_JPEG)),
+    ("\n", None, None, None, None),
+]
+
+
+def test_decode_note_text_and_runs():
+    content = decode_note(encode_note(RUNS))
+
+    assert content.text == "".join(run[0] for run in RUNS)
+    assert [run.text for run in content.runs] == [run[0] for run in RUNS]
+    assert content.runs[0].style_type == STYLE_TITLE
+    assert [run.checked for run in content.runs[2:4]] == [True, False]
+    assert content.runs[7].link == "https://example.com"
+    assert content.attachments() == [("IMG-1", UTI_JPEG)]
+    assert ATTACHMENT_CHARACTER not in content.plain_text
+
+
+def test_decode_note_accepts_decompressed_data():
+    data = encode_note(RUNS)
+    assert decode_note(gzip.decompress(data)) == decode_note(data)
+
+
+def test_render_note_markdown():
+    rendered = render_note(decode_note(encode_note(RUNS)))
+
+    assert rendered.split("\n") == [
+        "# Groceries",
+        "## Today",
+        "- [x] Milk",
+        "- [ ] Bread",
+        "1. First",
+        "2. Second",
+        "See [the shop](https://example.com)",
+        "[Attachment: public.jpeg]",
+    ]
+
+
+def test_render_note_uses_attachment_labels():
+    runs = [
+        ("Tagged ", None, None, None, None),
+        (ATTACHMENT_CHARACTER, None, None, None, ("TAG-1", UTI_HASHTAG)),
+    ]
+    rendered = render_note(decode_note(encode_note(runs)), {"TAG-1": "#errands"})
+    assert rendered == "Tagged #errands"
+
+
+@pytest.mark.parametrize(
+    "texts",
+    [
+        ["Café ", "crème\n", "brûlée"],  # non-ASCII, one UTF-16 unit per character
+        ["Party 🎉🎉 ", "tonight 🍕\n", "bring snacks"],  # astral: two units each
+    ],
+)
+def test_run_lengths_count_utf16_units(texts):
+    runs = [(text, None, None, None, None) for text in texts]
+    content = decode_note(encode_note(runs))
+
+    assert [run.text for run in content.runs] == texts
+
+
+def test_text_past_the_last_run_is_kept():
+    # Note { note_text = "Styled tail"; attribute_run { length = 6; style_type = 1 } }
+    note = b"\x12\x0bStyled tail" + b"\x2a\x06\x08\x06\x12\x02\x08\x01"
+    document = b"\x1a" + bytes([len(note)]) + note
+    proto = b"\x12" + bytes([len(document)]) + document
+
+    content = decode_note(proto)
+    assert [run.text for run in content.runs] == ["Styled", " tail"]
+    assert content.runs[0].style_type == STYLE_HEADING
+    assert content.runs[1].style_type is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        gzip.compress(b"Just some plain text"),
+        b"\x1f\x8bnot really gzip",
+        b"\x0a\xff",  # truncated field
+        b"\x0f",  # unsupported wire type
+        gzip.compress(b"\x12\x00"),  # a document without a note
+    ],
+)
+def test_invalid_data_raises_note_decode_error(data):
+    with pytest.raises(NoteDecodeError):
+        decode_note(data)
+
+
+def test_extract_note_content_decodes_protobuf():
+    assert notes._extract_note_content(encode_note(RUNS)).startswith("# Groceries\n## Today")
+
+
+def test_extract_note_content_falls_back_for_other_formats():
+    # Older notes: plain text followed by binary metadata rather than a protobuf
+    data = gzip.compress(
+        b"Meeting notes\nDiscuss the budget\n\x08\x00\x12\x04J>Q&ggJ9;Wk.h metadata"
+    )
+
+    with pytest.raises(NoteDecodeError):
+        decode_note(data)
+    assert notes._extract_note_content(data) == "Meeting notes\nDiscuss the budget"
+
+
+def test_extract_note_content_falls_back_for_html():
+    data = gzip.compress(b"<div><h1>Title</h1></div><div>Body &amp; more</div>")
+
+    text = notes._extract_note_content(data)
+    assert "Title" in text
+    assert "Body & more" in text
+    assert "<" not in text
+
+
+def test_decode_table_round_trip():
+    rows = [["Name", "Qty"], ["Milk", "2"], ["Bread", "1"]]
+
+    assert decode_table(encode_table(rows)) == rows
+    assert render_table(rows).split("\n") == [
+        "| Name | Qty |",
+        "| --- | --- |",
+        "| Milk | 2 |",
+        "| Bread | 1 |",
+    ]
+
+
+def test_decode_table_rejects_other_data():
+    with pytest.raises(NoteDecodeError):
+        decode_table(encode_note(RUNS))
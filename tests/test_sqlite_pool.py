@@ -0,0 +1,100 @@
+"""Tests for the pooled read-only SQLite connections."""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from src.services.sqlite_pool import ReadOnlyConnectionPool, modification_signature
+
+
+def _make_db(path, value):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE t (value TEXT)")
+        conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "app.db"
+    _make_db(path, "first")
+    return path
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ReadOnlyConnectionPool(db_path)
+    yield pool
+    pool.close()
+
+
+def test_connection_is_reused_per_thread(pool):
+    first = pool.connection()
+    assert pool.execute("SELECT value FROM t") == [("first",)]
+    assert pool.connection() is first
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not first
+    assert pool.stats()["opened"] == 2
+    assert pool.stats()["reopened"] == 0
+
+
+def test_connection_is_read_only(pool):
+    with pytest.raises(sqlite3.OperationalError):
+        pool.execute("INSERT INTO t VALUES ('x')")
+
+
+def test_replaced_database_is_reopened(pool, db_path, tmp_path):
+    first = pool.connection()
+    assert pool.execute("SELECT value FROM t") == [("first",)]
+
+    # The owning app swaps in a new file (e.g. after a restore): new inode
+    replacement = tmp_path / "restored.db"
+    _make_db(replacement, "second")
+    os.replace(replacement, db_path)
+
+    assert pool.execute("SELECT value FROM t") == [("second",)]
+    assert pool.connection() is not first
+    assert pool.stats()["reopened"] == 1
+    assert pool.stats()["open_connections"] == 1
+
+
+def test_unchanged_database_is_not_reopened(pool, db_path):
+    first = pool.connection()
+    writer = sqlite3.connect(db_path)
+    with writer:
+        writer.execute("INSERT INTO t VALUES ('more')")
+    writer.close()
+
+    assert len(pool.execute("SELECT value FROM t")) == 2
+    assert pool.connection() is first
+    assert pool.stats()["reopened"] == 0
+
+
+def test_close_reopens_lazily(pool):
+    first = pool.connection()
+    pool.close()
+    assert pool.stats()["open_connections"] == 0
+    assert pool.connection() is not first
+    assert pool.execute("SELECT value FROM t") == [("first",)]
+
+
+def test_modification_signature_tracks_writes(db_path):
+    before = modification_signature(db_path)
+    assert before == modification_signature(db_path)
+    assert before[1] is None  # no WAL file
+
+    writer = sqlite3.connect(db_path)
+    with writer:
+        # Large enough to add pages, so the size changes even if mtime is coarse
+        writer.execute("INSERT INTO t VALUES (?)", ("x" * 20_000,))
+    writer.close()
+
+    assert modification_signature(db_path) != before